@@ -3,10 +3,10 @@ import subprocess
 import shutil
 import json
 import uuid
-from collections import defaultdict
+from collections import Counter, OrderedDict, defaultdict
 import tempfile
 import zipfile
-from tkinter import ttk
+import importlib
 import datetime
 import hashlib
 from decimal import Decimal, ROUND_HALF_UP
@@ -27,17 +27,48 @@ def ensure_package(pkg, import_name=None):
             print(f"[Setup] Erreur lors de l'installation de {pkg}. Veuillez l'installer manuellement.")
             return False
 
-# Vérifie et installe Pillow, PyYAML, orjson si besoin
-PIL_AVAILABLE = ensure_package("Pillow", "PIL")
-YAML_AVAILABLE = ensure_package("PyYAML", "yaml")
-ORJSON_AVAILABLE = ensure_package("orjson")
+# Dépendances optionnelles importées au premier usage : importer le module ne lance ni pip,
+# ni Tkinter, ni Pillow/PyYAML/orjson. Le lancement en script installe d'abord ce qui manque.
+_OPTIONAL_MODULES = {}
+
+
+def optional_import(name):
+    """
+    Module name importé au premier appel, ou None s'il n'est pas installé (résultat mémorisé).
+    """
+    try:
+        return _OPTIONAL_MODULES[name]
+    except KeyError:
+        pass
+    try:
+        module = importlib.import_module(name)
+    except ImportError:
+        module = None
+    _OPTIONAL_MODULES[name] = module
+    return module
+
+
+def pil_available():
+    return optional_import("PIL") is not None
+
+
+def install_missing_packages():
+    """
+    Vérifie et installe Pillow, PyYAML, orjson si besoin (points d'entrée uniquement).
+    """
+    for pkg, import_name in (("Pillow", "PIL"), ("PyYAML", "yaml"), ("orjson", "orjson")):
+        ensure_package(pkg, import_name)
+        _OPTIONAL_MODULES.pop(import_name, None)
 
-import tkinter as tk
-from tkinter import filedialog, messagebox, scrolledtext
 import glob
 import sys
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
+import threading
+import contextlib
+import contextvars
 import time
+import queue
+import logging
 
 # --- TRANSLATIONS block and t() function must be defined before any use of t() ---
 TRANSLATIONS = {
@@ -55,9 +86,13 @@ TRANSLATIONS = {
         "success": "Succès",
         "error_title": "Erreur",
         "start_console": "⏳ Démarrage conversion (mode console)...",
+        "step": "Étape",
         "console_done": "✅ Conversion terminée.",
+        "export_skipped": "Pas d'export (--export-dir absent) : pack Bedrock dans {bedrock_dir}",
         "no_java_dir": "❌ JAVA_RP_DIR ou BEDROCK_RP_DIR n'est pas défini. Vérifie que les variables d'environnement sont bien passées.",
-        "deleted_folder": "🪟 Dossier supprimé : {target}",
+        "cli_missing_value": "❌ Option {flag} : valeur manquante.",
+        "cli_invalid_value": "❌ Option {flag} : valeur invalide « {value} » (attendu : {expected}).",
+        "cleaned_folder": "🪟 Dossier de sortie vidé : {target}",
         "all_textures_copied": "📁 Toutes les textures item copiées.",
         "sounds_copied": "🔊 Sons copiés + sound_definitions.json généré.",
         "no_sounds": "🔇 Aucun son trouvé à copier.",
@@ -103,11 +138,27 @@ TRANSLATIONS = {
         "pack_exported_zip_title": "Fichier .mcpack exporté",
         "pack_exported_zip_error": "❌ Erreur lors de l'exportation du fichier .mcpack : {error}",
         "pack_exported_zip_success": "✅ Fichier .mcpack exporté avec succès : {out_zip}",
+        "pack_exported_zip": "✅ Archive exportée : {zip_path}",
+        "pack_exported_folder": "✅ Dossier exporté : {out_dir}",
+        "unknown_export_format": "❌ Format d'export inconnu (attendu : folder, zip ou mcpack).",
+        "export_cancelled": "Export annulé.",
+        "folder": "Dossier",
+        "mcpack": ".mcpack",
+        "items_folder_not_found": "⚠️ Dossier des items introuvable : {items_dir}",
+        "read_error": "⚠️ Lecture impossible de {file} : {error}",
         "java_rp_placeholder": "Chemin du dossier Resource Pack Java (ou ZIP)",
         "bedrock_rp_placeholder": "Chemin du dossier Resource Pack Bedrock (ou ZIP)",
         "geyser_mapping_format": "Format Geyser Mapping :",
         "geyser_mapping_v1": "v1 (simple)",
-        "geyser_mapping_v2": "v2 (avancé)"
+        "geyser_mapping_v2": "v2 (avancé)",
+        "json_output_format": "Format JSON :",
+        "json_pretty": "Lisible",
+        "json_compact": "Compact",
+        "cancel": "Annuler",
+        "copy_all_textures": "Copier toutes les textures",
+        "optimize_png8": "Optimiser les textures (PNG8)",
+        "cancel_requested": "⏹️ Annulation demandée, arrêt après les tâches en cours...",
+        "conversion_cancelled": "⛔ Conversion annulée."
     },
     "en": {
         "select_java_dir": "Java Resource Pack Folder:",
@@ -123,9 +174,13 @@ TRANSLATIONS = {
         "success": "Success",
         "error_title": "Error",
         "start_console": "⏳ Starting conversion (console mode)...",
+        "step": "Step",
         "console_done": "✅ Conversion finished.",
+        "export_skipped": "No export (no --export-dir): Bedrock pack left in {bedrock_dir}",
         "no_java_dir": "❌ JAVA_RP_DIR or BEDROCK_RP_DIR not set. Check your environment variables.",
-        "deleted_folder": "🪟 Deleted folder: {target}",
+        "cli_missing_value": "❌ Option {flag}: missing value.",
+        "cli_invalid_value": "❌ Option {flag}: invalid value \"{value}\" (expected: {expected}).",
+        "cleaned_folder": "🪟 Output folder cleared: {target}",
         "all_textures_copied": "📁 All item textures copied.",
         "sounds_copied": "🔊 Sounds copied + sound_definitions.json generated.",
         "no_sounds": "🔇 No sounds found to copy.",
@@ -171,11 +226,27 @@ TRANSLATIONS = {
         "pack_exported_zip_title": ".mcpack file exported",
         "pack_exported_zip_error": "❌ Error exporting .mcpack file: {error}",
         "pack_exported_zip_success": "✅ .mcpack file exported successfully: {out_zip}",
+        "pack_exported_zip": "✅ Archive exported: {zip_path}",
+        "pack_exported_folder": "✅ Folder exported: {out_dir}",
+        "unknown_export_format": "❌ Unknown export format (expected: folder, zip or mcpack).",
+        "export_cancelled": "Export cancelled.",
+        "folder": "Folder",
+        "mcpack": ".mcpack",
+        "items_folder_not_found": "⚠️ Items folder not found: {items_dir}",
+        "read_error": "⚠️ Could not read {file}: {error}",
         "java_rp_placeholder": "Path to Java Resource Pack folder (or ZIP)",
         "bedrock_rp_placeholder": "Path to Bedrock Resource Pack folder (or ZIP)",
         "geyser_mapping_format": "Geyser Mapping format:",
         "geyser_mapping_v1": "v1 (simple)",
-        "geyser_mapping_v2": "v2 (advanced)"
+        "geyser_mapping_v2": "v2 (advanced)",
+        "json_output_format": "JSON format:",
+        "json_pretty": "Pretty",
+        "json_compact": "Compact",
+        "cancel": "Cancel",
+        "copy_all_textures": "Copy all textures",
+        "optimize_png8": "Optimize textures (PNG8)",
+        "cancel_requested": "⏹️ Cancel requested, stopping after running tasks...",
+        "conversion_cancelled": "⛔ Conversion cancelled."
     }
 }
 
@@ -188,32 +259,712 @@ def t(key, **kwargs):
         value = key
     return value.format(**kwargs)
 
-try:
-    import yaml
-except ImportError:
-    print(t("missing_yaml_module"))
-    raise
-
-# Charger les chemins depuis les variables d'environnement
-JAVA_RP_DIR = os.environ.get("JAVA_RP_DIR", t("java_rp_placeholder"))
-TEMP_UNZIP_DIR = None
-
-if JAVA_RP_DIR.lower().endswith('.zip') and os.path.isfile(JAVA_RP_DIR):
-    TEMP_UNZIP_DIR = tempfile.mkdtemp(prefix="javarp_unzip_")
-    with zipfile.ZipFile(JAVA_RP_DIR, 'r') as zip_ref:
-        zip_ref.extractall(TEMP_UNZIP_DIR)
-    JAVA_RP_DIR = TEMP_UNZIP_DIR + os.sep
-else:
-    if not JAVA_RP_DIR.endswith(os.sep):
-        JAVA_RP_DIR += os.sep
-
-BEDROCK_RP_DIR = os.environ.get("BEDROCK_RP_DIR", t("bedrock_rp_placeholder"))
-if not BEDROCK_RP_DIR.endswith(os.sep):
-    BEDROCK_RP_DIR += os.sep
+# --- Journalisation ---
+# Un logger par étape (packconverter.models, packconverter.textures...) ; le détail fichier par
+# fichier est au niveau DEBUG, masqué par défaut (PACKCONVERTER_LOG_LEVEL ou --log-level).
+LOGGER = logging.getLogger("packconverter")
+LOG_LEVEL = os.environ.get("PACKCONVERTER_LOG_LEVEL", "INFO").upper()
+LOG_FORMAT = "%(message)s"
+
+
+def get_logger(stage):
+    return LOGGER.getChild(stage)
+
+
+LOG_PIPELINE = get_logger("pipeline")
+LOG_PACK = get_logger("pack")
+LOG_CACHE = get_logger("cache")
+LOG_TEXTURES = get_logger("textures")
+LOG_ITEMS = get_logger("items")
+LOG_MODELS = get_logger("models")
+LOG_OUTPUT = get_logger("output")
+LOG_VALIDATION = get_logger("validation")
+
+
+def setup_logging(level=None, handler=None):
+    """
+    (Re)configure le logger packconverter avec un seul handler : la console par défaut,
+    la zone de logs pour la GUI.
+    """
+    LOGGER.setLevel(getattr(logging, (level or LOG_LEVEL).upper(), logging.INFO))
+    for old in list(LOGGER.handlers):
+        LOGGER.removeHandler(old)
+    handler = handler or logging.StreamHandler(sys.stdout)
+    handler.setFormatter(logging.Formatter(LOG_FORMAT))
+    LOGGER.addHandler(handler)
+    LOGGER.propagate = False
+
+
+class LazyText:
+    """
+    Message traduit, formaté seulement si le logger l'émet réellement.
+    """
+    __slots__ = ("key", "kwargs")
+
+    def __init__(self, key, **kwargs):
+        self.key = key
+        self.kwargs = kwargs
+
+    def __str__(self):
+        return t(self.key, **self.kwargs)
+
+
+class ThrottledProgress:
+    """
+    Compteur thread-safe qui journalise message.format(done=, total=) au plus une fois
+    par interval secondes (et toujours à la fin) au lieu d'une ligne par élément.
+    """
+    def __init__(self, logger, message, total, interval=1.0):
+        self.logger = logger
+        self.message = message
+        self.total = total
+        self.interval = interval
+        self.done = 0
+        self._last = time.perf_counter()
+        self._lock = threading.Lock()
+
+    def step(self, count=1):
+        with self._lock:
+            self.done += count
+            now = time.perf_counter()
+            if self.done < self.total and now - self._last < self.interval:
+                return
+            self._last = now
+            done = self.done
+        self.logger.info(self.message.format(done=done, total=self.total))
+
+# --- Copie rapide de fichiers (textures, sons) ---
+# "copy" (défaut) : copie côté noyau (copy_file_range, puis sendfile), puis en espace utilisateur.
+# "reflink" : clone copy-on-write (Btrfs, XFS...) avant la copie noyau.
+# "link" : lien dur vers le fichier du pack (même système de fichiers), puis reflink, puis copie.
+# "userspace" : lecture/écriture classique, pour comparaison.
+COPY_CHAINS = {
+    "link": ("link", "reflink", "copy_file_range", "sendfile", "userspace"),
+    "reflink": ("reflink", "copy_file_range", "sendfile", "userspace"),
+    "copy": ("copy_file_range", "sendfile", "userspace"),
+    "userspace": ("userspace",),
+}
+_COPY_LOCK = threading.Lock()
+# Méthodes déjà refusées par le système : inutile de retenter un appel système par fichier
+_COPY_UNSUPPORTED = set()
+_FICLONE = 0x40049409  # ioctl Linux (linux/fs.h)
+
+
+def _copy_link(src, dst):
+    os.link(src, dst)
+
+
+def _copy_reflink(src, dst):
+    import fcntl
+    with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+        fcntl.ioctl(fdst.fileno(), _FICLONE, fsrc.fileno())
+
+
+def _copy_file_range(src, dst):
+    with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+        remaining = os.fstat(fsrc.fileno()).st_size
+        while remaining > 0:
+            sent = os.copy_file_range(fsrc.fileno(), fdst.fileno(), remaining)
+            if sent == 0:
+                break
+            remaining -= sent
+
+
+def _copy_sendfile(src, dst):
+    with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+        size = os.fstat(fsrc.fileno()).st_size
+        offset = 0
+        while offset < size:
+            sent = os.sendfile(fdst.fileno(), fsrc.fileno(), offset, size - offset)
+            if sent == 0:
+                break
+            offset += sent
+
+
+def _copy_userspace(src, dst):
+    with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+        shutil.copyfileobj(fsrc, fdst, 1024 * 1024)
+
+
+_COPY_FUNCS = {
+    "link": _copy_link,
+    "reflink": _copy_reflink,
+    "copy_file_range": _copy_file_range,
+    "sendfile": _copy_sendfile,
+    "userspace": _copy_userspace,
+}
+
+
+def fast_copy_file(src, dst, mode=None):
+    """
+    Copie src vers dst avec la méthode la plus rapide disponible pour le mode (CTX.copy_mode par
+    défaut), en retombant sur la suivante en cas d'échec. Les métadonnées ne sont pas copiées.
+    dst est toujours supprimé avant l'écriture : une sortie en lien dur ne doit jamais être
+    réécrite sur place, sous peine de modifier le fichier du pack source.
+    Renvoie le nom de la méthode utilisée.
+    """
+    import errno
+    chain = COPY_CHAINS.get(mode or CTX.copy_mode, COPY_CHAINS["copy"])
+    if os.path.lexists(dst):
+        os.unlink(dst)
+    for method in chain:
+        if method in _COPY_UNSUPPORTED and method != "userspace":
+            continue
+        try:
+            _COPY_FUNCS[method](src, dst)
+        except (OSError, AttributeError, ImportError) as e:
+            # Fichier absent, droits, disque plein : aucune autre méthode ne ferait mieux
+            if method == "userspace" or getattr(e, "errno", None) in (errno.ENOENT, errno.EACCES, errno.ENOSPC):
+                raise
+            with _COPY_LOCK:
+                _COPY_UNSUPPORTED.add(method)
+            if os.path.lexists(dst):
+                os.unlink(dst)
+            continue
+        with _COPY_LOCK:
+            CTX.copy_methods[method] += 1
+        return method
+
+
+def log_copy_methods(logger, tag):
+    """
+    Résume (puis remet à zéro) les méthodes de copie utilisées depuis le dernier appel.
+    """
+    with _COPY_LOCK:
+        counts = dict(CTX.copy_methods)
+        CTX.copy_methods.clear()
+    if counts:
+        summary = ", ".join(f"{method}={count}" for method, count in sorted(counts.items()))
+        logger.info(f"[{tag}] Copie ({CTX.copy_mode}) : {summary}")
+
+
+# --- Système de fichiers virtuel du pack Java (dossier ou ZIP) ---
+# Tous les chemins manipulés sont relatifs à la racine du pack, séparés par '/'
+# (ex: "assets/minecraft/models/item/stick.json"), quelle que soit la source.
+class PackEntry:
+    __slots__ = ("size", "mtime", "crc")
+
+    def __init__(self, size, mtime, crc=None):
+        self.size = size
+        self.mtime = mtime
+        self.crc = crc
+
+
+def _pack_rel(rel):
+    return rel.replace('\\', '/').strip('/')
+
+
+def _count_pack_read(data):
+    CTX.metrics.add("pack.files_read")
+    CTX.metrics.add("pack.bytes_read", len(data))
+
+
+class DirectoryPackSource:
+    """
+    Pack Java décompressé sur le disque.
+    """
+
+    def __init__(self, root_dir):
+        self.root = root_dir
+
+    def _abs(self, rel):
+        rel = _pack_rel(rel)
+        return os.path.join(self.root, *rel.split('/')) if rel else self.root
+
+    def display_path(self, rel):
+        return self._abs(rel)
+
+    def isfile(self, rel):
+        CTX.metrics.add("pack.fs_calls")
+        return os.path.isfile(self._abs(rel))
+
+    def isdir(self, rel):
+        CTX.metrics.add("pack.fs_calls")
+        return os.path.isdir(self._abs(rel))
+
+    def listdir(self, rel=''):
+        path = self._abs(rel)
+        if not os.path.isdir(path):
+            CTX.metrics.add("pack.fs_calls")
+            return []
+        CTX.metrics.add("pack.fs_calls", 2)
+        return os.listdir(path)
+
+    def walk(self, rel=''):
+        """
+        Équivalent de os.walk, mais renvoie des chemins relatifs au pack.
+        """
+        top = self._abs(rel)
+        for root, dirs, files in os.walk(top):
+            CTX.metrics.add("pack.fs_calls")
+            sub = os.path.relpath(root, self.root)
+            sub = '' if sub == '.' else sub.replace(os.sep, '/')
+            yield sub, dirs, files
+
+    def walk_sizes(self, rel=''):
+        """
+        Comme walk, mais files est {nom: taille en octets}, lue par os.scandir pendant le
+        parcours plutôt que par un stat séparé après coup.
+        """
+        stack = [_pack_rel(rel)]
+        while stack:
+            current = stack.pop()
+            dirs, files = [], {}
+            CTX.metrics.add("pack.fs_calls")
+            try:
+                with os.scandir(self._abs(current)) as entries:
+                    for entry in entries:
+                        if entry.is_dir():
+                            dirs.append(entry.name)
+                        else:
+                            CTX.metrics.add("pack.fs_calls")
+                            files[entry.name] = entry.stat().st_size
+            except OSError:
+                continue
+            yield current, dirs, files
+            stack.extend(f"{current}/{d}" if current else d for d in reversed(dirs))
+
+    def stat(self, rel):
+        CTX.metrics.add("pack.fs_calls")
+        st = os.stat(self._abs(rel))
+        return PackEntry(st.st_size, st.st_mtime)
+
+    def open(self, rel):
+        return open(self._abs(rel), 'rb')
+
+    def read_bytes(self, rel):
+        with self.open(rel) as f:
+            data = f.read()
+        _count_pack_read(data)
+        return data
+
+    def copy_to(self, rel, dst):
+        fast_copy_file(self._abs(rel), dst)
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class ZipPackSource:
+    """
+    Pack Java lu directement depuis le répertoire central du ZIP : aucune extraction,
+    seuls les membres effectivement ouverts sont décompressés.
+    """
+
+    def __init__(self, zip_path):
+        self.path = zip_path
+        self._zip = zipfile.ZipFile(zip_path, 'r')
+        infos = [i for i in self._zip.infolist() if not i.is_dir()]
+        names = [_pack_rel(i.filename) for i in infos]
+        # Certains ZIP contiennent un dossier racine unique (ex: MonPack/assets/...)
+        prefix = ''
+        if names and not any(n == 'pack.mcmeta' or n.startswith('assets/') for n in names):
+            tops = {n.split('/', 1)[0] for n in names}
+            if len(tops) == 1 and all('/' in n for n in names):
+                prefix = tops.pop() + '/'
+        self._prefix = prefix
+        self._files = {}
+        self._children = defaultdict(set)
+        for info, name in zip(infos, names):
+            if prefix:
+                name = name[len(prefix):]
+            self._files[name] = info
+            parts = name.split('/')
+            for i in range(len(parts)):
+                self._children['/'.join(parts[:i])].add(parts[i])
+
+    def display_path(self, rel):
+        return f"{self.path}!/{_pack_rel(rel)}"
+
+    def isfile(self, rel):
+        return _pack_rel(rel) in self._files
+
+    def isdir(self, rel):
+        rel = _pack_rel(rel)
+        return rel in self._children and rel not in self._files
+
+    def listdir(self, rel=''):
+        rel = _pack_rel(rel)
+        if not self.isdir(rel):
+            return []
+        return sorted(self._children[rel])
+
+    def walk(self, rel=''):
+        """
+        Équivalent de os.walk sur l'arborescence du répertoire central.
+        """
+        rel = _pack_rel(rel)
+        if not self.isdir(rel):
+            return
+        stack = [rel]
+        while stack:
+            current = stack.pop()
+            dirs, files = [], []
+            for name in sorted(self._children[current]):
+                child = f"{current}/{name}" if current else name
+                if child in self._files:
+                    files.append(name)
+                else:
+                    dirs.append(name)
+            yield current, dirs, files
+            stack.extend(f"{current}/{d}" if current else d for d in reversed(dirs))
+
+    def walk_sizes(self, rel=''):
+        """
+        Comme walk, mais files est {nom: taille en octets}, tirée du répertoire central.
+        """
+        for current, dirs, files in self.walk(rel):
+            yield current, dirs, {name: self._files[f"{current}/{name}" if current else name].file_size
+                                  for name in files}
+
+    def stat(self, rel):
+        info = self._files[_pack_rel(rel)]
+        mtime = time.mktime(info.date_time + (0, 0, -1))
+        return PackEntry(info.file_size, mtime, info.CRC)
+
+    def open(self, rel):
+        return self._zip.open(self._files[_pack_rel(rel)], 'r')
+
+    def read_bytes(self, rel):
+        with self.open(rel) as f:
+            data = f.read()
+        _count_pack_read(data)
+        return data
+
+    def copy_to(self, rel, dst):
+        with self.open(rel) as src, open(dst, 'wb') as out:
+            shutil.copyfileobj(src, out, 1024 * 1024)
+
+    def close(self):
+        self._zip.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def open_java_pack(path):
+    """
+    Ouvre le pack Java (dossier ou fichier .zip) derrière une interface commune.
+    """
+    if path.lower().endswith('.zip') and os.path.isfile(path):
+        return ZipPackSource(path)
+    return DirectoryPackSource(path)
+
+# --- Sortie du pack Bedrock (dossier, mémoire ou archive) ---
+# Les générateurs construisent toujours leurs chemins sous BEDROCK_RP_DIR ; le sink décide
+# où vont réellement les octets. Seul le dossier persiste entre deux exécutions (cache incrémental).
+def _count_output_write(data):
+    CTX.metrics.add("output.files_written")
+    CTX.metrics.add("output.bytes_written", len(data))
+
+
+class DirectoryOutputSink:
+    kind = "folder"
+    persistent = True
+
+    def __init__(self, root):
+        self.root = root
+
+    def makedirs(self, path):
+        os.makedirs(path, exist_ok=True)
+
+    def write_bytes(self, path, data, atomic=False):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        if not atomic:
+            with open(path, 'wb') as f:
+                f.write(data)
+        else:
+            # Plusieurs workers (threads ou processus) peuvent écrire le même fichier en même temps
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        _count_output_write(data)
+        CTX.output_textures.note(self, path, True)
+
+    def copy_from_pack(self, pack, rel, path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Une sortie précédente peut être un lien dur vers le pack (CTX.copy_mode = "link") :
+        # la supprimer plutôt que l'écraser sur place
+        if os.path.lexists(path):
+            os.unlink(path)
+        pack.copy_to(rel, path)
+        CTX.metrics.add("output.files_copied")
+        CTX.output_textures.note(self, path, True)
+
+    def isfile(self, path):
+        CTX.metrics.add("output.fs_calls")
+        return os.path.isfile(path)
+
+    def isdir(self, path):
+        CTX.metrics.add("output.fs_calls")
+        return os.path.isdir(path)
+
+    def listdir(self, path):
+        if not os.path.isdir(path):
+            CTX.metrics.add("output.fs_calls")
+            return []
+        CTX.metrics.add("output.fs_calls", 2)
+        return os.listdir(path)
+
+    def read_bytes(self, path):
+        with open(path, 'rb') as f:
+            return f.read()
+
+    def list_files(self, path):
+        files = []
+        for root, _, names in os.walk(path):
+            CTX.metrics.add("output.fs_calls")
+            sub = os.path.relpath(root, path).replace(os.sep, '/')
+            files.extend(name if sub == '.' else f"{sub}/{name}" for name in names)
+        return files
+
+    def remove(self, path):
+        CTX.metrics.add("output.fs_calls")
+        if os.path.isfile(path):
+            os.remove(path)
+        CTX.output_textures.note(self, path, False)
+
+    def remove_tree(self, path):
+        CTX.metrics.add("output.fs_calls")
+        if os.path.isdir(path):
+            shutil.rmtree(path)
+        CTX.output_textures.invalidate(self)
+
+    def export_archive(self, archive_path, compression_level=None):
+        return write_pack_archive(self.root, archive_path, compression_level)
+
+    def export_directory(self, dest):
+        shutil.copytree(self.root, dest)
+
+
+class MemoryOutputSink:
+    """
+    Arborescence de sortie en mémoire : aucun dossier intermédiaire, l'export (dossier ou
+    archive) est la seule passe d'écriture sur disque.
+    """
+    kind = "memory"
+    persistent = False
+
+    def __init__(self, root):
+        self.root = root
+        self._files = {}
+        self._lock = threading.Lock()
+
+    def _rel(self, path):
+        rel = os.path.relpath(path, self.root).replace(os.sep, '/')
+        return '' if rel == '.' else rel
+
+    def _store(self, rel, data):
+        return data
+
+    def _load(self, stored):
+        return stored
+
+    def makedirs(self, path):
+        pass
+
+    def write_bytes(self, path, data, atomic=False):
+        rel = self._rel(path)
+        stored = self._store(rel, bytes(data))
+        with self._lock:
+            self._files[rel] = stored
+        _count_output_write(data)
+        CTX.output_textures.note(self, path, True)
+
+    def copy_from_pack(self, pack, rel, path):
+        self.write_bytes(path, pack.read_bytes(rel))
+
+    def isfile(self, path):
+        return self._rel(path) in self._files
+
+    def isdir(self, path):
+        prefix = self._rel(path)
+        if not prefix:
+            return bool(self._files)
+        prefix += '/'
+        with self._lock:
+            return any(name.startswith(prefix) for name in self._files)
+
+    def listdir(self, path):
+        prefix = self._rel(path)
+        prefix = prefix + '/' if prefix else ''
+        with self._lock:
+            names = list(self._files)
+        return sorted({name[len(prefix):].split('/', 1)[0] for name in names if name.startswith(prefix)})
+
+    def read_bytes(self, path):
+        with self._lock:
+            stored = self._files[self._rel(path)]
+        return self._load(stored)
+
+    def list_files(self, path):
+        prefix = self._rel(path)
+        prefix = prefix + '/' if prefix else ''
+        with self._lock:
+            return [name[len(prefix):] for name in self._files if name.startswith(prefix)]
+
+    def remove(self, path):
+        with self._lock:
+            self._files.pop(self._rel(path), None)
+        CTX.output_textures.note(self, path, False)
+
+    def remove_tree(self, path):
+        prefix = self._rel(path) + '/'
+        with self._lock:
+            for name in [name for name in self._files if name.startswith(prefix)]:
+                del self._files[name]
+        CTX.output_textures.invalidate(self)
+
+    def _zip_entries(self, level):
+        now = time.time()
+        def compress(arcname, raw):
+            return (arcname,) + _compress_zip_member(arcname, raw, level) + (now,)
+        return _parallel_ordered(compress, sorted(self._files.items()), CTX.workers)
+
+    def export_archive(self, archive_path, compression_level=None):
+        level = CTX.zip_level if compression_level is None else compression_level
+        start = time.time()
+        total_size = sum(len(self._load(stored)) for stored in self._files.values())
+        if _zip_exceeds_limits(len(self._files), total_size):
+            _write_zip64(archive_path, ((rel, self._load(stored)) for rel, stored in sorted(self._files.items())), level)
+            return archive_path
+        count, stored = _write_zip_entries(archive_path, self._zip_entries(level))
+        _log_archive_written(archive_path, count, stored, level, total_size, start)
+        return archive_path
+
+    def export_directory(self, dest):
+        def write(rel, stored):
+            path = os.path.join(dest, *rel.split('/'))
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, 'wb') as f:
+                f.write(self._load(stored))
+        run_parallel(write, list(self._files.items()))
+
+
+class ArchiveOutputSink(MemoryOutputSink):
+    """
+    Chaque sortie est compressée dès son écriture, dans le thread qui la produit : l'export
+    ne fait plus qu'assembler l'archive, sans relire ni recompresser l'arborescence.
+    """
+    kind = "archive"
+
+    def __init__(self, root, compression_level=None):
+        super().__init__(root)
+        self.level = CTX.zip_level if compression_level is None else compression_level
+
+    def _store(self, rel, data):
+        return _compress_zip_member(rel, data, self.level) + (time.time(),)
+
+    def _load(self, stored):
+        import zlib
+        method, crc, size, data, mtime = stored
+        return zlib.decompress(data, -15) if method == zipfile.ZIP_DEFLATED else data
+
+    def _zip_entries(self, level):
+        if level != self.level:
+            return super()._zip_entries(level)
+        return ((rel,) + stored for rel, stored in sorted(self._files.items()))
+
+
+OUTPUT_SINKS = {"folder": DirectoryOutputSink, "memory": MemoryOutputSink, "archive": ArchiveOutputSink}
+
+
+def open_output_sink(kind, root):
+    """
+    Crée le sink de sortie ("folder", "memory" ou "archive") enraciné sur root.
+    """
+    return OUTPUT_SINKS.get(kind, DirectoryOutputSink)(root)
+
+# --- Index des textures de sortie et résolution des icônes ---
+class OutputTextureIndex:
+    """
+    Fichiers présents sous textures/ dans le sink de sortie ("item/foo.png"), listés une seule fois
+    puis tenus à jour par les écritures et suppressions du sink : les générateurs testent la
+    présence d'une icône par simple lookup, sans appel système.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._sink = None
+        self._prefix = None
+        self._files = set()
+        self._icons = {}
+
+    def _ensure(self):
+        with self._lock:
+            if self._sink is CTX.sink:
+                return
+        files = set(CTX.sink.list_files(os.path.join(CTX.bedrock_dir, 'textures')))
+        with self._lock:
+            self._sink, self._files, self._icons = CTX.sink, files, {}
+            self._prefix = os.path.join(CTX.sink.root, 'textures', '')
+
+    def note(self, sink, path, present):
+        """
+        Appelé par le sink après chaque écriture (present=True) ou suppression de path.
+        """
+        with self._lock:
+            if sink is not self._sink or not path.startswith(self._prefix):
+                return
+            rel = path[len(self._prefix):].replace(os.sep, '/')
+            if present:
+                self._files.add(rel)
+            else:
+                self._files.discard(rel)
+            self._icons.clear()
+
+    def invalidate(self, sink):
+        with self._lock:
+            if sink is self._sink:
+                self._sink = None
+
+    def __contains__(self, rel):
+        self._ensure()
+        with self._lock:
+            return rel in self._files
+
+    def resolve_icon(self, name):
+        """
+        Nom de l'icône de name dans textures/item/ : name, puis sans "minecraft:", puis en
+        minuscules ; name inchangé si aucun PNG ne correspond. Résultat mémorisé.
+        """
+        self._ensure()
+        with self._lock:
+            icon = self._icons.get(name)
+            if icon is None:
+                icon = name
+                if f"item/{name}.png" not in self._files:
+                    alt = name.replace("minecraft:", "")
+                    if f"item/{alt}.png" in self._files:
+                        icon = alt
+                    elif f"item/{alt.lower()}.png" in self._files:
+                        icon = alt.lower()
+                self._icons[name] = icon
+            return icon
+
+
+def resolve_icon_name(name):
+    return CTX.output_textures.resolve_icon(name)
+
 CUSTOM_ITEMS_FILE = "custom_items.json"
 
-if not JAVA_RP_DIR or not BEDROCK_RP_DIR:
-    raise EnvironmentError(t("no_java_dir"))
+
+def configure_paths(java_dir=None, bedrock_dir=None):
+    """
+    Fixe les chemins du contexte actif (variables d'environnement JAVA_RP_DIR / BEDROCK_RP_DIR
+    par défaut) : voir ConversionContext.configure_paths. Jamais appelé à l'import.
+    """
+    return current_context().configure_paths(java_dir, bedrock_dir)
 
 # Structure minimale
 bedrock_structure = [
@@ -229,16 +980,29 @@ bedrock_structure = [
 
 
 def clean_bedrock_directory():
-    for sub in ['bedrock', 'behavior', 'geyser_mappings']:
-        target = JAVA_RP_DIR.replace('java', sub)
-        if os.path.exists(target):
-            shutil.rmtree(target)
-            print(t("deleted_folder", target=target))
+    """
+    Vide le dossier de sortie Bedrock (via le sink actif) avant une reconstruction complète.
+    Le dossier lui-même est conservé ; il n'est pas touché s'il contient le pack Java.
+    """
+    bedrock_dir = os.path.abspath(CTX.bedrock_dir)
+    java_dir = os.path.abspath(CTX.java_dir)
+    if java_dir == bedrock_dir or java_dir.startswith(os.path.join(bedrock_dir, '')):
+        LOG_PACK.warning(f"[Nettoyage] Le pack Java est dans le dossier de sortie, nettoyage ignoré : {CTX.bedrock_dir}")
+        return
+    if not CTX.sink.isdir(CTX.bedrock_dir):
+        return
+    for name in CTX.sink.listdir(CTX.bedrock_dir):
+        target = os.path.join(CTX.bedrock_dir, name)
+        if CTX.sink.isdir(target):
+            CTX.sink.remove_tree(target)
+        else:
+            CTX.sink.remove(target)
+    LOG_PACK.info(t("cleaned_folder", target=CTX.bedrock_dir))
 
 def create_bedrock_structure():
-    os.makedirs(BEDROCK_RP_DIR, exist_ok=True)
+    CTX.sink.makedirs(CTX.bedrock_dir)
     for folder in bedrock_structure:
-        os.makedirs(os.path.join(BEDROCK_RP_DIR, folder), exist_ok=True)
+        CTX.sink.makedirs(os.path.join(CTX.bedrock_dir, folder))
     # Ajout : Génération automatique du manifest.json Bedrock après création de la structure
     if 'generate_manifest' in globals():
         generate_manifest()
@@ -250,51 +1014,30 @@ def process_model_entry(entry, item_base_name, texture_root, items, cmd_map, sou
     threshold = entry.get('threshold', 0)
 
     rel = model_ref.split(':', 1)[-1] if ':' in model_ref else model_ref
-    # Utilisation de l'index pour lookup rapide
-    model_path = None
-    if model_index is not None:
-        # Essaye d'abord model_ref tel quel
-        if ':' in model_ref:
-            model_path = model_index.get(model_ref)
-        # Sinon, essaye tous les namespaces
-        if not model_path:
-            for ns in model_index:
-                if ns.endswith(f':{rel}'):
-                    model_path = model_index[ns]
-                    break
-    # Fallback legacy (si pas trouvé dans l'index)
-    if not model_path:
-        assets_root = os.path.join(JAVA_RP_DIR, 'assets')
-        possible_paths = [
-            os.path.join(assets_root, *rel.split('/')) + '.json'
-        ]
-        if os.path.isdir(assets_root):
-            for ns in os.listdir(assets_root):
-                ns_model = os.path.join(assets_root, ns, 'models', *rel.split('/')) + '.json'
-                possible_paths.append(ns_model)
-        possible_paths.append(os.path.join(assets_root, 'minecraft', 'models', *rel.split('/')) + '.json')
-        model_path = next((p for p in possible_paths if os.path.isfile(p)), None)
+    # Lookup O(1) dans l'index (construit une seule fois par extract_custom_model_data)
+    if model_index is None:
+        model_index = build_model_index()
+    model_path = model_index.resolve(model_ref)
     if not model_path:
-        print(t("model_not_found", rel=rel))
+        LOG_ITEMS.warning(t("model_not_found", rel=rel))
         return
 
     texture_list = []
     try:
-        with open(model_path, encoding='utf-8') as f:
-            bb_model = json.load(f)
+        bb_model = resolve_java_model(model_path)[0]
         textures = bb_model.get('textures', {})
         texture_list = []
         for tex_value in textures.values():
             if ':' in tex_value:
                 texture_list.append(tex_value)
             else:
-                model_ns = model_path.split('assets' + os.sep)[-1].split(os.sep)[0]
+                model_ns = model_path.split('assets/')[-1].split('/')[0]
                 if model_ns != 'minecraft':
                     texture_list.append(f"{model_ns}:{tex_value}")
                 else:
                     texture_list.append(tex_value)
     except Exception as e:
-        print(t("texture_not_found", model_path=model_path, error=str(e)))
+        LOG_ITEMS.warning(t("texture_not_found", model_path=model_path, error=str(e)))
 
     geo_name = f"{item_base_name.lower().replace(' ', '_')}_cmd{threshold}"
     tex_entry = texture_list[0] if texture_list else rel
@@ -315,68 +1058,552 @@ def process_model_entry(entry, item_base_name, texture_root, items, cmd_map, sou
         "display_name": f"§f{item_base_name.replace('_', ' ').title()} (CMD:{threshold})",
         "texture": tex_entry,
         "bedrock_texture_path": bedrock_texture_path,
-        "tex_name_for_rc": tex_name_for_rc
+        "tex_name_for_rc": tex_name_for_rc,
+        "model_path": model_path
     })
-    convert_java_model_to_geo(model_path, item_name, tex_entry, bedrock_texture_path, tex_name_for_rc)
 
-def copy_all_item_textures():
+# CTX.texture_copy_mode : "referenced", seules les textures atteignables depuis les items extraits
+# sont copiées, ou "all", toutes les textures du pack (ancien comportement)
+
+
+def _texture_copy_jobs():
     """
-    Copie les textures en préservant la structure du namespace original.
+    (source dans le pack, destination Bedrock) pour chaque PNG de assets/<ns>/textures, et la
+    taille de chaque source relevée pendant le même parcours ({source: octets}).
     Par exemple: assets/custom_stuff_v1/textures/item/... -> textures/custom_stuff_v1/item/...
     """
-    import time
-    start = time.time()
-    src_root = os.path.join(JAVA_RP_DIR, 'assets')
-    if not os.path.exists(src_root):
-        print(t("assets_folder_not_found"))
-        return
+    if not CTX.pack.isdir('assets'):
+        LOG_TEXTURES.warning(t("assets_folder_not_found"))
+        return [], {}
     copy_jobs = []
-    ns_list = os.listdir(src_root)
-    print(f"[Textures] {len(ns_list)} namespaces à traiter...")
+    sizes = {}
+    ns_list = CTX.pack.listdir('assets')
+    LOG_TEXTURES.info(f"[Textures] {len(ns_list)} namespaces à traiter...")
     for ns in ns_list:
-        ns_textures = os.path.join(src_root, ns, 'textures')
-        if not os.path.isdir(ns_textures):
+        ns_textures = f"assets/{ns}/textures"
+        if not CTX.pack.isdir(ns_textures):
             continue
-        for root, dirs, files in os.walk(ns_textures):
-            rel_path = os.path.relpath(root, ns_textures)
-            dst_path = os.path.join(BEDROCK_RP_DIR, 'textures', ns, rel_path)
-            os.makedirs(dst_path, exist_ok=True)
-            for file in files:
+        for root, dirs, files in CTX.pack.walk_sizes(ns_textures):
+            rel_path = root[len(ns_textures):].lstrip('/')
+            dst_path = os.path.join(CTX.bedrock_dir, 'textures', ns, *rel_path.split('/'))
+            for file, size in files.items():
                 if file.endswith('.png'):
-                    src_file = os.path.join(root, file)
-                    dst_file = os.path.join(dst_path, file)
-                    copy_jobs.append((src_file, dst_file))
-    print(f"[Textures] {len(copy_jobs)} fichiers à copier...")
+                    copy_jobs.append((f"{root}/{file}", os.path.join(dst_path, file)))
+                    sizes[f"{root}/{file}"] = size
+    return copy_jobs, sizes
+
+
+def _copy_textures(copy_jobs):
+    LOG_TEXTURES.info(f"[Textures] {len(copy_jobs)} fichiers à copier...")
+    CTX.copied_textures.clear()
     def do_copy(src, dst):
-        shutil.copy2(src, dst)
-    run_parallel(do_copy, copy_jobs)
-    print(t("all_textures_copied"))
-    print(f"[Textures] Copie terminée en {round(time.time()-start,1)}s.")
+        # Une sortie optimisée en PNG8 n'est pas interchangeable avec une copie brute
+        cache_key = f"texture:png8:{src}" if CTX.texture_optimize else f"texture:{src}"
+        cache_hash = CTX.build_cache.input_hash(src) if CTX.build_cache.enabled else None
+        if CTX.build_cache.is_fresh(cache_key, cache_hash):
+            return
+        CTX.sink.copy_from_pack(CTX.pack, src, dst)
+        if CTX.texture_optimize:
+            # Enregistrée dans le cache après l'étape d'optimisation
+            CTX.copied_textures.append((src, dst, cache_key, cache_hash))
+        else:
+            CTX.build_cache.record(cache_key, cache_hash, [dst])
+    run_parallel(do_copy, copy_jobs, desc="textures")
+    log_copy_methods(LOG_TEXTURES, "Textures")
 
-import os
-import json
-import traceback
+
+def copy_all_item_textures():
+    """
+    Copie toutes les textures en préservant la structure du namespace original.
+    """
+    start = time.time()
+    _copy_textures(_texture_copy_jobs()[0])
+    LOG_TEXTURES.info(t("all_textures_copied"))
+    elapsed = time.time() - start
+    CTX.metrics.record_time("textures.copy", elapsed)
+    LOG_TEXTURES.info(f"[Textures] Copie terminée en {round(elapsed,1)}s.")
+
+
+def texture_pack_paths(texture_ref, model_path=None):
+    """
+    Chemins candidats dans le pack pour une référence de texture Java ("ns:item/x" ou "item/x").
+    Sans namespace, le namespace du modèle est essayé avant minecraft (comme process_model_entry).
+    """
+    if texture_ref.endswith('.png'):
+        texture_ref = texture_ref[:-4]
+    if ':' in texture_ref:
+        ns, path = texture_ref.split(':', 1)
+        return [f"assets/{ns}/textures/{path}.png"]
+    candidates = [f"assets/minecraft/textures/{texture_ref}.png"]
+    if model_path and model_path.startswith('assets/'):
+        model_ns = model_path.split('/')[1]
+        if model_ns != 'minecraft':
+            candidates.insert(0, f"assets/{model_ns}/textures/{texture_ref}.png")
+    return candidates
+
+
+def referenced_texture_paths(items):
+    """
+    Textures du pack atteignables depuis les items extraits : textures de leur modèle aplati
+    (parents et variables #... résolus) et texture retenue pour l'item.
+    """
+    referenced = set()
+    for item in items:
+        model_path = item.get('model_path')
+        refs = [item.get('texture')]
+        if model_path:
+            try:
+                refs.extend(resolve_java_model(model_path)[0].get('textures', {}).values())
+            except Exception as e:
+                LOG_TEXTURES.debug("[Textures] Modèle illisible %s : %s", model_path, e)
+        for ref in refs:
+            if isinstance(ref, str) and ref and not ref.startswith('#'):
+                referenced.update(texture_pack_paths(ref, model_path))
+    return referenced
+
+
+def copy_referenced_textures(items):
+    """
+    Copie uniquement les textures référencées par les items (CTX.texture_copy_mode = "referenced"),
+    ou toutes les textures en mode "all", et indique le nombre et le volume des textures évitées.
+    """
+    if CTX.texture_copy_mode == "all":
+        copy_all_item_textures()
+        return
+    start = time.time()
+    all_jobs, sizes = _texture_copy_jobs()
+    referenced = referenced_texture_paths(items)
+    copy_jobs = [job for job in all_jobs if job[0] in referenced]
+    _copy_textures(copy_jobs)
+    skipped = [src for src, _ in all_jobs if src not in referenced]
+    elapsed = time.time() - start
+    CTX.metrics.record_time("textures.copy", elapsed)
+    saved_bytes = sum(sizes[src] for src in skipped)
+    LOG_TEXTURES.info(f"[Textures] {len(copy_jobs)}/{len(all_jobs)} textures référencées copiées, "
+                      f"{len(skipped)} ignorées ({saved_bytes / 1024:.1f} Ko évités) en {round(elapsed,1)}s.")
 
 # --- Patch: JSON parser rapide (orjson si dispo) ---
-try:
-    import orjson
-    def fast_json_load(f):
-        # orjson expects bytes, so read in 'rb' mode
-        if hasattr(f, 'buffer'):
-            return orjson.loads(f.buffer.read())
+def fast_json_loads(data):
+    # Premier appel : orjson s'il est installé, sinon json ; la fonction se remplace ensuite
+    # par le parseur retenu (aucun surcoût sur les appels suivants)
+    global fast_json_loads
+    orjson = optional_import("orjson")
+    fast_json_loads = orjson.loads if orjson else json.loads
+    return fast_json_loads(data)
+
+
+def fast_json_load(f):
+    # orjson expects bytes, so read in 'rb' mode
+    return fast_json_loads(f.buffer.read() if hasattr(f, 'buffer') else f.read())
+
+# --- Écriture des fichiers JSON Bedrock ---
+# "pretty" : indentation propre à chaque fichier (format historique), "compact" : minifié,
+# sérialisé avec orjson si disponible. Tous les fichiers générés passent par write_json.
+# CTX.json_compare mesure aussi l'autre mode (en mémoire uniquement) pour comparer taille et temps.
+_JSON_WRITE_STATS_LOCK = threading.Lock()
+
+
+def serialize_json(data, mode, indent=4):
+    if mode == "compact":
+        orjson = optional_import("orjson")
+        if orjson:
+            return orjson.dumps(data)
+        return json.dumps(data, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+    return json.dumps(data, indent=indent).encode('utf-8')
+
+
+def write_json(path, data, indent=4, atomic=False):
+    """
+    Écrit data dans path (via CTX.sink) selon CTX.json_mode ; indent ne s'applique qu'au mode pretty.
+    """
+    start = time.perf_counter()
+    payload = serialize_json(data, CTX.json_mode, indent)
+    CTX.sink.write_bytes(path, payload, atomic=atomic)
+    elapsed = time.perf_counter() - start
+    alt_bytes = alt_time = 0
+    if CTX.json_compare:
+        alt_start = time.perf_counter()
+        alt_bytes = len(serialize_json(data, "pretty" if CTX.json_mode == "compact" else "compact", indent))
+        alt_time = time.perf_counter() - alt_start
+    with _JSON_WRITE_STATS_LOCK:
+        CTX.json_write_stats["files"] += 1
+        CTX.json_write_stats["bytes"] += len(payload)
+        CTX.json_write_stats["time"] += elapsed
+        CTX.json_write_stats["alt_bytes"] += alt_bytes
+        CTX.json_write_stats["alt_time"] += alt_time
+
+
+def print_json_write_summary():
+    stats = CTX.json_write_stats
+    LOG_OUTPUT.info(f"[JSON] {stats['files']} fichiers, {stats['bytes'] / 1024:.1f} Ko écrits en {stats['time'] * 1000:.0f} ms (mode {CTX.json_mode})")
+    if CTX.json_compare and stats['alt_bytes']:
+        other = "pretty" if CTX.json_mode == "compact" else "compact"
+        LOG_OUTPUT.info(f"[JSON] Mode {other} : {stats['alt_bytes'] / 1024:.1f} Ko, sérialisation {stats['alt_time'] * 1000:.0f} ms "
+              f"(taille x{stats['alt_bytes'] / max(1, stats['bytes']):.2f}, hors écriture disque)")
+
+
+class LRUCache:
+    """
+    Cache borné et thread-safe : au-delà de maxsize, l'entrée la moins récemment utilisée est évincée.
+    """
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            value = self._data.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def __len__(self):
+        return len(self._data)
+
+# --- Résolution de l'héritage des modèles Java (parent) ---
+# Modèles vanilla référencés comme parent mais absents de la plupart des resource packs.
+VANILLA_PARENT_MODELS = {
+    "minecraft:item/generated": {
+        "parent": "builtin/generated",
+        "display": {
+            "ground": {"rotation": [0, 0, 0], "translation": [0, 2, 0], "scale": [0.5, 0.5, 0.5]},
+            "head": {"rotation": [0, 180, 0], "translation": [0, 13, 7], "scale": [1, 1, 1]},
+            "thirdperson_righthand": {"rotation": [0, 0, 0], "translation": [0, 3, 1], "scale": [0.55, 0.55, 0.55]},
+            "firstperson_righthand": {"rotation": [0, -90, 25], "translation": [1.13, 3.2, 1.13], "scale": [0.68, 0.68, 0.68]},
+            "fixed": {"rotation": [0, 180, 0], "scale": [1, 1, 1]}
+        }
+    },
+    "minecraft:item/handheld": {
+        "parent": "item/generated",
+        "display": {
+            "thirdperson_righthand": {"rotation": [0, -90, 55], "translation": [0, 4.0, 0.5], "scale": [0.85, 0.85, 0.85]},
+            "thirdperson_lefthand": {"rotation": [0, 90, -55], "translation": [0, 4.0, 0.5], "scale": [0.85, 0.85, 0.85]},
+            "firstperson_righthand": {"rotation": [0, -90, 25], "translation": [1.13, 3.2, 1.13], "scale": [0.68, 0.68, 0.68]},
+            "firstperson_lefthand": {"rotation": [0, 90, -25], "translation": [1.13, 3.2, 1.13], "scale": [0.68, 0.68, 0.68]}
+        }
+    }
+}
+
+# CTX.resolved_models : cache partagé par tous les jobs du run, chemin du modèle -> (modèle aplati,
+# chaîne des fichiers parents). Borné (LRU) pour les très gros packs : PACKCONVERTER_MODEL_CACHE_SIZE
+# entrées au maximum. CTX.model_read_stats compte les lectures réelles de fichiers modèles (hors cache).
+_MODEL_READ_STATS_LOCK = threading.Lock()
+# En mode batch, un modèle identique dans plusieurs packs (parents vanilla recopiés dans la plupart
+# des packs) n'est parsé qu'une fois : CTX.shared_models, clé (chemin, taille, CRC) pour un ZIP,
+# connue sans lire le fichier, ou (chemin, sha1 du contenu) pour un dossier.
+
+
+def parent_model_path(parent_ref):
+    """
+    Chemin dans le pack d'une référence "parent" (namespace minecraft par défaut).
+    """
+    ns, rel = parent_ref.split(':', 1) if ':' in parent_ref else ('minecraft', parent_ref)
+    return f"assets/{ns}/models/{rel}.json"
+
+
+def _merge_parent_model(parent, child):
+    """
+    Applique les règles d'héritage de Minecraft : textures et display sont fusionnés clé par
+    clé (l'enfant gagne), les autres propriétés (elements, groups, texture_size...) sont
+    remplacées. Les textures de l'enfant restent en tête : la première sert d'icône.
+    """
+    merged = {k: v for k, v in parent.items() if k != 'parent'}
+    for key, value in child.items():
+        if key == 'parent':
+            continue
+        if key == 'textures' and isinstance(value, dict):
+            textures = dict(value)
+            for tex_key, tex_value in parent.get('textures', {}).items():
+                textures.setdefault(tex_key, tex_value)
+            merged['textures'] = textures
+        elif key == 'display' and isinstance(value, dict):
+            merged['display'] = {**parent.get('display', {}), **value}
         else:
-            return orjson.loads(f.read())
-except ImportError:
-    def fast_json_load(f):
-        return json.load(f)
+            merged[key] = value
+    # Les groupes Blockbench indexent les éléments : ils ne survivent pas à leur remplacement
+    if 'elements' in child and 'groups' not in child:
+        merged.pop('groups', None)
+    return merged
+
+
+def _resolve_texture_variables(textures):
+    resolved = {}
+    for key, value in textures.items():
+        seen = set()
+        while isinstance(value, str) and value.startswith('#') and value not in seen:
+            seen.add(value)
+            value = textures.get(value[1:])
+        if isinstance(value, str) and not value.startswith('#'):
+            resolved[key] = value
+    return resolved
+
+
+def resolve_java_model(model_path, _depth=0):
+    """
+    Renvoie (modèle aplati, chaîne des chemins parents) pour model_path, en remontant la
+    chaîne "parent". Chaque modèle de base n'est lu et fusionné qu'une fois par run.
+    """
+    cached = CTX.resolved_models.get(model_path)
+    if cached is not None:
+        return cached
+    if CTX.pack.isfile(model_path):
+        shared_key = model = data = None
+        if CTX.shared_models is not None:
+            st = CTX.pack.stat(model_path)
+            if st.crc is not None:
+                shared_key = (model_path, st.size, st.crc)
+            else:
+                # Dossier : taille et date ne prouvent pas que le contenu est identique
+                data = CTX.pack.read_bytes(model_path)
+                shared_key = (model_path, hashlib.sha1(data).digest())
+            model = CTX.shared_models.get(shared_key)
+        if model is None:
+            if data is None:
+                data = CTX.pack.read_bytes(model_path)
+            parse_start = time.perf_counter()
+            model = fast_json_loads(data)
+            parse_time = time.perf_counter() - parse_start
+            with _MODEL_READ_STATS_LOCK:
+                CTX.model_read_stats["files"] += 1
+                CTX.model_read_stats["bytes"] += len(data)
+                CTX.model_read_stats["parse_time"] += parse_time
+            if shared_key is not None:
+                CTX.shared_models.put(shared_key, model)
+    else:
+        ns, rel = model_path[len('assets/'):-len('.json')].split('/models/', 1)
+        model = VANILLA_PARENT_MODELS.get(f"{ns}:{rel}", {})
+    chain = [model_path] if CTX.pack.isfile(model_path) else []
+    parent_ref = model.get('parent')
+    if parent_ref and not parent_ref.split(':')[-1].startswith('builtin/') and _depth < 32:
+        parent, parent_chain = resolve_java_model(parent_model_path(parent_ref), _depth + 1)
+        model = _merge_parent_model(parent, model)
+        chain = chain + parent_chain
+    if 'textures' in model:
+        model = dict(model)
+        model['textures'] = _resolve_texture_variables(model['textures'])
+    result = (model, chain)
+    CTX.resolved_models.put(model_path, result)
+    return result
+
+# --- Cache de conversion incrémentale ---
+# Manifest persistant : entrée Java -> hash du contenu -> fichiers Bedrock produits.
+# Incrémenter CACHE_VERSION dès que le format des fichiers générés change.
+CACHE_VERSION = 4
+CACHE_DIR = os.environ.get("PACKCONVERTER_CACHE_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), '.packconverter_cache'))
+
+
+class BuildCache:
+    """
+    Suit les entrées déjà converties pour ne reconstruire que ce qui a changé.
+    Un cache sans chemin (manifest_path=None) est désactivé : tout est reconstruit.
+    """
+
+    def __init__(self, manifest_path=None, full=False):
+        self.manifest_path = manifest_path
+        self.enabled = manifest_path is not None
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._touched = set()
+        self._inputs = {}
+        self._entries = {}
+        # Entrées d'un manifest d'une autre version : inutilisables, mais leurs sorties sont nettoyées
+        self._stale_entries = {}
+        # Entrées périmées retirées par is_fresh : leurs anciennes sorties (ex: géométrie partagée
+        # d'une forme qui a changé) sont supprimées par finalize si plus rien ne les référence
+        self._replaced = []
+        if self.enabled and not full and os.path.isfile(manifest_path):
+            try:
+                with open(manifest_path, encoding='utf-8') as f:
+                    data = json.load(f)
+                if data.get('version') == CACHE_VERSION:
+                    self._inputs = data.get('inputs', {})
+                    self._entries = data.get('entries', {})
+                else:
+                    self._stale_entries = data.get('entries', {})
+            except Exception as e:
+                LOG_CACHE.warning(f"[Cache] Manifest illisible, reconstruction complète : {e}")
+
+    def input_hash(self, rel):
+        """
+        Hash du contenu d'un fichier du pack Java. Pour un ZIP, le CRC du répertoire
+        central suffit ; pour un dossier, le hash n'est recalculé que si la taille ou
+        la date de modification ont changé.
+        """
+        st = CTX.pack.stat(rel)
+        if st.crc is not None:
+            return f"crc:{st.crc:08x}:{st.size}"
+        with self._lock:
+            known = self._inputs.get(rel)
+        if known and known[0] == st.size and known[1] == st.mtime:
+            return known[2]
+        digest = "md5:" + hashlib.md5(CTX.pack.read_bytes(rel)).hexdigest()
+        with self._lock:
+            self._inputs[rel] = [st.size, st.mtime, digest]
+        return digest
+
+    def is_fresh(self, key, digest):
+        """
+        Vrai si key a déjà été produit à partir de digest et que ses sorties existent.
+        Une entrée périmée est retirée : elle sera réenregistrée après reconstruction.
+        """
+        if not self.enabled:
+            return False
+        with self._lock:
+            self._touched.add(key)
+            entry = self._entries.get(key)
+            fresh = bool(entry) and entry['hash'] == digest and all(self._output_exists(out) for out in entry['outputs'])
+            if fresh:
+                self.hits += 1
+            else:
+                self.misses += 1
+                stale = self._entries.pop(key, None)
+                if stale:
+                    self._replaced.append(stale)
+            return fresh
+
+    @staticmethod
+    def _output_exists(out):
+        CTX.metrics.add("output.fs_calls")
+        return os.path.isfile(os.path.join(CTX.bedrock_dir, *out.split('/')))
+
+    def record(self, key, digest, outputs, meta=None):
+        if not self.enabled:
+            return
+        rel_outputs = [os.path.relpath(out, CTX.bedrock_dir).replace(os.sep, '/') for out in outputs]
+        entry = {'hash': digest, 'outputs': rel_outputs}
+        if meta:
+            entry['meta'] = meta
+        with self._lock:
+            self._touched.add(key)
+            self._entries[key] = entry
+
+    def meta(self, key):
+        with self._lock:
+            return self._entries.get(key, {}).get('meta', {})
+
+    def finalize(self):
+        """
+        Supprime les sorties des entrées qui n'existent plus dans le pack Java, puis
+        enregistre le manifest.
+        """
+        if not self.enabled:
+            return
+        dropped = [self._entries.pop(k) for k in list(self._entries) if k not in self._touched]
+        dropped.extend(self._stale_entries.values())
+        self._stale_entries = {}
+        pruned = len(dropped)
+        # Une sortie partagée (ex: géométrie commune) n'est supprimée que si plus aucune entrée ne l'utilise
+        still_used = {out for entry in self._entries.values() for out in entry['outputs']}
+        candidates = {out for entry in dropped + self._replaced for out in entry['outputs']}
+        self._replaced = []
+        # Géométries partagées orphelines, y compris celles laissées par un manifest plus ancien
+        geo_dir = os.path.join(CTX.bedrock_dir, 'models', 'entity')
+        CTX.metrics.add("output.fs_calls")
+        if os.path.isdir(geo_dir):
+            CTX.metrics.add("output.fs_calls")
+            candidates.update(f"models/entity/{name}" for name in os.listdir(geo_dir)
+                              if name.startswith('shared_') and name.endswith('.geo.json'))
+        removed = 0
+        for out in sorted(candidates - still_used):
+            out_path = os.path.join(CTX.bedrock_dir, *out.split('/'))
+            if self._output_exists(out):
+                os.remove(out_path)
+                removed += 1
+        os.makedirs(os.path.dirname(self.manifest_path), exist_ok=True)
+        tmp_path = self.manifest_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': CACHE_VERSION, 'inputs': self._inputs, 'entries': self._entries}, f)
+        os.replace(tmp_path, self.manifest_path)
+        LOG_CACHE.info(f"[Cache] {self.hits} entrées à jour, {self.misses} reconstruites, {pruned} obsolètes supprimées "
+                       f"({removed} fichiers de sortie retirés).")
+
+
+def cache_manifest_path():
+    """
+    Un manifest par dossier de sortie Bedrock.
+    """
+    out_key = hashlib.md5(os.path.abspath(CTX.bedrock_dir).encode()).hexdigest()[:7]
+    return os.path.join(CACHE_DIR, f"build_{out_key}.json")
+
+
+# CTX.model_conversions : nombre de conversions effectives par modèle Bedrock (hors cache)
+_MODEL_CONVERSIONS_LOCK = threading.Lock()
+_WRITTEN_GEOMETRIES_LOCK = threading.Lock()
+
+
+def geometry_identifier(shape):
+    """
+    Identifiant adressé par contenu : deux modèles aux cubes, UV et transformations
+    identiques (seule la texture diffère) partagent la même géométrie Bedrock.
+    """
+    digest = hashlib.md5(json.dumps(shape, sort_keys=True, separators=(',', ':')).encode()).hexdigest()
+    return f"geometry.shared_{digest[:16]}"
+
+
+def geometry_file_name(identifier):
+    return f"{identifier[len('geometry.'):]}.geo.json"
+
+
+def item_geometry(item):
+    """
+    Identifiant de géométrie d'un item (partagé si convert_planned_models l'a renseigné).
+    """
+    name = item['name'].split(":")[-1]
+    return item.get('geometry') or CTX.geometry_ids.get(name) or f"geometry.{name}"
+
+
+def _write_shared_geometry(out_geo, geo):
+    with _WRITTEN_GEOMETRIES_LOCK:
+        if out_geo in CTX.written_geometries:
+            return False
+        CTX.written_geometries.add(out_geo)
+    # Écriture atomique : plusieurs workers peuvent produire la même géométrie en même temps
+    write_json(out_geo, geo, indent='\t', atomic=True)
+    return True
+
+
+def model_cache_key(model_path, output_name, texture_key):
+    # Le hash couvre toute la chaîne de parents : modifier un modèle de base reconstruit ses enfants
+    chain = resolve_java_model(model_path)[1] or [model_path]
+    inputs = '|'.join(f"{path}={CTX.build_cache.input_hash(path)}" for path in chain)
+    # Géométrie, render controller et animation sont écrits selon CTX.json_mode : changer de mode reconstruit
+    digest = hashlib.md5(f"{inputs}|{texture_key}|json:{CTX.json_mode}".encode()).hexdigest()
+    return f"model:{output_name}", digest
 
 def convert_java_model_to_geo(model_path, output_name, texture_key, bedrock_texture_path=None, tex_name_for_rc=None):
-    start_time = time.time()
+    start_time = time.perf_counter()
     try:
-        print(t("reading_java_model"))
-        with open(model_path, encoding='utf-8') as f:
-            # Lecture RAM + parsing rapide
-            model = fast_json_load(f)
+        cache_key = cache_hash = None
+        if CTX.build_cache.enabled:
+            cache_key, cache_hash = model_cache_key(model_path, output_name, texture_key)
+            if CTX.build_cache.is_fresh(cache_key, cache_hash):
+                LOG_CACHE.debug("[Cache] %s inchangé, conversion ignorée.", output_name)
+                return {"outputs": [], "geometry": CTX.build_cache.meta(cache_key).get("geometry")}
+        LOG_MODELS.debug(LazyText("reading_java_model"))
+        # Modèle aplati (héritage "parent" résolu, parents partagés entre tous les jobs)
+        model = resolve_java_model(model_path)[0]
         
         # Extraire le namespace et le chemin de la texture
         texture_namespace = "minecraft"  # namespace par défaut
@@ -384,7 +1611,6 @@ def convert_java_model_to_geo(model_path, output_name, texture_key, bedrock_text
         if ":" in texture_key:
             texture_namespace, texture_path = texture_key.split(":", 1)
 
-        identifier = f"geometry.{output_name}"
         tex_w, tex_h = model.get('texture_size', [16, 16])
         # Si texture_size est spécifié, divise par 2 pour l'output Bedrock
         if 'texture_size' in model:
@@ -395,7 +1621,7 @@ def convert_java_model_to_geo(model_path, output_name, texture_key, bedrock_text
         bounds_offset = model.get('visible_bounds_offset', [0, 0.75, 0])
         elements = model.get('elements', [])
         groups = model.get('groups', [])
-        print(t("elements_and_groups", elements=len(elements), groups=len(groups)))
+        LOG_MODELS.debug(LazyText("elements_and_groups", elements=len(elements), groups=len(groups)))
 
         def correct_uv_mapping(face, uv_data):
             if "uv" not in uv_data or len(uv_data['uv']) != 4:
@@ -497,8 +1723,8 @@ def convert_java_model_to_geo(model_path, output_name, texture_key, bedrock_text
                     return bone
                 return None
             except Exception as e:
-                print(f"Error processing group {group.get('name')}: {e}")
-                traceback.print_exc()
+                LOG_MODELS.warning(f"Error processing group {group.get('name')}: {e}",
+                                   exc_info=LOG_MODELS.isEnabledFor(logging.DEBUG))
                 return None
 
         bones = []
@@ -559,6 +1785,18 @@ def convert_java_model_to_geo(model_path, output_name, texture_key, bedrock_text
                     entry["fit_to_frame"] = False
                 item_display_transforms[key.lower()] = entry
 
+        description = {
+            "texture_width": tex_w,
+            "texture_height": tex_h,
+            "visible_bounds_width": bounds_width,
+            "visible_bounds_height": bounds_height,
+            "visible_bounds_offset": bounds_offset
+        }
+        identifier = geometry_identifier({
+            "description": description,
+            "bones": bones,
+            "item_display_transforms": item_display_transforms
+        })
         geo = {
             "format_version": "1.12.0",
             "minecraft:geometry": [
@@ -577,11 +1815,10 @@ def convert_java_model_to_geo(model_path, output_name, texture_key, bedrock_text
             ]
         }
 
-        out_geo = os.path.join(BEDROCK_RP_DIR, 'models', 'entity', f'{output_name}.geo.json')
-        os.makedirs(os.path.dirname(out_geo), exist_ok=True)
-        print(t("writing_geo_file", out_geo=out_geo))
-        with open(out_geo, 'w', encoding='utf-8') as f:
-            json.dump(geo, f, indent='\t', separators=(',', ': '))
+        out_geo = os.path.join(CTX.bedrock_dir, 'models', 'entity', geometry_file_name(identifier))
+        CTX.sink.makedirs(os.path.dirname(out_geo))
+        if _write_shared_geometry(out_geo, geo):
+            LOG_MODELS.debug(LazyText("writing_geo_file", out_geo=out_geo))
 
         # Correction: le nom de la texture dans le render_controller doit correspondre au chemin copié depuis le pack Java
         # On utilise tex_entry (chemin brut issu du modèle Java)
@@ -602,22 +1839,19 @@ def convert_java_model_to_geo(model_path, output_name, texture_key, bedrock_text
                 }
             }
         }
-        out_rc = os.path.join(BEDROCK_RP_DIR, 'render_controllers', f'{output_name}.render_controller.json')
-        os.makedirs(os.path.dirname(out_rc), exist_ok=True)
-        print(t("writing_render_controller_file", out_rc=out_rc))
-        with open(out_rc, 'w', encoding='utf-8') as f:
-            json.dump(rc, f, indent='\t', separators=(',', ': '))
-        print(t("conversion_success_advanced", output_name=output_name))
+        out_rc = os.path.join(CTX.bedrock_dir, 'render_controllers', f'{output_name}.render_controller.json')
+        CTX.sink.makedirs(os.path.dirname(out_rc))
+        LOG_MODELS.debug(LazyText("writing_render_controller_file", out_rc=out_rc))
+        write_json(out_rc, rc, indent='\t')
+        LOG_MODELS.debug(LazyText("conversion_success_advanced", output_name=output_name))
 
         # --- Génération d'une seule animation Bedrock par item ---
-        anim_dir = os.path.join(BEDROCK_RP_DIR, 'animations')
-        os.makedirs(anim_dir, exist_ok=True)
+        anim_dir = os.path.join(CTX.bedrock_dir, 'animations')
+        CTX.sink.makedirs(anim_dir)
         # Essayons d'utiliser les données display du modèle Java si elles existent
         animation_data = None
         try:
-            with open(model_path, encoding='utf-8') as f:
-                model_data = json.load(f)
-            display = model_data.get('display', {})
+            display = model.get('display', {})
             # Structure d'animation avancée, similaire aux exemples fournis
             bones_anim = {}
             # Pour chaque perspective, crée une animation si les données existent
@@ -642,7 +1876,7 @@ def convert_java_model_to_geo(model_path, output_name, texture_key, bedrock_text
                 }
             }
         except Exception as e:
-            print(f"[Animation] Erreur lors de la lecture des données display du modèle : {e}")
+            LOG_MODELS.warning(f"[Animation] Erreur lors de la lecture des données display du modèle : {e}")
         # Fallback si aucune donnée display n'est trouvée
         if not animation_data:
             # Utilise la position du root bone comme fallback
@@ -665,44 +1899,221 @@ def convert_java_model_to_geo(model_path, output_name, texture_key, bedrock_text
                 }
             }
         anim_path = os.path.join(anim_dir, f"animation.{output_name}.json")
-        with open(anim_path, 'w', encoding='utf-8') as f:
-            json.dump(animation_data, f, indent=4)
-        print(f"[Animation] Animation Bedrock générée : {anim_path}")
+        write_json(anim_path, animation_data, indent=4)
+        LOG_MODELS.debug("[Animation] Animation Bedrock générée : %s", anim_path)
+        outputs = [out_geo, out_rc, anim_path]
+        CTX.build_cache.record(cache_key, cache_hash, outputs, {"geometry": identifier})
+        with _MODEL_CONVERSIONS_LOCK:
+            CTX.model_conversions[output_name] += 1
     except Exception as e:
-        print(t("conversion_model_error", model_path=model_path, error=str(e)))
-        traceback.print_exc()
+        LOG_MODELS.error(t("conversion_model_error", model_path=model_path, error=str(e)),
+                         exc_info=LOG_MODELS.isEnabledFor(logging.DEBUG))
         return
-    elapsed = time.time() - start_time
-    print(f"[Profiling] Conversion {output_name} en {elapsed:.2f}s")
+    elapsed = time.perf_counter() - start_time
+    CTX.metrics.add("models.converted")
+    CTX.metrics.observe("models.latency_ms", elapsed * 1000)
+    LOG_MODELS.debug("[Profiling] Conversion %s en %.2fs", output_name, elapsed)
+    return {"outputs": outputs, "geometry": identifier, "seconds": elapsed}
 
 # --- Conversion PNG8 ---
-def convert_texture_to_png8(src, dst):
-    if not PIL_AVAILABLE:
-        print(t("pillow_not_installed", src=src))
-        shutil.copy2(src, dst)
-        return
+# Étape optionnelle du pipeline : les textures copiées pendant ce run sont quantifiées en palette
+# 256 couleurs dans un pool de processus ; le PNG8 n'est gardé que s'il est plus petit.
+# Sous CTX.png8_min_bytes, le gain est négligeable (textures 16x16 typiques). Les textures de
+# CTX.copied_textures ne sont enregistrées dans le cache de build qu'après optimisation.
+PNG8_CHUNK_SIZE = 32
+
+
+def _quantize_png(data):
+    """
+    Quantifie un PNG en palette 256 couleurs (alpha conservé). Renvoie (statut, octets) :
+    "optimized" avec le PNG8, "palette" ou "no_gain" si l'original est à garder,
+    "error" avec le message d'erreur.
+    """
+    import io
+    from PIL import Image
     try:
-        from PIL import Image
-        img = Image.open(src).convert("RGBA")
-        img = img.quantize(colors=256, method=Image.Quantize.MEDIANCUT)
-        img.save(dst, optimize=True)
-        print(t("png8_generated", dst=dst))
+        with Image.open(io.BytesIO(data)) as img:
+            if img.mode in ("P", "1"):
+                return "palette", None
+            rgba = img.convert("RGBA")
+        # MEDIANCUT refuse les images RGBA : seul l'octree garde la transparence
+        quantized = rgba.quantize(colors=256, method=Image.Quantize.FASTOCTREE)
+        out = io.BytesIO()
+        quantized.save(out, format="PNG", optimize=True)
     except Exception as e:
-        print(t("png8_error", src=src, error=str(e)))
+        return "error", str(e)
+    result = out.getvalue()
+    if len(result) >= len(data):
+        return "no_gain", None
+    return "optimized", result
+
+
+def _quantize_png_chunk(datas):
+    return [_quantize_png(data) for data in datas]
+
+
+def _png8_cache_path(digest):
+    return os.path.join(CACHE_DIR, "png8", digest[:2], digest)
+
+
+def _png8_cache_get(digest):
+    """
+    Résultat déjà calculé pour ce contenu : ("optimized", octets), (statut, None) ou None.
+    """
+    path = _png8_cache_path(digest)
+    try:
+        with open(path + ".png", 'rb') as f:
+            return "optimized", f.read()
+    except OSError:
+        pass
+    try:
+        with open(path + ".skip", encoding='utf-8') as f:
+            return f.read().strip(), None
+    except OSError:
+        return None
+
+
+def _png8_cache_put(digest, status, payload):
+    if status == "error":
+        return
+    path = _png8_cache_path(digest) + (".png" if status == "optimized" else ".skip")
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(payload if status == "optimized" else status.encode('utf-8'))
+        os.replace(tmp_path, path)
+    except OSError as e:
+        LOG_CACHE.debug(f"[PNG8] Cache non écrit pour {digest}: {e}")
+
+
+def _quantize_pending(datas):
+    """
+    Quantifie datas (liste d'octets) par paquets dans un pool de processus, dans l'ordre.
+    """
+    chunks = [datas[i:i + PNG8_CHUNK_SIZE] for i in range(0, len(datas), PNG8_CHUNK_SIZE)]
+    if CTX.workers == 1 or len(chunks) <= 1:
+        results = []
+        for chunk in chunks:
+            check_cancelled()
+            results.extend(_quantize_png_chunk(chunk))
+            emit_progress("png8", len(results), len(datas))
+        return results
+    chunk_results = [None] * len(chunks)
+    done = 0
+    with ProcessPoolExecutor(max_workers=min(CTX.workers, len(chunks))) as executor:
+        futures = {executor.submit(_quantize_png_chunk, chunk): i for i, chunk in enumerate(chunks)}
+        for future in as_completed(futures):
+            if CTX.cancel_event.is_set():
+                for other in futures:
+                    other.cancel()
+                raise ConversionCancelled()
+            i = futures[future]
+            try:
+                chunk_results[i] = future.result()
+            except Exception as e:
+                chunk_results[i] = [("error", str(e))] * len(chunks[i])
+            done += len(chunks[i])
+            emit_progress("png8", done, len(datas))
+    return [result for chunk in chunk_results for result in chunk]
+
+
+def optimize_copied_textures(items=None):
+    """
+    Quantifie en PNG8 les textures copiées par la dernière copie (CTX.texture_optimize) et indique
+    le gain par texture (DEBUG) et au total. Les images déjà en palette ou plus petites que
+    CTX.png8_min_bytes sont ignorées ; les résultats sont mis en cache par contenu dans CACHE_DIR.
+    """
+    jobs = list(CTX.copied_textures)
+    CTX.copied_textures.clear()
+    if CTX.texture_optimize and not pil_available():
+        LOG_TEXTURES.warning("[PNG8] Pillow absent : textures conservées telles quelles.")
+    if not CTX.texture_optimize or not pil_available() or not jobs:
+        for src, dst, cache_key, cache_hash in jobs:
+            CTX.build_cache.record(cache_key, cache_hash, [dst])
+        return
+    start = time.time()
+    stats = Counter()
+    reductions = []
+    before_total = after_total = 0
+    pending = OrderedDict()
+
+    def apply(job, data, status, payload):
+        nonlocal before_total, after_total
+        src, dst, cache_key, cache_hash = job
+        stats[status] += 1
+        before_total += len(data)
+        if status == "optimized":
+            # Écriture atomique : remplace aussi une sortie en lien dur sans toucher au pack source
+            CTX.sink.write_bytes(dst, payload, atomic=True)
+            reductions.append((dst, len(data), len(payload)))
+            after_total += len(payload)
+        else:
+            after_total += len(data)
+            if status == "error":
+                LOG_TEXTURES.warning(t("png8_error", src=src, error=payload))
+        CTX.build_cache.record(cache_key, cache_hash, [dst])
+
+    for job in jobs:
+        data = CTX.sink.read_bytes(job[1])
+        if len(data) < CTX.png8_min_bytes:
+            apply(job, data, "small", None)
+            continue
+        digest = hashlib.sha1(data).hexdigest()
+        cached = _png8_cache_get(digest)
+        if cached is not None:
+            stats["cached"] += 1
+            apply(job, data, *cached)
+            continue
+        pending.setdefault(digest, (data, []))[1].append(job)
+
+    # Une texture dupliquée (même contenu, chemins différents) n'est quantifiée qu'une fois
+    digests = list(pending)
+    results = _quantize_pending([pending[digest][0] for digest in digests])
+    for digest, (status, payload) in zip(digests, results):
+        data, digest_jobs = pending[digest]
+        _png8_cache_put(digest, status, payload)
+        for job in digest_jobs:
+            apply(job, data, status, payload)
+
+    for dst, before, after in reductions:
+        LOG_TEXTURES.debug(f"[PNG8] {os.path.relpath(dst, CTX.bedrock_dir)} : {before} -> {after} octets "
+                           f"(-{100 * (before - after) / before:.1f}%)")
+    for dst, before, after in sorted(reductions, key=lambda r: r[2] - r[1])[:5]:
+        LOG_TEXTURES.info(f"[PNG8]   {os.path.relpath(dst, CTX.bedrock_dir)} : {before / 1024:.1f} Ko -> {after / 1024:.1f} Ko")
+    saved = before_total - after_total
+    LOG_TEXTURES.info(f"[PNG8] {stats['optimized']} optimisées, {stats['palette']} déjà en palette, "
+                      f"{stats['small']} sous {CTX.png8_min_bytes} octets, {stats['no_gain']} sans gain, "
+                      f"{stats['error']} en erreur ({stats['cached']} depuis le cache) : "
+                      f"{before_total / 1024:.1f} Ko -> {after_total / 1024:.1f} Ko "
+                      f"(-{100 * saved / before_total if before_total else 0:.1f}%) en {round(time.time() - start, 2)}s")
+
+
+def convert_texture_to_png8(src, dst):
+    if not pil_available():
+        LOG_TEXTURES.warning(t("pillow_not_installed", src=src))
         shutil.copy2(src, dst)
+        return
+    with open(src, 'rb') as f:
+        status, payload = _quantize_png(f.read())
+    if status == "optimized":
+        with open(dst, 'wb') as f:
+            f.write(payload)
+        LOG_TEXTURES.debug(LazyText("png8_generated", dst=dst))
+        return
+    if status == "error":
+        LOG_TEXTURES.warning(t("png8_error", src=src, error=payload))
+    shutil.copy2(src, dst)
 
 # --- Génération fichiers de langue Bedrock ---
 def write_lang_files(lang_dict, out_dir):
-    os.makedirs(out_dir, exist_ok=True)
-    lang_path = os.path.join(out_dir, "en_US.lang")
-    with open(lang_path, "w", encoding="utf-8") as f:
-        for path_hash, item in lang_dict.items():
-            entry = f'item.custom:{path_hash}.name={item}\n'
-            f.write(entry)
-    shutil.copy(lang_path, os.path.join(out_dir, "en_GB.lang"))
-    with open(os.path.join(out_dir, "languages.json"), "w", encoding="utf-8") as f:
-        json.dump(["en_US", "en_GB"], f)
-    print(t("lang_files_generated", out_dir=out_dir))
+    CTX.sink.makedirs(out_dir)
+    content = ''.join(f'item.custom:{path_hash}.name={item}\n' for path_hash, item in lang_dict.items())
+    payload = content.encode('utf-8')
+    CTX.sink.write_bytes(os.path.join(out_dir, "en_US.lang"), payload)
+    CTX.sink.write_bytes(os.path.join(out_dir, "en_GB.lang"), payload)
+    write_json(os.path.join(out_dir, "languages.json"), ["en_US", "en_GB"], indent=None)
+    LOG_OUTPUT.info(t("lang_files_generated", out_dir=out_dir))
 
 # --- Orchestrateur fidèle au squelette ---
 def hash7(s):
@@ -718,13 +2129,12 @@ def convert_model(model_path, item_name, generated, lang_dict, bedrock_dir):
     if ":" in item_name:
         namespace, _ = item_name.split(":", 1)
     else:
-        # Try to detect from model_path
+        # Try to detect from model_path (chemin relatif au pack)
         model_dir = os.path.dirname(model_path)
-        assets_dir = os.path.join(JAVA_RP_DIR, "assets")
-        if model_dir.startswith(assets_dir):
-            rel_path = os.path.relpath(model_dir, assets_dir)
-            if os.path.sep in rel_path:
-                namespace = rel_path.split(os.path.sep)[0]
+        if model_dir.startswith("assets/"):
+            rel_path = model_dir[len("assets/"):]
+            if '/' in rel_path:
+                namespace = rel_path.split('/')[0]
 
     # 2. Conversion du modèle Java en geometry Bedrock avec namespace
     convert_java_model_to_geo(model_path, item_name, f"{namespace}:{item_name}")  
@@ -732,8 +2142,7 @@ def convert_model(model_path, item_name, generated, lang_dict, bedrock_dir):
 # --- Génération animation Bedrock ---
 def convert_java_display_to_bedrock_animation(model_path, geometry):
     try:
-        with open(model_path, encoding='utf-8') as f:
-            model = json.load(f)
+        model = resolve_java_model(model_path)[0]
         display = model.get('display', {})
         pose_to_bone = {
             "thirdperson_righthand": "thirdperson_righthand",
@@ -779,7 +2188,7 @@ def convert_java_display_to_bedrock_animation(model_path, geometry):
             }
         }
     except Exception as e:
-        print(t("bedrock_animation_error", error=str(e)))
+        LOG_MODELS.warning(t("bedrock_animation_error", error=str(e)))
         return {}
     
 # --- Custom Items extraction ---
@@ -802,18 +2211,7 @@ def generate_custom_items_json(items):
         clean_texture = clean_texture.replace(':', '/').replace('//', '/')
         bedrock_texture_path = f"textures/item/{clean_texture}"
         # Correction: vérifier la présence du fichier PNG et fallback si besoin
-        icon_name = texture
-        png_path = os.path.join(BEDROCK_RP_DIR, "textures", "item", f"{icon_name}.png")
-        if not os.path.isfile(png_path):
-            alt_icon_name = texture.replace("minecraft:", "")
-            alt_png_path = os.path.join(BEDROCK_RP_DIR, "textures", "item", f"{alt_icon_name}.png")
-            if os.path.isfile(alt_png_path):
-                icon_name = alt_icon_name
-            else:
-                alt_icon_name2 = alt_icon_name.lower()
-                alt_png_path2 = os.path.join(BEDROCK_RP_DIR, "textures", "item", f"{alt_icon_name2}.png")
-                if os.path.isfile(alt_png_path2):
-                    icon_name = alt_icon_name2
+        icon_name = resolve_icon_name(texture)
         custom_entry = {
             "name": texture,
             "id": texture,
@@ -834,7 +2232,7 @@ def generate_custom_items_json(items):
                         "ambient_occlusion": False
                     }
                 },
-                "minecraft:geometry": f"geometry.{texture}",
+                "minecraft:geometry": item_geometry(item),
                 "minecraft:wearable": {
                     "slot": "slot.weapon.mainhand"
                 },
@@ -847,7 +2245,7 @@ def generate_custom_items_json(items):
                         "textures": {
                             "default": bedrock_texture_path
                         },
-                        "geometry": f"geometry.{texture}",
+                        "geometry": item_geometry(item),
                         "render_controllers": [
                             f"controller.render.{texture}"
                         ]
@@ -864,61 +2262,185 @@ def generate_custom_items_json(items):
             }
         }
         custom_items.append(custom_entry)
-    output_path = os.path.join(BEDROCK_RP_DIR, "custom_items.json")
-    with open(output_path, 'w', encoding='utf-8') as f:
-        json.dump(custom_items, f, indent=4)
-    print(t("custom_items_generated"))
+    output_path = os.path.join(CTX.bedrock_dir, "custom_items.json")
+    write_json(output_path, custom_items, indent=4)
+    LOG_OUTPUT.info(t("custom_items_generated"))
+
+# --- Lecture des définitions d'items (assets/minecraft/items) ---
+
+def yaml_loader():
+    """
+    Chargeur YAML en C (libyaml) quand PyYAML a été compilé avec, sinon chargeur Python ;
+    None si PyYAML n'est pas installé.
+    """
+    yaml = optional_import("yaml")
+    return getattr(yaml, "CSafeLoader", yaml.SafeLoader) if yaml else None
+
+
+def parse_item_definition(path):
+    """
+    Lit et parse une définition d'item. Renvoie (format, données, taille, temps de lecture,
+    temps de parsing) ; l'erreur éventuelle est renvoyée à la place des données.
+    """
+    fmt = "yaml" if path.lower().endswith(('.yml', '.yaml')) else "json"
+    read_start = time.perf_counter()
+    try:
+        raw = CTX.pack.read_bytes(path)
+    except Exception as e:
+        return fmt, e, 0, time.perf_counter() - read_start, 0.0
+    parse_start = time.perf_counter()
+    try:
+        if fmt == "yaml":
+            loader = yaml_loader()
+            if loader is None:
+                raise ImportError(t("missing_yaml_module"))
+            data = optional_import("yaml").load(raw, Loader=loader)
+        else:
+            try:
+                data = fast_json_loads(raw)
+            except ValueError:
+                # orjson refuse le BOM UTF-8 et quelques écarts tolérés par json
+                data = json.loads(raw)
+    except Exception as e:
+        data = e
+    return fmt, data, len(raw), parse_start - read_start, time.perf_counter() - parse_start
+
+
+def _parse_item_definition_chunk(paths):
+    return [parse_item_definition(path) for path in paths]
+
+
+def parse_item_definitions(file_list):
+    """
+    Parse file_list en parallèle (threads, ou processus avec CTX.engine = "process") et rend les
+    résultats dans l'ordre de file_list, pour une extraction déterministe.
+    """
+    if CTX.engine == "process" and CTX.workers > 1 and len(file_list) > 256:
+        chunk_size = max(32, len(file_list) // (CTX.workers * 4))
+        chunks = [file_list[i:i + chunk_size] for i in range(0, len(file_list), chunk_size)]
+        with ProcessPoolExecutor(max_workers=CTX.workers, initializer=_init_process_worker,
+                                 initargs=(CTX.worker_config(),)) as executor:
+            for results in executor.map(_parse_item_definition_chunk, chunks):
+                check_cancelled()
+                yield from results
+        return
+    yield from _parallel_ordered(parse_item_definition, [(path,) for path in file_list], CTX.workers)
+
+
+def log_item_parse_stats():
+    parts = []
+    loader = yaml_loader()
+    for fmt, parser in (("json", "orjson" if optional_import("orjson") else "json"),
+                        ("yaml", "libyaml" if loader and loader.__name__ == "CSafeLoader" else "PyYAML")):
+        stats = CTX.item_parse_stats[fmt]
+        if stats["files"]:
+            parts.append(f"{fmt.upper()} ({parser}) : {stats['files']} fichiers, {stats['bytes'] / 1024:.1f} Ko, "
+                         f"lecture {stats['read_time'] * 1000:.1f} ms, parsing {stats['parse_time'] * 1000:.1f} ms "
+                         f"({stats['parse_time'] * 1000 / stats['files']:.3f} ms/fichier)")
+    if parts:
+        LOG_ITEMS.info("[CustomModelData] " + " ; ".join(parts))
 
 def extract_custom_model_data(model_index=None):
     start = time.time()
     items, cmd_map = [], {}
-    items_dir = os.path.join(JAVA_RP_DIR, 'assets', 'minecraft', 'items')
-    items_dir = os.path.normpath(items_dir)
-    tex_root = os.path.join(BEDROCK_RP_DIR, 'textures', 'item')
-    if not os.path.isdir(items_dir):
-        print(t("items_folder_not_found", items_dir=items_dir))
+    items_dir = 'assets/minecraft/items'
+    tex_root = os.path.join(CTX.bedrock_dir, 'textures', 'item')
+    if not CTX.pack.isdir(items_dir):
+        LOG_ITEMS.warning(t("items_folder_not_found", items_dir=CTX.pack.display_path(items_dir)))
         return items
-    file_list = [os.path.join(r, f) for r, _, fs in os.walk(items_dir) for f in fs if f.lower().endswith(('.json','.yml','.yaml'))]
-    print(f"[CustomModelData] {len(file_list)} fichiers à traiter...")
-    count = 0
-    for path in file_list:
+    file_list = [f"{r}/{f}" for r, _, fs in CTX.pack.walk(items_dir) for f in fs if f.lower().endswith(('.json','.yml','.yaml'))]
+    if model_index is None:
+        model_index = build_model_index()
+        LOG_ITEMS.info(f"[CustomModelData] {len(model_index)} modèles indexés.")
+    LOG_ITEMS.info(f"[CustomModelData] {len(file_list)} fichiers à traiter...")
+    progress = ThrottledProgress(LOG_ITEMS, "[CustomModelData] {done}/{total} fichiers traités...", len(file_list))
+    for stats in CTX.item_parse_stats.values():
+        stats.update(files=0, bytes=0, read_time=0.0, parse_time=0.0)
+    # Lecture et parsing en parallèle ; l'extraction reste séquentielle, dans l'ordre des fichiers
+    for path, (fmt, data, size, read_time, parse_time) in zip(file_list, parse_item_definitions(file_list)):
         f = os.path.basename(path)
+        stats = CTX.item_parse_stats[fmt]
+        stats["files"] += 1
+        stats["bytes"] += size
+        stats["read_time"] += read_time
+        stats["parse_time"] += parse_time
         try:
-            with open(path, encoding='utf-8') as pf:
-                data = yaml.safe_load(pf) if f.lower().endswith(('.yml','.yaml')) else json.load(pf)
+            if isinstance(data, Exception):
+                raise data
             base = os.path.splitext(f)[0]
             for e in data.get('model',{}).get('entries',[]):
                 process_model_entry(e, base, tex_root, items, cmd_map, path, model_index=model_index)
             fb = data.get('model',{}).get('fallback',{}).get('model')
             if fb:
                 process_model_entry({'threshold':-1,'model':{'model':fb}}, base, tex_root, items, cmd_map, path, model_index=model_index)
-            count += 1
-            if count % 20 == 0:
-                print(f"[CustomModelData] {count}/{len(file_list)} fichiers traités...")
+            progress.step()
         except Exception as e:
-            print(t("read_error", file=f, error=str(e)))
-    print(f"[CustomModelData] Extraction terminée en {round(time.time()-start,1)}s.")
+            LOG_ITEMS.warning(t("read_error", file=f, error=str(e)))
+    log_item_parse_stats()
+    elapsed = time.time() - start
+    CTX.metrics.record_time("items.extract", elapsed)
+    LOG_ITEMS.info(f"[CustomModelData] Extraction terminée en {round(elapsed,1)}s.")
     return items
 
 # --- Indexation des modèles Java pour lookup rapide ---
+class ModelIndex(dict):
+    """
+    Index des modèles Java (clé: namespace:path, valeur: chemin relatif au pack), avec un
+    index secondaire chemin sans namespace -> clés candidates, dans l'ordre de résolution
+    de Minecraft (namespace minecraft d'abord, puis les autres par ordre alphabétique).
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.by_rel = defaultdict(list)
+        self.paths = set()
+
+    def add(self, ns, rel, path):
+        self[f"{ns}:{rel}"] = path
+        self.by_rel[rel].append(ns)
+        self.paths.add(path)
+
+    def finalize(self):
+        for namespaces in self.by_rel.values():
+            namespaces.sort(key=lambda ns: (ns != 'minecraft', ns))
+
+    def resolve(self, model_ref):
+        """
+        Chemin du modèle référencé par model_ref ("ns:chemin" ou "chemin"), ou None.
+        Aucun accès au système de fichiers : uniquement des lookups de dictionnaire.
+        """
+        if ':' in model_ref:
+            model_path = self.get(model_ref)
+            if model_path:
+                return model_path
+            rel = model_ref.split(':', 1)[1]
+        else:
+            rel = model_ref
+        namespaces = self.by_rel.get(rel)
+        if namespaces:
+            return self[f"{namespaces[0]}:{rel}"]
+        # Référence écrite avec le chemin complet sous assets/ (ancien format toléré)
+        legacy_path = f"assets/{rel}.json"
+        return legacy_path if legacy_path in self.paths else None
+
+
 def build_model_index():
     """
-    Parcourt tous les assets/*/models/ et indexe les modèles Java (clé: namespace:path, valeur: chemin absolu).
+    Parcourt tous les assets/*/models/ et indexe les modèles Java (clé: namespace:path, valeur: chemin relatif au pack).
     """
-    model_index = {}
-    assets_root = os.path.join(JAVA_RP_DIR, 'assets')
-    if not os.path.isdir(assets_root):
+    model_index = ModelIndex()
+    if not CTX.pack.isdir('assets'):
         return model_index
-    for ns in os.listdir(assets_root):
-        ns_models = os.path.join(assets_root, ns, 'models')
-        if not os.path.isdir(ns_models):
+    for ns in CTX.pack.listdir('assets'):
+        ns_models = f"assets/{ns}/models"
+        if not CTX.pack.isdir(ns_models):
             continue
-        for root, _, files in os.walk(ns_models):
+        for root, _, files in CTX.pack.walk(ns_models):
             for file in files:
                 if file.endswith('.json'):
-                    rel_path = os.path.relpath(os.path.join(root, file), ns_models)
-                    key = f"{ns}:{rel_path[:-5].replace(os.sep, '/')}"  # sans .json
-                    model_index[key] = os.path.join(root, file)
+                    rel_path = f"{root}/{file}"[len(ns_models) + 1:]
+                    model_index.add(ns, rel_path[:-5], f"{root}/{file}")  # sans .json
+    model_index.finalize()
     return model_index
 
 def build_targeted_model_index(model_refs):
@@ -927,7 +2449,6 @@ def build_targeted_model_index(model_refs):
     """
     start = time.time()
     model_index = {}
-    assets_root = os.path.join(JAVA_RP_DIR, 'assets')
     # Regroupe les refs par namespace pour limiter les parcours
     ns_to_paths = {}
     for ref in model_refs:
@@ -937,18 +2458,20 @@ def build_targeted_model_index(model_refs):
             ns, rel = 'minecraft', ref
         ns_to_paths.setdefault(ns, set()).add(rel)
     for ns, rels in ns_to_paths.items():
-        ns_models = os.path.join(assets_root, ns, 'models')
-        if not os.path.isdir(ns_models):
+        ns_models = f"assets/{ns}/models"
+        if not CTX.pack.isdir(ns_models):
             continue
         for rel in rels:
-            model_path = os.path.join(ns_models, *rel.split('/')) + '.json'
-            if os.path.isfile(model_path):
+            model_path = f"{ns_models}/{rel}.json"
+            if CTX.pack.isfile(model_path):
                 model_index[f"{ns}:{rel}"] = model_path
-    print(f"[Index ciblé] {len(model_index)}/{len(model_refs)} modèles référencés indexés en {round(time.time()-start,2)}s.")
+    elapsed = time.time() - start
+    CTX.metrics.record_time("items.model_index", elapsed)
+    LOG_ITEMS.info(f"[Index ciblé] {len(model_index)}/{len(model_refs)} modèles référencés indexés en {round(elapsed,2)}s.")
     return model_index
 
 def generate_behavior_pack(items):
-    bp_dir = BEDROCK_RP_DIR.replace('bedrock', 'behavior')
+    bp_dir = CTX.bedrock_dir.replace('bedrock', 'behavior')
     if os.path.exists(bp_dir):
         shutil.rmtree(bp_dir)
     os.makedirs(os.path.join(bp_dir, 'items'), exist_ok=True)
@@ -974,8 +2497,7 @@ def generate_behavior_pack(items):
             }
         ]
     }
-    with open(os.path.join(bp_dir, 'manifest.json'), 'w', encoding='utf-8') as f:
-        json.dump(manifest, f, indent=4)
+    write_json(os.path.join(bp_dir, 'manifest.json'), manifest, indent=4)
 
     # Générer chaque fichier item
     # Generate each item file (EN)
@@ -1005,9 +2527,8 @@ def generate_behavior_pack(items):
             }
         }
         item_file = os.path.join(bp_dir, 'items', f"{item['name'].split(':')[-1]}.json")
-        with open(item_file, 'w', encoding='utf-8') as f:
-            json.dump(item_json, f, indent=4)
-    print(f"✅ Behavior pack généré ({len(items)} items)")
+        write_json(item_file, item_json, indent=4)
+    LOG_OUTPUT.info(f"✅ Behavior pack généré ({len(items)} items)")
 
 
 def generate_geyser_mapping_json(items, mapping_version="v2"):
@@ -1026,22 +2547,8 @@ def generate_geyser_mapping_json(items, mapping_version="v2"):
             cmd = int(item['custom_model_data'])
             unique_name = f"{item['id']}_cmd{item['custom_model_data']}"
             # Correction: l'icon doit correspondre exactement au nom du fichier PNG dans textures/item/
-            # On vérifie la présence du fichier et on corrige le nom si besoin
-            icon_name = unique_name
-            # Vérification stricte du fichier PNG
-            png_path = os.path.join(BEDROCK_RP_DIR, "textures", "item", f"{icon_name}.png")
-            if not os.path.isfile(png_path):
-                # Essai fallback: enlever "minecraft:" si présent
-                alt_icon_name = unique_name.replace("minecraft:", "")
-                alt_png_path = os.path.join(BEDROCK_RP_DIR, "textures", "item", f"{alt_icon_name}.png")
-                if os.path.isfile(alt_png_path):
-                    icon_name = alt_icon_name
-                else:
-                    # Essai fallback: tout en minuscule
-                    alt_icon_name2 = alt_icon_name.lower()
-                    alt_png_path2 = os.path.join(BEDROCK_RP_DIR, "textures", "item", f"{alt_icon_name2}.png")
-                    if os.path.isfile(alt_png_path2):
-                        icon_name = alt_icon_name2
+            # (même résolution que custom_items.json : nom exact, sans "minecraft:", en minuscules)
+            icon_name = resolve_icon_name(unique_name)
             # Ajoute l'entrée dans le bon tableau
             if base_item not in mappings["items"]:
                 mappings["items"][base_item] = []
@@ -1053,72 +2560,445 @@ def generate_geyser_mapping_json(items, mapping_version="v2"):
                 "icon": icon_name
             })
         # Nom du fichier correct
-        output_path = os.path.join(BEDROCK_RP_DIR, "Bconverted_Geyser_Mapping.json")
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(mappings, f, indent=4)
-        print("✅ Bconverted_Geyser_Mapping.json (v1) generated in resource pack")
+        output_path = os.path.join(CTX.bedrock_dir, "Bconverted_Geyser_Mapping.json")
+        write_json(output_path, mappings, indent=4)
+        LOG_OUTPUT.info("✅ Bconverted_Geyser_Mapping.json (v1) generated in resource pack")
     else:
         # v2: Mapping par item (déjà présent dans ton code)
         mappings = {
             "format_version": 2,
             "items": {}
         }
-        for item in items:
-            base_item = item['id'] if item['id'].startswith("minecraft:") else f"minecraft:{item['id']}"
-            cmd = str(item['custom_model_data'])
-            unique_name = f"{item['id']}_cmd{item['custom_model_data']}"
-            if base_item not in mappings["items"]:
-                mappings["items"][base_item] = []
-            mappings["items"][base_item].append({
-                "custom_model_data": cmd,
-                "bedrock_identifier": f"custom:{unique_name}",
-                "display_name": item.get("display_name", ""),
-                "texture": unique_name,
-                "geometry": f"geometry.{unique_name}",
-                "model": f"geometry.{unique_name}"
-            })
-        output_path = os.path.join(BEDROCK_RP_DIR, "geyser-mapping.json")
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(mappings, f, indent=4)
-        print("✅ geyser-mapping.json (v2) generated in resource pack")
+        for item in items:
+            base_item = item['id'] if item['id'].startswith("minecraft:") else f"minecraft:{item['id']}"
+            cmd = str(item['custom_model_data'])
+            unique_name = f"{item['id']}_cmd{item['custom_model_data']}"
+            if base_item not in mappings["items"]:
+                mappings["items"][base_item] = []
+            mappings["items"][base_item].append({
+                "custom_model_data": cmd,
+                "bedrock_identifier": f"custom:{unique_name}",
+                "display_name": item.get("display_name", ""),
+                "texture": unique_name,
+                "geometry": item_geometry(item),
+                "model": item_geometry(item)
+            })
+        output_path = os.path.join(CTX.bedrock_dir, "geyser-mapping.json")
+        write_json(output_path, mappings, indent=4)
+        LOG_OUTPUT.info("✅ geyser-mapping.json (v2) generated in resource pack")
+
+
+# --- Packaging .zip / .mcpack ---
+# Les PNG/OGG sont déjà compressés : stockés tels quels (ZIP_STORED), le reste est deflaté
+# en parallèle (zlib libère le GIL) puis assemblé dans l'ordre de l'arborescence.
+STORED_EXTENSIONS = ('.png', '.ogg', '.jpg', '.jpeg', '.tga', '.fsb', '.zip', '.mcpack')
+
+
+def _zip_dos_datetime(mtime):
+    tm = time.localtime(mtime)
+    year = max(1980, tm.tm_year)
+    return ((tm.tm_hour << 11) | (tm.tm_min << 5) | (tm.tm_sec // 2),
+            ((year - 1980) << 9) | (tm.tm_mon << 5) | tm.tm_mday)
+
+
+def _compress_zip_member(arcname, raw, level):
+    """
+    Renvoie (méthode, crc, taille, données) : deflate brut, ou données stockées telles quelles
+    pour les formats déjà compressés et le niveau 0.
+    """
+    import zlib
+    crc = zlib.crc32(raw)
+    if level > 0 and not arcname.lower().endswith(STORED_EXTENSIONS):
+        compressor = zlib.compressobj(level, zlib.DEFLATED, -15)
+        return zipfile.ZIP_DEFLATED, crc, len(raw), compressor.compress(raw) + compressor.flush()
+    return zipfile.ZIP_STORED, crc, len(raw), raw
+
+
+def _prepare_zip_member(file_path, arcname, level):
+    with open(file_path, 'rb') as f:
+        raw = f.read()
+    return (arcname,) + _compress_zip_member(arcname, raw, level) + (os.path.getmtime(file_path),)
+
+
+@contextlib.contextmanager
+def _thread_pool(workers):
+    """
+    Pool partagé du contexte (mode batch) s'il existe, sinon un pool dédié à l'appel.
+    """
+    if CTX.executor is not None:
+        yield CTX.executor
+        return
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        yield executor
+
+
+def _parallel_ordered(func, args_list, workers):
+    """
+    Applique func sur args_list dans un pool de threads et rend les résultats dans l'ordre,
+    avec au plus workers * 4 résultats en attente en mémoire.
+    """
+    window = max(4, workers * 4)
+    func = bind_context(func)
+    with _thread_pool(workers) as executor:
+        pending = []
+        args_iter = iter(args_list)
+        for args in args_iter:
+            pending.append(executor.submit(func, *args))
+            if len(pending) >= window:
+                break
+        while pending:
+            check_cancelled()
+            result = pending.pop(0).result()
+            following = next(args_iter, None)
+            if following is not None:
+                pending.append(executor.submit(func, *following))
+            yield result
+
+
+def _zip_exceeds_limits(count, total_size):
+    # Au-delà, il faut du ZIP64 : zipfile s'en charge (écriture séquentielle)
+    return count >= 0xFFFF or total_size >= 0xFFFFFFFF
+
+
+def _write_zip64(archive_path, members, level):
+    """
+    members : (arcname, octets bruts) ; chemin de secours pour les très grosses archives.
+    """
+    tmp_path = archive_path + ".tmp"
+    with zipfile.ZipFile(tmp_path, 'w', zipfile.ZIP_DEFLATED, compresslevel=level or None, allowZip64=True) as zipf:
+        for arcname, raw in members:
+            stored = level == 0 or arcname.lower().endswith(STORED_EXTENSIONS)
+            zipf.writestr(arcname, raw, zipfile.ZIP_STORED if stored else zipfile.ZIP_DEFLATED)
+    os.replace(tmp_path, archive_path)
+
+
+def _write_zip_entries(archive_path, entries):
+    """
+    Assemble une archive ZIP à partir de membres déjà compressés
+    (arcname, méthode, crc, taille, données, mtime), dans l'ordre fourni.
+    Renvoie (nombre de membres, nombre de membres stockés).
+    """
+    import struct
+    os.makedirs(os.path.dirname(os.path.abspath(archive_path)), exist_ok=True)
+    tmp_path = archive_path + ".tmp"
+    central = []
+    stored = 0
+    with open(tmp_path, 'wb') as out:
+        for arcname, method, crc, size, data, mtime in entries:
+            name = arcname.encode('utf-8')
+            dos_time, dos_date = _zip_dos_datetime(mtime)
+            offset = out.tell()
+            # En-tête local (drapeau 0x800 : noms UTF-8)
+            out.write(struct.pack('<IHHHHHIIIHH', 0x04034b50, 20, 0x800, method, dos_time, dos_date,
+                                  crc, len(data), size, len(name), 0))
+            out.write(name)
+            out.write(data)
+            # Version "made by" : hôte Unix (3), pour que les attributs externes 0o644 soient lus comme des droits Unix
+            central.append(struct.pack('<IHHHHHHIIIHHHHHII', 0x02014b50, (3 << 8) | 20, 20, 0x800, method, dos_time, dos_date,
+                                       crc, len(data), size, len(name), 0, 0, 0, 0, 0o644 << 16, offset) + name)
+            stored += method == zipfile.ZIP_STORED
+        cd_offset = out.tell()
+        for entry in central:
+            out.write(entry)
+        out.write(struct.pack('<IHHHHIIH', 0x06054b50, 0, 0, len(central), len(central),
+                              out.tell() - cd_offset, cd_offset, 0))
+    os.replace(tmp_path, archive_path)
+    return len(central), stored
+
+
+def _log_archive_written(archive_path, count, stored, level, total_size, start):
+    CTX.metrics.record_time("pack.archive", time.time() - start)
+    CTX.metrics.add("pack.archive_bytes", os.path.getsize(archive_path))
+    LOG_PACK.info(f"[Pack] {count} fichiers ({stored} stockés, {count - stored} compressés, niveau {level}) : "
+                  f"{total_size / 1024:.1f} Ko -> {os.path.getsize(archive_path) / 1024:.1f} Ko en {round(time.time() - start, 2)}s")
+
+
+def write_pack_archive(source_dir, archive_path, compression_level=None, workers=None):
+    """
+    Écrit source_dir dans archive_path (.zip ou .mcpack) directement depuis l'arborescence,
+    sans copie temporaire. compression_level : 0 (tout stocker) à 9, CTX.zip_level par défaut.
+    """
+    level = CTX.zip_level if compression_level is None else compression_level
+    start = time.time()
+    members = []
+    for root, dirs, files in os.walk(source_dir):
+        dirs.sort()
+        for file in sorted(files):
+            file_path = os.path.join(root, file)
+            members.append((file_path, os.path.relpath(file_path, source_dir).replace(os.sep, '/')))
+    total_size = sum(os.path.getsize(path) for path, _ in members)
+    if _zip_exceeds_limits(len(members), total_size):
+        def read_member(file_path, arcname):
+            with open(file_path, 'rb') as f:
+                return arcname, f.read()
+        _write_zip64(archive_path, (read_member(*m) for m in members), level)
+        return archive_path
+    entries = _parallel_ordered(_prepare_zip_member, [(path, arcname, level) for path, arcname in members], workers or CTX.workers)
+    count, stored = _write_zip_entries(archive_path, entries)
+    _log_archive_written(archive_path, count, stored, level, total_size, start)
+    return archive_path
+
+
+def write_item_render_controllers(items):
+    """
+    Render controller simple (géométrie, matériau par défaut, texture de l'item) pour chaque
+    item : option "render controller personnalisé" de la GUI, --render-controllers custom en console.
+    """
+    rc_dir = os.path.join(CTX.bedrock_dir, "render_controllers")
+    CTX.sink.makedirs(rc_dir)
+    for item in items:
+        output_name = item['name'].split(":")[-1]
+        rc_path = os.path.join(rc_dir, f"{output_name}.render_controller.json")
+        rc_data = {
+            "format_version": "1.10.0",
+            "render_controllers": {
+                f"controller.render.{output_name}": {
+                    "geometry": item_geometry(item),
+                    "materials": ["material.default"],
+                    "textures": [output_name]
+                }
+            }
+        }
+        write_json(rc_path, rc_data, indent=4)
+
+
+def apply_render_controller_mode(items):
+    """
+    Étape console selon CTX.render_controllers : "model" garde les render controllers écrits à la
+    conversion des modèles, "custom" les remplace, "none" supprime le dossier (GUI, option décochée).
+    """
+    if CTX.render_controllers == "custom":
+        write_item_render_controllers(items)
+    elif CTX.render_controllers == "none":
+        rc_dir = os.path.join(CTX.bedrock_dir, "render_controllers")
+        if CTX.sink.isdir(rc_dir):
+            CTX.sink.remove_tree(rc_dir)
+            LOG_OUTPUT.info("[Render controllers] Dossier render_controllers supprimé (--render-controllers none).")
+
+
+def generate_attachables(items):
+    """
+    Fichier attachable de chaque item custom (GUI et console).
+    """
+    attachable_dir = os.path.join(CTX.bedrock_dir, "attachables")
+    CTX.sink.makedirs(attachable_dir)
+    def _generate_attachable_json_full(
+        output_name, texture_key, geometry, out_dir, identifier, 
+        generated=False, atlas_index=None, attachable_material="material.default", 
+        path_hash=None, namespace=None, model_path=None, model_name=None
+    ):
+        # Détermination du namespace et du vrai nom (sans prefix)
+        if ':' in output_name:
+            ns, base_name = output_name.split(':', 1)
+        else:
+            ns = namespace or "custom"
+            base_name = output_name
+
+        # La geometry et les animations utilisent toujours le nom SANS namespace
+        geometry_name = base_name
+        anim_prefix = f"animation.{geometry_name}"
+
+        # Chemin texture
+        def compute_tex_path(item_name, texture_key):
+            if not texture_key:
+                return f"textures/{item_name}"
+            tex = texture_key
+            if tex.startswith('textures/'):
+                tex = tex[len('textures/'):]
+                return f"textures/{tex.replace('minecraft/item/', '').replace(':', '/').replace('.png','')}"
+            elif tex.startswith('minecraft:'):
+                return 'textures/' + tex.split(':',1)[1].replace(':', '/').replace('.png','')
+            elif ':' in tex:
+                return 'textures/' + tex.replace(':', '/').replace('.png','')
+            else:
+                return f'textures/{tex}'.replace('.png','')
+
+        tex_path = compute_tex_path(base_name, texture_key)
+
+        # Scripts logic
+        v_main = "v.main_hand = c.item_slot == 'main_hand';"
+        v_off = "v.off_hand = c.item_slot == 'off_hand';"
+        v_head = "v.head = c.item_slot == 'head';"
+
+        # Déduire le matériel à partir du nom de la geometry (avant _cmd ou .)
+        mat_base = geometry_name.split('_cmd')[0].split('.')[0]
+        attachable = {
+            "format_version": "1.16.100",
+            "minecraft:attachable": {
+                "description": {
+                    "identifier": f"{ns}:{base_name}",
+                    "materials": {
+                        "default": mat_base,
+                        "enchanted": "entity_alphatest_glint"
+                    },
+                    "textures": {
+                        "default": f"{tex_path.lstrip('/')}",
+                        "enchanted": "textures/misc/enchanted_item_glint"
+                    },
+                    "geometry": {
+                        "default": geometry
+                    },
+                    "scripts": {
+                        "pre_animation": [v_main, v_off, v_head],
+                        "animate": [
+                            {"third_person_main_hand": "v.main_hand && !c.is_first_person"},
+                            {"third_person_off_hand": "v.off_hand && !c.is_first_person"},
+                            {"third_person_head": "v.head && !c.is_first_person"},
+                            {"first_person_main_hand": "v.main_hand && c.is_first_person"},
+                            {"first_person_off_hand": "v.off_hand && c.is_first_person"},
+                            {"first_person_head": "c.is_first_person && v.head"}
+                        ]
+                    },
+                    "animations": {
+                        "third_person_main_hand": f"{anim_prefix}.third_person_main_hand",
+                        "third_person_off_hand": f"{anim_prefix}.third_person_off_hand",
+                        "third_person_head": f"{anim_prefix}.head",
+                        "first_person_main_hand": f"{anim_prefix}.first_person_main_hand",
+                        "first_person_off_hand": f"{anim_prefix}.first_person_off_hand",
+                        "first_person_head": "animation.disable"
+                    },
+                    "render_controllers": ["controller.render.item_default"]
+                }
+            }
+        }
+
+        out_path = os.path.join(out_dir, f"{base_name}.attachable.json")
+        write_json(out_path, attachable, indent=4)
+        LOG_OUTPUT.debug(LazyText("attachable_generated", out_path=out_path))
+    for item in items:
+        output_name = item['name'].split(":")[-1]
+        texture_key = item['texture']
+        geometry = item_geometry(item)
+        # Utilise le namespace correct pour l'identifier
+        if ':' in item['name']:
+            ns, _ = item['name'].split(':', 1)
+            identifier = f"{ns}:{output_name}"
+            namespace = ns
+        else:
+            identifier = f"custom:{output_name}"
+            namespace = 'custom'
+        # Gather extra info for attachable
+        generated = item.get('generated', False)
+        atlas_index = item.get('atlas_index')
+        attachable_material = item.get('attachable_material', 'material.default')
+        path_hash = hash7(output_name)
+        model_path = os.path.dirname(texture_key.split(':', 1)[1]) if ':' in texture_key else ''
+        model_name = os.path.basename(texture_key.split(':', 1)[1]) if ':' in texture_key else texture_key
+        _generate_attachable_json_full(
+            output_name, texture_key, geometry, attachable_dir, identifier,
+            generated=generated, atlas_index=atlas_index, attachable_material=attachable_material,
+            path_hash=path_hash, namespace=namespace, model_path=model_path, model_name=model_name
+        )
+
+
+def generate_item_texture_json(items, textures_dir):
+    """
+    Génère item_texture.json au format attendu :
+    "texture_data": {
+        "gmdl_xxx": { "textures": "textures/minecraft/item/cactus/bow_1" }, ...
+    }
+    "gmdl_xxx" = nom du modèle (item['name'] ou item['model'] ou item['id'] selon structure)
+    "textures" = chemin complet sans extension .png
+    """
+    texture_data = {}
+    for item in items:
+        # La clé doit être le nom du modèle Bedrock (ex: copper_ingot_cmd10001), sans namespace ni custom:
+        # On extrait à partir de item['name'] ou item['id'] (ex: "custom:copper_ingot_cmd10001" -> "copper_ingot_cmd10001")
+        raw_name = item.get('name') or item.get('id') or item.get('model')
+        if not raw_name:
+            continue
+        # Retire le namespace ou le préfixe custom:
+        if ':' in raw_name:
+            model_name = raw_name.split(':', 1)[1]
+        else:
+            model_name = raw_name
+        model_name = os.path.splitext(os.path.basename(str(model_name)))[0]
+
+        # Recherche le chemin de la texture (ex: textures/minecraft/item/cactus/bow_1)
+        tex_path = None
+        if 'texture' in item:
+            tex = item['texture']
+            # Nettoyage du chemin :
+            # 1. Si "textures/" déjà présent, on retire "minecraft/item/" et remplace les : par /
+            if tex.startswith('textures/'):
+                tex_path = tex.replace('minecraft/item/', '').replace(':', '/').replace('.png','')
+            # 2. Si "minecraft:" présent, on retire le préfixe et remplace : par /
+            elif tex.startswith('minecraft:'):
+                tex_path = 'textures/' + tex.split(':',1)[1].replace(':', '/').replace('.png','')
+            # 3. Si "namespace:..." (autre que minecraft), on remplace : par /
+            elif ':' in tex:
+                tex_path = 'textures/' + tex.replace(':', '/').replace('.png','')
+            else:
+                tex_path = f'textures/{tex}'.replace('.png','')
+        else:
+            tex_path = f'textures/{model_name}'
+
+        abs_tex_path = os.path.join(CTX.bedrock_dir, *tex_path.split('/')) + '.png'
+        texture_data[model_name] = {"textures": tex_path}
+
+    item_texture = {
+        "resource_pack_name": "custom_items",
+        "texture_name": "atlas.items",
+        "texture_data": texture_data
+    }
+    CTX.sink.makedirs(textures_dir)
+    out_path = os.path.join(textures_dir, "item_texture.json")
+    write_json(out_path, item_texture, indent=2)
+    LOG_OUTPUT.info(f"item_texture.json generated: {out_path}")
+
+    # Ajout : Génération d'un fichier terrain_texture.json vide (structure Geyser)
+    terrain_texture = {
+        "resource_pack_name": "geyser_custom",
+        "texture_name": "atlas.terrain",
+        "texture_data": {}
+    }
+    terrain_path = os.path.join(textures_dir, "terrain_texture.json")
+    write_json(terrain_path, terrain_texture, indent=2)
+    LOG_OUTPUT.info(f"terrain_texture.json generated: {terrain_path}")
 
 
-def create_mcpack(source_dir, output_dir, pack_name):
-    import zipfile
-    temp_dir = os.path.join(output_dir, 'temp_pack')
+def create_mcpack(source_dir, output_dir, pack_name, compression_level=None, sink=None):
     mcpack_path = os.path.join(output_dir, f"{pack_name}.mcpack")
+    (sink or DirectoryOutputSink(source_dir)).export_archive(mcpack_path, compression_level)
+    LOG_PACK.info(t("mcpack_created", mcpack_path=mcpack_path))
+    return mcpack_path
 
-    if os.path.exists(temp_dir):
-        shutil.rmtree(temp_dir)
-    shutil.copytree(source_dir, temp_dir)
 
-    # Ensure geyser-mapping.json exists in temp dir
-    geyser_mapping_path = os.path.join(source_dir, "geyser-mapping.json")
-    temp_geyser_mapping = os.path.join(temp_dir, "geyser-mapping.json")
-    if os.path.exists(geyser_mapping_path) and not os.path.exists(temp_geyser_mapping):
-        shutil.copy2(geyser_mapping_path, temp_geyser_mapping)
+EXPORT_FORMATS = ("folder", "zip", "mcpack")
 
-    zip_path = mcpack_path.replace('.mcpack', '.zip')
-    with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
-        for root, dirs, files in os.walk(temp_dir):
-            for file in files:
-                file_path = os.path.join(root, file)
-                arcname = os.path.relpath(file_path, temp_dir)
-                zipf.write(file_path, arcname)
 
-    if os.path.exists(mcpack_path):
-        os.remove(mcpack_path)
-    os.rename(zip_path, mcpack_path)
-    shutil.rmtree(temp_dir)
+def export_converted_pack(export_format, output_dir, export_name=None):
+    """
+    Exporte la sortie du contexte actif dans output_dir : <nom>.zip, <nom>.mcpack ou dossier
+    <nom>/ (remplacé s'il existe). Le nom par défaut est celui du pack Java. Renvoie le chemin produit.
+    """
+    if export_format not in EXPORT_FORMATS:
+        raise ValueError(t("unknown_export_format"))
+    if not export_name:
+        export_name = os.path.basename(CTX.java_dir.strip().rstrip("/\\"))
+        if export_name.lower().endswith('.zip'):
+            export_name = export_name[:-4]
+    os.makedirs(output_dir, exist_ok=True)
+    if export_format == "zip":
+        path = CTX.sink.export_archive(os.path.join(output_dir, f"{export_name}.zip"))
+        LOG_PACK.info(t("pack_exported_zip", zip_path=path))
+    elif export_format == "mcpack":
+        path = create_mcpack(CTX.bedrock_dir, output_dir, export_name, sink=CTX.sink)
+    else:
+        path = os.path.join(output_dir, export_name)
+        if os.path.exists(path):
+            shutil.rmtree(path)
+        CTX.sink.export_directory(path)
+        LOG_PACK.info(t("pack_exported_folder", out_dir=path))
+    return path
 
-    print(t("mcpack_created", mcpack_path=mcpack_path))
 
 def validate_consistency(items):
-    print(t("coherence_validation"))
-    rc_path = os.path.join(BEDROCK_RP_DIR, "render_controllers")
-    geo_path = os.path.join(BEDROCK_RP_DIR, "models", "entity")
-    tex_path = os.path.join(BEDROCK_RP_DIR, "textures", "item")
-    custom_items_path = os.path.join(BEDROCK_RP_DIR, "custom_items.json")
+    LOG_VALIDATION.info(t("coherence_validation"))
+    rc_path = os.path.join(CTX.bedrock_dir, "render_controllers")
+    geo_path = os.path.join(CTX.bedrock_dir, "models", "entity")
+    tex_path = os.path.join(CTX.bedrock_dir, "textures", "item")
+    custom_items_path = os.path.join(CTX.bedrock_dir, "custom_items.json")
     errors = 0
 
 
@@ -1126,39 +3006,27 @@ def validate_consistency(items):
         name = item["name"].split(":")[-1]
         # Correction stricte : vérifier la présence du PNG avec tous les fallback utilisés dans le script
         tex_key = item.get("texture", "")
-        icon_name = name
-        png_path = os.path.join(tex_path, f"{icon_name}.png")
-        if not os.path.isfile(png_path):
-            alt_icon_name = icon_name.replace("minecraft:", "")
-            alt_png_path = os.path.join(tex_path, f"{alt_icon_name}.png")
-            if os.path.isfile(alt_png_path):
-                icon_name = alt_icon_name
-            else:
-                alt_icon_name2 = alt_icon_name.lower()
-                alt_png_path2 = os.path.join(tex_path, f"{alt_icon_name2}.png")
-                if os.path.isfile(alt_png_path2):
-                    icon_name = alt_icon_name2
+        icon_name = resolve_icon_name(name)
         expected_texture = os.path.join(tex_path, f"{icon_name}.png")
 
-        geo_file = os.path.join(geo_path, f"{name}.geo.json")
+        geo_file = os.path.join(geo_path, geometry_file_name(item_geometry(item)))
         rc_file = os.path.join(rc_path, f"{name}.render_controller.json")
 
-        if not os.path.isfile(geo_file):
-            print(t("missing_geo", name=name))
+        if not CTX.sink.isfile(geo_file):
+            LOG_VALIDATION.warning(t("missing_geo", name=name))
             errors += 1
 
-        if not os.path.isfile(rc_file):
-            print(t("missing_rc", name=name))
+        if not CTX.sink.isfile(rc_file):
+            LOG_VALIDATION.warning(t("missing_rc", name=name))
             errors += 1
             continue
 
         try:
-            with open(rc_file, encoding='utf-8') as f:
-                rc = json.load(f)
-            expected_geometry = f"geometry.{name}"
+            rc = json.loads(CTX.sink.read_bytes(rc_file))
+            expected_geometry = item_geometry(item)
             actual_geometry = rc["render_controllers"][f"controller.render.{name}"]["geometry"]
             if actual_geometry != expected_geometry:
-                print(t("bad_geometry", actual=actual_geometry, expected=expected_geometry))
+                LOG_VALIDATION.warning(t("bad_geometry", actual=actual_geometry, expected=expected_geometry))
                 errors += 1
             # Vérifie aussi que le nom de la texture dans le render_controller correspond au PNG
             tex_array = rc.get("arrays", {}).get("textures", {})
@@ -1166,39 +3034,37 @@ def validate_consistency(items):
             if arr_key in tex_array:
                 rc_tex = tex_array[arr_key][0]
                 if rc_tex != icon_name:
-                    print(f"[Validation] RenderController texture array: '{rc_tex}' ne correspond pas au PNG '{icon_name}'")
+                    LOG_VALIDATION.warning(f"[Validation] RenderController texture array: '{rc_tex}' ne correspond pas au PNG '{icon_name}'")
                     errors += 1
         except Exception as e:
-            print(f"[Validation] Erreur lecture RC {rc_file}: {e}")
+            LOG_VALIDATION.warning(f"[Validation] Erreur lecture RC {rc_file}: {e}")
             errors += 1
 
-        if not os.path.isfile(expected_texture):
-            print(t("missing_texture", expected_texture=expected_texture))
+        if f"item/{icon_name}.png" not in CTX.output_textures:
+            LOG_VALIDATION.warning(t("missing_texture", expected_texture=expected_texture))
             errors += 1
 
-    print(t("coherence_validation_done", valid=len(items) - errors, total=len(items)))
+    LOG_VALIDATION.info(t("coherence_validation_done", valid=len(items) - errors, total=len(items)))
 
 def copy_pack_icon():
-    src = os.path.join(JAVA_RP_DIR, "pack.png")
-    dst = os.path.join(BEDROCK_RP_DIR, "pack_icon.png")
-    if os.path.isfile(src):
-        shutil.copy(src, dst)
-        print(t("pack_icon_copied"))
+    dst = os.path.join(CTX.bedrock_dir, "pack_icon.png")
+    if CTX.pack.isfile("pack.png"):
+        CTX.sink.copy_from_pack(CTX.pack, "pack.png", dst)
+        LOG_PACK.info(t("pack_icon_copied"))
     else:
-        print(t("no_pack_icon"))
+        LOG_PACK.info(t("no_pack_icon"))
 
 def generate_manifest():
-    if not JAVA_RP_DIR or not BEDROCK_RP_DIR:
+    if not CTX.java_dir or not CTX.bedrock_dir:
         raise EnvironmentError("JAVA_RP_DIR and BEDROCK_RP_DIR must be set before generating manifest.")
     description = "Converted Resource Pack"
-    packmeta_path = os.path.join(JAVA_RP_DIR, "pack.mcmeta")
-    if os.path.isfile(packmeta_path):
+    if CTX.pack.isfile("pack.mcmeta"):
         try:
-            with open(packmeta_path, encoding="utf-8") as f:
+            with CTX.pack.open("pack.mcmeta") as f:
                 meta = json.load(f)
                 description = meta.get("pack", {}).get("description", description)
         except Exception as e:
-            print(f"⚠️ Impossible de lire la description depuis pack.mcmeta: {e}")
+            LOG_PACK.warning(f"⚠️ Impossible de lire la description depuis pack.mcmeta: {e}")
 
     header_uuid = str(uuid.uuid4())
     module_uuid = str(uuid.uuid4())
@@ -1219,32 +3085,30 @@ def generate_manifest():
             }
         ]
     }
-    os.makedirs(BEDROCK_RP_DIR, exist_ok=True)
-    with open(os.path.join(BEDROCK_RP_DIR, "manifest.json"), 'w', encoding='utf-8') as f:
-        json.dump(manifest, f, indent=4)
-    print(t("manifest_generated"))
+    CTX.sink.makedirs(CTX.bedrock_dir)
+    write_json(os.path.join(CTX.bedrock_dir, "manifest.json"), manifest, indent=4)
+    LOG_PACK.info(t("manifest_generated"))
 
 def validate_geo_json_files(geo_dir):
     """
     Validate all .geo.json files in the given directory.
     """
     count = 0
-    if not os.path.isdir(geo_dir):
-        print(t("geo_validation_done", count=0))
+    if not CTX.sink.isdir(geo_dir):
+        LOG_VALIDATION.info(t("geo_validation_done", count=0))
         return
-    print(t("geo_validation"))
-    for file in os.listdir(geo_dir):
+    LOG_VALIDATION.info(t("geo_validation"))
+    for file in CTX.sink.listdir(geo_dir):
         if file.endswith('.geo.json'):
             path = os.path.join(geo_dir, file)
             try:
-                with open(path, encoding='utf-8') as f:
-                    data = json.load(f)
+                data = json.loads(CTX.sink.read_bytes(path))
                 # Basic validation: check for required keys
                 if "minecraft:geometry" in data:
                     count += 1
             except Exception as e:
-                print(f"[Geo Validation] {file}: {e}")
-    print(t("geo_validation_done", count=count))
+                LOG_VALIDATION.warning(f"[Geo Validation] {file}: {e}")
+    LOG_VALIDATION.info(t("geo_validation_done", count=count))
 
 
 def copy_sounds():
@@ -1252,23 +3116,27 @@ def copy_sounds():
     Copies all .ogg files from all namespaces in the Java resource pack to the Bedrock pack,
     and generates a sound_definitions.json compatible with Bedrock.
     """
-    assets_path = os.path.join(JAVA_RP_DIR, 'assets')
-    sounds_dst = os.path.join(BEDROCK_RP_DIR, 'sounds', 'custom')
+    sounds_dst = os.path.join(CTX.bedrock_dir, 'sounds', 'custom')
     sound_definitions = {}
     found = False
 
-    if os.path.isdir(assets_path):
-        for namespace in os.listdir(assets_path):
-            src = os.path.join(assets_path, namespace, 'sounds')
-            if os.path.isdir(src):
-                for root, _, files in os.walk(src):
+    if CTX.pack.isdir('assets'):
+        for namespace in CTX.pack.listdir('assets'):
+            src = f"assets/{namespace}/sounds"
+            if CTX.pack.isdir(src):
+                for root, _, files in CTX.pack.walk(src):
                     for file in files:
                         if file.endswith('.ogg'):
-                            rel_path = os.path.relpath(os.path.join(root, file), src).replace('\\', '/').replace('\\', '/')
+                            rel_path = f"{root}/{file}"[len(src) + 1:]
                             sound_id = f"{namespace}:{os.path.splitext(rel_path)[0]}"
-                            dest_path = os.path.join(sounds_dst, rel_path)
-                            os.makedirs(os.path.dirname(dest_path), exist_ok=True)
-                            shutil.copy2(os.path.join(root, file), dest_path)
+                            dest_path = os.path.join(sounds_dst, *rel_path.split('/'))
+                            CTX.sink.makedirs(os.path.dirname(dest_path))
+                            src_file = f"{root}/{file}"
+                            cache_key = f"sound:{src_file}"
+                            cache_hash = CTX.build_cache.input_hash(src_file) if CTX.build_cache.enabled else None
+                            if not CTX.build_cache.is_fresh(cache_key, cache_hash):
+                                CTX.sink.copy_from_pack(CTX.pack, src_file, dest_path)
+                                CTX.build_cache.record(cache_key, cache_hash, [dest_path])
 
                             # Detect if this is a stream (long music)
                             stream = "records" in rel_path or "special" in rel_path
@@ -1284,30 +3152,432 @@ def copy_sounds():
                             found = True
 
     if found:
-        sound_def_file = os.path.join(BEDROCK_RP_DIR, 'sound_definitions.json')
-        with open(sound_def_file, 'w', encoding='utf-8') as f:
-            json.dump({
-                "format_version": "1.14.0",
-                "sound_definitions": sound_definitions
-            }, f, indent=4)
-        print(t("sounds_copied"))
+        sound_def_file = os.path.join(CTX.bedrock_dir, 'sound_definitions.json')
+        write_json(sound_def_file, {
+            "format_version": "1.14.0",
+            "sound_definitions": sound_definitions
+        }, indent=4)
+        log_copy_methods(LOG_PACK, "Sons")
+        LOG_PACK.info(t("sounds_copied"))
     else:
-        print(t("no_sounds"))
+        LOG_PACK.info(t("no_sounds"))
+
+# --- Mesures : durées, compteurs et histogrammes ---
+# Chaque contexte a son registre (CTX.metrics), rempli au fil du pipeline et résumé en fin de run
+# (tableau dans les logs, JSON avec --metrics / --summary). Compteurs relevés :
+#   pack.files_read / pack.bytes_read   lectures de fichiers du pack Java (hors copies noyau)
+#   pack.fs_calls                       appels système sur un pack dossier : stat/isfile/isdir,
+#                                       listdir, un par dossier parcouru par walk
+#   output.fs_calls                     idem sur un dossier de sortie (sink et vérifications du cache)
+#   output.files_written / output.bytes_written, output.files_copied
+#   models.converted                    conversions effectives (hors cache)
+# Les processus workers ont leur propre registre : seuls les résultats renvoyés au parent
+# (modèles convertis, latence) y sont comptés.
+class Metrics:
+    """
+    Registre thread-safe : durée des étapes du pipeline et des sous-étapes (timers),
+    compteurs et histogrammes (ex. latence de conversion par modèle, en ms).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.stages = []
+        self.timers = OrderedDict()
+        self.counters = Counter()
+        self.histograms = defaultdict(list)
+
+    def add(self, name, value=1):
+        with self._lock:
+            self.counters[name] += value
+
+    def observe(self, name, value):
+        with self._lock:
+            self.histograms[name].append(value)
+
+    def record_time(self, name, seconds):
+        with self._lock:
+            total, count = self.timers.get(name, (0.0, 0))
+            self.timers[name] = (total + seconds, count + 1)
+
+    def record_stage(self, label, seconds):
+        with self._lock:
+            self.stages.append((label, seconds))
+
+    @contextlib.contextmanager
+    def timer(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record_time(name, time.perf_counter() - start)
+
+    @staticmethod
+    def distribution(values):
+        ordered = sorted(values)
+        def percentile(p):
+            return round(ordered[min(len(ordered) - 1, int(p * len(ordered)))], 3)
+        return {"count": len(ordered), "mean": round(sum(ordered) / len(ordered), 3), "p50": percentile(0.5),
+                "p90": percentile(0.9), "p99": percentile(0.99), "max": round(ordered[-1], 3)}
+
+    def as_dict(self, counters=None):
+        """
+        Export JSON ; counters : compteurs relevés ailleurs (caches, JSON...) ajoutés au registre.
+        """
+        with self._lock:
+            merged = Counter(self.counters)
+            merged.update(counters or {})
+            return {
+                "stages": [{"stage": label, "seconds": round(seconds, 4)} for label, seconds in self.stages],
+                "timers": {name: {"seconds": round(total, 4), "count": count} for name, (total, count) in self.timers.items()},
+                "counters": dict(sorted(merged.items())),
+                "histograms": {name: self.distribution(values) for name, values in self.histograms.items() if values},
+            }
+
+
+def format_metrics_table(snapshot):
+    """
+    Lignes du tableau récapitulatif d'un export Metrics.as_dict().
+    """
+    sections = [
+        ("étape", "temps", [(entry["stage"], f"{entry['seconds']:.2f}s") for entry in snapshot["stages"]]),
+        ("timer", "temps", [(name, f"{timer['seconds']:.2f}s ({timer['count']}x)") for name, timer in snapshot["timers"].items()]),
+        ("compteur", "valeur", [(name, f"{value:,}".replace(',', ' ')) for name, value in snapshot["counters"].items()]),
+    ]
+    width = max([len(name) for _, _, rows in sections for name, _ in rows] + [14])
+    lines = []
+    for title, unit, rows in sections:
+        if not rows:
+            continue
+        lines.append(f"{title:<{width}} {unit:>18}")
+        lines.extend(f"{name:<{width}} {value:>18}" for name, value in rows)
+        if title == "étape":
+            total = sum(entry["seconds"] for entry in snapshot["stages"])
+            lines.append(f"{'total pipeline':<{width}} {total:>17.2f}s")
+    for name, dist in snapshot["histograms"].items():
+        lines.append(f"{name} : n={dist['count']} moy={dist['mean']} p50={dist['p50']} "
+                     f"p90={dist['p90']} p99={dist['p99']} max={dist['max']}")
+    return lines
+
+
+def print_metrics_summary():
+    for line in format_metrics_table(CTX.metrics_snapshot()):
+        LOG_PIPELINE.info(f"[Mesures] {line}")
+
+
+# --- Contexte de conversion ---
+# Tout l'état d'une conversion (pack source, sink de sortie, options, caches, statistiques) vit
+# dans un ConversionContext. Le pipeline lit le contexte actif via CTX : chaque thread (ou tâche
+# asyncio) peut en activer un différent, ce qui permet de convertir plusieurs packs en même temps
+# dans un même processus. Sans contexte activé, un contexte par défaut est créé au premier usage.
+class ConversionContext:
+    """
+    État d'une conversion. Les options valent par défaut les variables d'environnement
+    PACKCONVERTER_* ; les mots-clés (noms d'attributs) les remplacent.
+    """
+    # Réglages de l'utilisateur (CLI, GUI, environnement), repris par les contextes dérivés
+    OPTIONS = ("output_mode", "json_mode", "json_compare", "texture_copy_mode", "texture_optimize",
+               "png8_min_bytes", "copy_mode", "zip_level", "workers", "engine", "full_rebuild",
+               "geyser_mapping", "render_controllers")
+
+    def __init__(self, java_dir=None, bedrock_dir=None, **options):
+        env = os.environ
+        # Entrée / sortie
+        self.java_dir = t("java_rp_placeholder") + os.sep
+        self.bedrock_dir = t("bedrock_rp_placeholder") + os.sep
+        self.pack = DirectoryPackSource(self.java_dir)
+        # Destination des sorties : "folder" (bedrock_dir sur disque), "memory" ou "archive"
+        self.output_mode = env.get("PACKCONVERTER_OUTPUT", "folder")
+        self.sink = DirectoryOutputSink(self.bedrock_dir)
+        # Options
+        self.json_mode = env.get("PACKCONVERTER_JSON", "pretty")
+        self.json_compare = env.get("PACKCONVERTER_JSON_COMPARE") == "1"
+        self.texture_copy_mode = env.get("PACKCONVERTER_TEXTURES", "referenced")
+        self.texture_optimize = env.get("PACKCONVERTER_PNG8", "0") == "1"
+        self.png8_min_bytes = int(env.get("PACKCONVERTER_PNG8_MIN", "1024"))
+        self.copy_mode = env.get("PACKCONVERTER_COPY_MODE", "copy")
+        self.zip_level = int(env.get("PACKCONVERTER_ZIP_LEVEL", "6"))
+        # Un nombre de workers explicite (PACKCONVERTER_WORKERS ou --workers) n'est pas plafonné
+        workers = env.get("PACKCONVERTER_WORKERS", "")
+        self.workers = max(1, int(workers)) if workers.isdigit() else min(8, os.cpu_count() or 4)
+        # Moteur de conversion des modèles : "thread" ou "process" (pool de processus, contourne le GIL)
+        self.engine = env.get("PACKCONVERTER_ENGINE", "thread")
+        self.full_rebuild = False
+        # Format du mapping Geyser ("v1" ou "v2") et render controllers ("model", "custom" ou "none")
+        self.geyser_mapping = env.get("PACKCONVERTER_GEYSER_MAPPING", "v2")
+        self.render_controllers = env.get("PACKCONVERTER_RENDER_CONTROLLERS", "model")
+        # Caches
+        self.build_cache = BuildCache(None)
+        self.resolved_models = LRUCache(int(env.get("PACKCONVERTER_MODEL_CACHE_SIZE", "4096")))
+        self.output_textures = OutputTextureIndex()
+        # Géométrie partagée utilisée par chaque modèle Bedrock (output_name -> identifiant)
+        self.geometry_ids = {}
+        # Fichiers de géométrie partagée déjà écrits pendant cette conversion
+        self.written_geometries = set()
+        # Textures écrites par la dernière copie : (src, dst, clé de cache, hash)
+        self.copied_textures = []
+        # Statistiques
+        self.model_conversions = Counter()
+        self.model_read_stats = {"files": 0, "bytes": 0, "parse_time": 0.0}
+        self.item_parse_stats = {fmt: {"files": 0, "bytes": 0, "read_time": 0.0, "parse_time": 0.0} for fmt in ("json", "yaml")}
+        self.json_write_stats = {"files": 0, "bytes": 0, "time": 0.0, "alt_bytes": 0, "alt_time": 0.0}
+        self.copy_methods = Counter()
+        # Modèles dont la conversion a échoué (rapports) et registre des mesures du run
+        self.failed_models = []
+        self.metrics = Metrics()
+        # Mode batch : pool de threads et cache des modèles vanilla partagés entre les packs
+        self.executor = None
+        self.shared_models = None
+        # Progression et annulation
+        self.cancel_event = threading.Event()
+        self.progress_listeners = []
+        self.progress_starts = {}
+        for name, value in options.items():
+            if not hasattr(self, name):
+                raise TypeError(f"Option de conversion inconnue : {name}")
+            setattr(self, name, value)
+        if java_dir or bedrock_dir:
+            self.configure_paths(java_dir, bedrock_dir)
+
+    def configure_paths(self, java_dir=None, bedrock_dir=None):
+        """
+        Fixe java_dir et bedrock_dir (variables d'environnement JAVA_RP_DIR / BEDROCK_RP_DIR
+        par défaut), ouvre le pack Java et un sink dossier sur la sortie.
+        """
+        java_dir = java_dir or os.environ.get("JAVA_RP_DIR", t("java_rp_placeholder"))
+        bedrock_dir = bedrock_dir or os.environ.get("BEDROCK_RP_DIR", t("bedrock_rp_placeholder"))
+        if not java_dir or not bedrock_dir:
+            raise EnvironmentError(t("no_java_dir"))
+        if not (java_dir.lower().endswith('.zip') and os.path.isfile(java_dir)):
+            if not java_dir.endswith(os.sep):
+                java_dir += os.sep
+        if not bedrock_dir.endswith(os.sep):
+            bedrock_dir += os.sep
+        self.pack.close()
+        self.java_dir, self.bedrock_dir = java_dir, bedrock_dir
+        self.pack = open_java_pack(java_dir)
+        self.sink = DirectoryOutputSink(bedrock_dir)
+        return self
+
+    def options(self):
+        return {name: getattr(self, name) for name in self.OPTIONS}
+
+    def worker_config(self):
+        """
+        Options transmises aux processus workers (picklables) : ils reconstruisent leur propre
+        contexte, le cache de build restant géré par le processus parent.
+        """
+        return dict(self.options(), java_dir=self.java_dir, bedrock_dir=self.bedrock_dir, lang=LANG,
+                    log_level=logging.getLevelName(LOGGER.getEffectiveLevel()))
+
+    @contextlib.contextmanager
+    def activate(self):
+        """
+        Rend ce contexte actif (CTX) dans le thread ou la tâche courante le temps du bloc.
+        """
+        token = _CURRENT_CONTEXT.set(self)
+        try:
+            yield self
+        finally:
+            _CURRENT_CONTEXT.reset(token)
+
+    def metrics_snapshot(self):
+        """
+        Export JSON du registre, complété par les compteurs tenus ailleurs (caches, JSON, copies).
+        """
+        counters = {
+            "cache.build_hits": self.build_cache.hits, "cache.build_misses": self.build_cache.misses,
+            "cache.models_hits": self.resolved_models.hits, "cache.models_misses": self.resolved_models.misses,
+            "cache.models_evictions": self.resolved_models.evictions,
+            "json.files": self.json_write_stats["files"], "json.bytes": self.json_write_stats["bytes"],
+            "models.failed": len(self.failed_models),
+        }
+        if self.shared_models is not None:
+            counters.update({"cache.shared_models_hits": self.shared_models.hits,
+                             "cache.shared_models_misses": self.shared_models.misses})
+        return self.metrics.as_dict({name: value for name, value in counters.items() if value})
+
+    def close(self):
+        self.pack.close()
+
+
+_CURRENT_CONTEXT = contextvars.ContextVar("packconverter_context", default=None)
+_DEFAULT_CONTEXT = None
+_DEFAULT_CONTEXT_LOCK = threading.Lock()
+
+
+def current_context():
+    """
+    Contexte actif du thread courant, sinon le contexte par défaut (créé au premier appel).
+    """
+    global _DEFAULT_CONTEXT
+    ctx = _CURRENT_CONTEXT.get()
+    if ctx is not None:
+        return ctx
+    if _DEFAULT_CONTEXT is None:
+        with _DEFAULT_CONTEXT_LOCK:
+            if _DEFAULT_CONTEXT is None:
+                _DEFAULT_CONTEXT = ConversionContext()
+    return _DEFAULT_CONTEXT
+
+
+def set_default_context(ctx):
+    """
+    Remplace le contexte par défaut (celui des threads qui n'en activent pas) et le renvoie.
+    """
+    global _DEFAULT_CONTEXT
+    _DEFAULT_CONTEXT = ctx
+    return ctx
+
+
+def bind_context(func):
+    """
+    func exécutée dans le contexte actif au moment de l'appel : à utiliser pour tout ce qui est
+    soumis à un pool de threads (un thread du pool n'hérite pas du contexte de l'appelant).
+    """
+    ctx = current_context()
+
+    def bound(*args, **kwargs):
+        with ctx.activate():
+            return func(*args, **kwargs)
+    return bound
+
+
+class _CurrentContext:
+    """
+    CTX : lit et écrit les attributs du contexte actif.
+    """
+    __slots__ = ()
+
+    def __getattr__(self, name):
+        return getattr(current_context(), name)
+
+    def __setattr__(self, name, value):
+        setattr(current_context(), name, value)
+
+
+CTX = _CurrentContext()
+# Anciennes variables globales (JAVA_RP_DIR, WORKERS...) : lues sur le contexte actif
+_LEGACY_GLOBALS = {
+    "JAVA_RP_DIR": "java_dir", "BEDROCK_RP_DIR": "bedrock_dir", "JAVA_PACK": "pack", "OUTPUT_SINK": "sink",
+    "OUTPUT_MODE": "output_mode", "BUILD_CACHE": "build_cache", "JSON_OUTPUT_MODE": "json_mode",
+    "JSON_COMPARE": "json_compare", "JSON_WRITE_STATS": "json_write_stats", "TEXTURE_COPY_MODE": "texture_copy_mode",
+    "TEXTURE_OPTIMIZE": "texture_optimize", "PNG8_MIN_BYTES": "png8_min_bytes",
+    "COPY_MODE": "copy_mode", "ZIP_COMPRESSION_LEVEL": "zip_level", "MODEL_CONVERSIONS": "model_conversions",
+    "GEOMETRY_IDS": "geometry_ids", "RESOLVED_MODELS": "resolved_models", "MODEL_READ_STATS": "model_read_stats",
+    "ITEM_PARSE_STATS": "item_parse_stats", "COPIED_TEXTURES": "copied_textures", "COPY_METHODS": "copy_methods",
+    "OUTPUT_TEXTURES": "output_textures", "CANCEL_EVENT": "cancel_event", "PROGRESS_LISTENERS": "progress_listeners",
+    "WORKERS": "workers", "ENGINE": "engine", "FULL_REBUILD": "full_rebuild",
+}
+
+
+def __getattr__(name):
+    if name in _LEGACY_GLOBALS:
+        return getattr(current_context(), _LEGACY_GLOBALS[name])
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+# --- Progression et annulation ---
+class ConversionCancelled(Exception):
+    """Levée quand l'utilisateur annule la conversion en cours."""
+
+
+def subscribe_progress(listener):
+    CTX.progress_listeners.append(listener)
+    return listener
+
+
+def unsubscribe_progress(listener):
+    if listener in CTX.progress_listeners:
+        CTX.progress_listeners.remove(listener)
+
+
+def emit_progress(stage, done, total, current=None):
+    """
+    Publie un événement {stage, done, total, current, eta} à tous les abonnés.
+    Appelable depuis n'importe quel thread : un abonné GUI doit repasser par une file d'attente.
+    """
+    now = time.perf_counter()
+    if done == 0 or stage not in CTX.progress_starts:
+        CTX.progress_starts[stage] = now
+    elapsed = now - CTX.progress_starts[stage]
+    eta = elapsed / done * (total - done) if done and total else None
+    event = {"stage": stage, "done": done, "total": total, "current": current, "eta": eta}
+    for listener in list(CTX.progress_listeners):
+        try:
+            listener(event)
+        except Exception:
+            pass
+
+
+def check_cancelled():
+    if CTX.cancel_event.is_set():
+        raise ConversionCancelled()
+
+
+def print_progress_bar(event, width=30):
+    """
+    Abonné du mode console : barre de progression textuelle sur le terminal (stderr).
+    """
+    stream = sys.__stderr__
+    if stream is None or not stream.isatty():
+        return
+    total = event["total"] or 1
+    ratio = min(1.0, event["done"] / total)
+    filled = int(width * ratio)
+    eta = f" ETA {event['eta']:.0f}s" if event["eta"] is not None and ratio < 1 else ""
+    stream.write(f"\r[{'#' * filled}{'-' * (width - filled)}] {ratio * 100:5.1f}% {event['stage']} {event['done']}/{event['total']}{eta}\033[K")
+    if ratio >= 1:
+        stream.write("\n")
+    stream.flush()
+
+
+def run_pipeline(steps, items=None, context=None):
+    """
+    Exécute les étapes (libellé, fonction(items)) dans l'ordre en publiant la progression.
+    Une étape qui renvoie une valeur non None remplace items. Vérifie l'annulation entre chaque étape.
+    context : ConversionContext activé pendant tout le pipeline (contexte actif par défaut).
+    """
+    if context is not None:
+        with context.activate():
+            return run_pipeline(steps, items)
+    items = items if items is not None else []
+    emit_progress("pipeline", 0, len(steps))
+    for i, (label, step) in enumerate(steps):
+        check_cancelled()
+        LOG_PIPELINE.info("-" * 40 + f"  {t('step')} {i+1}/{len(steps)} : {label}  " + "-" * 40)
+        start = time.time()
+        result = step(items)
+        if result is not None:
+            items = result
+        elapsed = time.time() - start
+        CTX.metrics.record_stage(label, elapsed)
+        LOG_PIPELINE.info(f"[Profiling] {label} : {round(elapsed, 2)}s")
+        emit_progress("pipeline", i + 1, len(steps), label)
+    return items
 
-WORKERS = min(8, os.cpu_count() or 4)
 
 def run_parallel(func, iterable, desc=None):
     """
     Exécute func sur chaque élément de iterable en parallèle (ThreadPoolExecutor).
+    Si desc est fourni, la progression est publiée sous ce nom d'étape.
     """
+    jobs = list(iterable)
     results = []
-    with ThreadPoolExecutor(max_workers=WORKERS) as executor:
-        futures = {executor.submit(func, *args): args for args in iterable}
-        for future in as_completed(futures):
+    if desc:
+        emit_progress(desc, 0, len(jobs))
+    func = bind_context(func)
+    with _thread_pool(CTX.workers) as executor:
+        futures = {executor.submit(func, *args): args for args in jobs}
+        for done, future in enumerate(as_completed(futures), 1):
+            if CTX.cancel_event.is_set():
+                for pending in futures:
+                    pending.cancel()
+                raise ConversionCancelled()
             try:
                 results.append(future.result())
             except Exception as e:
-                print(f"[Thread error] {e}")
+                LOG_PIPELINE.error(f"[Thread error] {e}")
+            if desc:
+                emit_progress(desc, done, len(jobs))
     return results
 
 # --- PATCH: Parallélisation de la copie des textures ---
@@ -1320,102 +3590,356 @@ def batch_convert_textures_to_png8(texture_files):
     run_parallel(convert, texture_files)
 
 # --- PATCH: Parallélisation de la génération des modèles Bedrock ---
-def batch_convert_java_models_to_geo(model_jobs):
+def batch_convert_java_models_to_geo(model_jobs, engine=None):
     from concurrent.futures import ThreadPoolExecutor, as_completed, TimeoutError
-    import traceback
     import time
     failed = []
     results = []
     total = len(model_jobs)
-    print(f"[Batch] Début conversion de {total} modèles...")
+    LOG_MODELS.info(f"[Batch] Début conversion de {total} modèles...")
     start = time.time()
     # Filtrer les jobs mal formés
     filtered_jobs = []
     for job in model_jobs:
         if isinstance(job, dict):
             if not job.get('model_path') or not job.get('output_name') or not job.get('texture_key'):
-                print(f"[Batch] ⚠️ Job ignoré (incomplet): {job}")
+                LOG_MODELS.warning(f"[Batch] ⚠️ Job ignoré (incomplet): {job}")
                 failed.append(job)
                 continue
         else:
             if not job or len(job) != 3 or not all(job):
-                print(f"[Batch] ⚠️ Job ignoré (incomplet): {job}")
+                LOG_MODELS.warning(f"[Batch] ⚠️ Job ignoré (incomplet): {job}")
                 failed.append(job)
                 continue
         filtered_jobs.append(job)
     if not filtered_jobs:
-        print("[Batch] Aucun job valide à traiter.")
+        LOG_MODELS.info("[Batch] Aucun job valide à traiter.")
+        return failed
+    if (engine or CTX.engine) == "process" and not CTX.sink.persistent:
+        # Les sorties en mémoire ne traversent pas les processus
+        LOG_MODELS.info(f"[Batch] Sortie {CTX.sink.kind} : moteur thread utilisé à la place du moteur processus")
+        engine = "thread"
+    if (engine or CTX.engine) == "process":
+        _run_model_jobs_in_processes(filtered_jobs, failed)
+        CTX.metrics.record_time("models.batch", time.time() - start)
+        LOG_MODELS.info(f"[Batch] Conversion terminée en {round(time.time()-start,1)}s. Succès: {total - len(failed)}/{total}, Échecs: {len(failed)}")
+        if failed:
+            LOG_MODELS.warning(f"[Batch] Modèles échoués: {failed}")
         return failed
+    emit_progress("models", 0, len(filtered_jobs))
+    progress = ThrottledProgress(LOG_MODELS, "[Batch] {done}/{total} modèles convertis...", len(filtered_jobs))
     try:
-        with ThreadPoolExecutor(max_workers=WORKERS) as executor:
+        convert = bind_context(_safe_convert_java_model_to_geo)
+        with _thread_pool(CTX.workers) as executor:
             future_to_job = {}
             for job in filtered_jobs:
-                print(f"[Batch] Soumission du job: {job}")
-                future = executor.submit(_safe_convert_java_model_to_geo, job)
+                LOG_MODELS.debug("[Batch] Soumission du job: %s", job)
+                future = executor.submit(convert, job)
                 future_to_job[future] = job
             for idx, future in enumerate(as_completed(future_to_job), 1):
+                if CTX.cancel_event.is_set():
+                    # Les jobs pas encore démarrés sont abandonnés, ceux en cours se terminent
+                    for pending in future_to_job:
+                        pending.cancel()
+                    raise ConversionCancelled()
                 job = future_to_job[future]
+                emit_progress("models", idx, len(filtered_jobs), _job_fields(job)[0])
                 try:
                     result = future.result(timeout=30)
                     if result is not None and not result.get('success', False):
                         failed.append(job)
-                        print(f"[Batch] ❌ Échec: {result.get('error', 'Erreur inconnue')} (job: {job})")
+                        LOG_MODELS.warning(f"[Batch] ❌ Échec: {result.get('error', 'Erreur inconnue')} (job: {job})")
                     else:
-                        print(f"[Batch] ✅ Succès {idx}/{total} : {job}")
+                        if result and result.get('geometry'):
+                            CTX.geometry_ids[_job_fields(job)[1]] = result['geometry']
+                        LOG_MODELS.debug("[Batch] ✅ Succès %d/%d : %s", idx, total, job)
                 except TimeoutError:
                     failed.append(job)
-                    print(f"[Batch] ❌ Timeout (>30s) pour {job}")
+                    LOG_MODELS.error(f"[Batch] ❌ Timeout (>30s) pour {job}")
                 except Exception as e:
                     failed.append(job)
-                    print(f"[Batch] ❌ Exception non gérée pour {job}: {e}")
-                    traceback.print_exc()
+                    LOG_MODELS.error(f"[Batch] ❌ Exception non gérée pour {job}: {e}",
+                                     exc_info=LOG_MODELS.isEnabledFor(logging.DEBUG))
+                progress.step()
+    except ConversionCancelled:
+        raise
     except Exception as e:
-        print(f"[Batch] ❌ Exception globale dans le batch: {e}")
-        traceback.print_exc()
+        LOG_MODELS.error(f"[Batch] ❌ Exception globale dans le batch: {e}", exc_info=True)
         failed.extend(filtered_jobs)
-    print(f"[Batch] Conversion terminée en {round(time.time()-start,1)}s. Succès: {total - len(failed)}/{total}, Échecs: {len(failed)}")
+    CTX.metrics.record_time("models.batch", time.time() - start)
+    LOG_MODELS.info(f"[Batch] Conversion terminée en {round(time.time()-start,1)}s. Succès: {total - len(failed)}/{total}, Échecs: {len(failed)}")
     if failed:
-        print(f"[Batch] Modèles échoués: {failed}")
+        LOG_MODELS.warning(f"[Batch] Modèles échoués: {failed}")
     return failed
 
+def plan_model_jobs(items):
+    """
+    Transforme les items extraits en jobs de conversion (model_path, output_name, texture_key),
+    un seul par modèle Bedrock.
+    """
+    jobs = []
+    seen = set()
+    for item in items:
+        output_name = item['name'].split(":")[-1]
+        if item.get('model_path') and output_name not in seen:
+            seen.add(output_name)
+            jobs.append((item['model_path'], output_name, item['texture']))
+    return jobs
+
+def convert_planned_models(items):
+    CTX.failed_models.extend(batch_convert_java_models_to_geo(plan_model_jobs(items)))
+    # Les générateurs (custom_items, mapping Geyser, attachables...) référencent la géométrie partagée
+    for item in items:
+        name = item['name'].split(":")[-1]
+        if name in CTX.geometry_ids:
+            item['geometry'] = CTX.geometry_ids[name]
+    if CTX.geometry_ids:
+        LOG_MODELS.info(f"[Géométrie] {len(set(CTX.geometry_ids.values()))} géométries uniques pour {len(CTX.geometry_ids)} modèles")
+
+def print_model_conversion_summary():
+    duplicates = {name: count for name, count in CTX.model_conversions.items() if count > 1}
+    LOG_MODELS.info(f"[Résumé] {sum(CTX.model_conversions.values())} conversions pour {len(CTX.model_conversions)} modèles "
+                    f"({len(duplicates)} convertis plusieurs fois)")
+    for name, count in duplicates.items():
+        LOG_MODELS.warning(f"[Résumé] ⚠️ {name} converti {count} fois")
+    files = CTX.model_read_stats["files"]
+    if files:
+        LOG_MODELS.info(f"[Résumé] Modèles Java lus : {files} fichiers, {CTX.model_read_stats['bytes'] / 1024:.1f} Ko, "
+                        f"parsing {CTX.model_read_stats['parse_time'] * 1000:.1f} ms "
+                        f"({CTX.model_read_stats['bytes'] / files:.0f} octets et {CTX.model_read_stats['parse_time'] * 1000 / files:.2f} ms par modèle)")
+    LOG_MODELS.info(f"[Résumé] Cache modèles : {CTX.resolved_models.hits} hits, {CTX.resolved_models.misses} misses, "
+                    f"{CTX.resolved_models.evictions} évictions ({len(CTX.resolved_models)}/{CTX.resolved_models.maxsize})")
+
 def _safe_convert_java_model_to_geo(job):
     # job is expected to be a tuple or dict with model_path, output_name, texture_key
-    import traceback
-    import sys
     try:
-        print(f"[Batch] [THREAD] (TOP) Thread started for job: {job}"); sys.stdout.flush()
-        print(f"[Batch] [THREAD] (BEFORE VARS) job type: {type(job)}"); sys.stdout.flush()
-        if isinstance(job, dict):
-            print(f"[Batch] [THREAD] (DICT) job.keys: {list(job.keys())}"); sys.stdout.flush()
-            print(f"[Batch] [THREAD] (DICT) about to get model_path"); sys.stdout.flush()
-            model_path = job.get('model_path')
-            print(f"[Batch] [THREAD] (DICT) model_path={model_path}"); sys.stdout.flush()
-            print(f"[Batch] [THREAD] (DICT) about to get output_name"); sys.stdout.flush()
-            output_name = job.get('output_name')
-            print(f"[Batch] [THREAD] (DICT) output_name={output_name}"); sys.stdout.flush()
-            print(f"[Batch] [THREAD] (DICT) about to get texture_key"); sys.stdout.flush()
-            texture_key = job.get('texture_key')
-            print(f"[Batch] [THREAD] (DICT) texture_key={texture_key}"); sys.stdout.flush()
-        else:
-            print(f"[Batch] [THREAD] (TUPLE) job len: {len(job)}"); sys.stdout.flush()
-            print(f"[Batch] [THREAD] (TUPLE) about to unpack"); sys.stdout.flush()
-            model_path, output_name, texture_key = job
-            print(f"[Batch] [THREAD] (TUPLE) model_path={model_path}, output_name={output_name}, texture_key={texture_key}"); sys.stdout.flush()
-        print(f"[Batch] [THREAD] Variables: model_path={model_path}, output_name={output_name}, texture_key={texture_key}"); sys.stdout.flush()
-        if not model_path or not os.path.isfile(model_path):
-            print(f"[Batch] [THREAD] ERREUR: model_path inexistant ou vide: {model_path}"); sys.stdout.flush()
+        model_path, output_name, texture_key = _job_fields(job)
+        LOG_MODELS.debug("[Batch] [THREAD] Job: model_path=%s, output_name=%s, texture_key=%s",
+                         model_path, output_name, texture_key)
+        if not model_path or not CTX.pack.isfile(model_path):
+            LOG_MODELS.debug("[Batch] [THREAD] ERREUR: model_path inexistant ou vide: %s", model_path)
             return {'success': False, 'error': f'model_path inexistant: {model_path}'}
-        print(f"[Batch] [THREAD] Appel convert_java_model_to_geo({model_path}, {output_name}, {texture_key})"); sys.stdout.flush()
-        convert_java_model_to_geo(model_path, output_name, texture_key)
-        print(f"[Batch] [THREAD] Fin OK du job: {job}"); sys.stdout.flush()
-        return {'success': True}
+        result = convert_java_model_to_geo(model_path, output_name, texture_key) or {}
+        LOG_MODELS.debug("[Batch] [THREAD] Fin OK du job: %s", job)
+        return {'success': True, 'outputs': result.get('outputs', []), 'geometry': result.get('geometry'),
+                'seconds': result.get('seconds')}
     except Exception as e:
-        print(f"[Batch] ❌ Exception dans _safe_convert_java_model_to_geo: {e} (job: {job})"); sys.stdout.flush()
-        import traceback
-        traceback.print_exc()
-        sys.stdout.flush()
+        LOG_MODELS.error(f"[Batch] ❌ Exception dans _safe_convert_java_model_to_geo: {e} (job: {job})",
+                         exc_info=LOG_MODELS.isEnabledFor(logging.DEBUG))
         return {'success': False, 'error': str(e)}
 
+# --- Moteur multi-processus pour la conversion des modèles ---
+def _job_fields(job):
+    if isinstance(job, dict):
+        return job.get('model_path'), job.get('output_name'), job.get('texture_key')
+    return tuple(job)
+
+def _init_process_worker(config):
+    """
+    Initialise un processus worker à partir de ConversionContext.worker_config() : langue, niveau
+    de log, puis un contexte par défaut avec ses options et le pack Java rouvert (un ZipFile ne se
+    partage pas entre processus). Le cache reste géré par le processus parent. Rien ne dépend de
+    sys.argv : l'import du module ne configure rien.
+    """
+    global LANG
+    config = dict(config)
+    LANG = config.pop("lang")
+    setup_logging(config.pop("log_level", None))
+    set_default_context(ConversionContext(**config))
+
+def _convert_model_chunk(jobs):
+    # Exécuté dans un processus worker : écrit les fichiers lui-même et renvoie les résultats
+    return [(job, _safe_convert_java_model_to_geo(job)) for job in jobs]
+
+def _run_model_jobs_in_processes(jobs, failed, chunk_size=None):
+    """
+    Répartit les jobs par paquets sur un ProcessPoolExecutor. Les jobs déjà à jour dans
+    le cache sont filtrés ici, et les sorties renvoyées par les workers y sont enregistrées.
+    """
+    cache_entries = {}
+    pending = []
+    for job in jobs:
+        model_path, output_name, texture_key = _job_fields(job)
+        if CTX.build_cache.enabled:
+            try:
+                cache_key, cache_hash = model_cache_key(model_path, output_name, texture_key)
+            except Exception:
+                cache_key = cache_hash = None
+            if cache_key and CTX.build_cache.is_fresh(cache_key, cache_hash):
+                geometry = CTX.build_cache.meta(cache_key).get('geometry')
+                if geometry:
+                    CTX.geometry_ids[output_name] = geometry
+                continue
+            cache_entries[output_name] = (cache_key, cache_hash)
+        pending.append(job)
+    if not pending:
+        LOG_MODELS.info(f"[Batch] Tous les modèles sont à jour ({len(jobs)}).")
+        return
+    # Paquets assez gros pour amortir le coût d'envoi, assez petits pour équilibrer la charge
+    chunk_size = chunk_size or max(1, min(64, len(pending) // (CTX.workers * 4)))
+    chunks = [pending[i:i + chunk_size] for i in range(0, len(pending), chunk_size)]
+    LOG_MODELS.info(f"[Batch] Moteur processus : {len(pending)} modèles, {len(chunks)} paquets, {CTX.workers} workers")
+    progress = ThrottledProgress(LOG_MODELS, "[Batch] {done}/{total} modèles convertis...", len(pending))
+    done = 0
+    try:
+        with ProcessPoolExecutor(max_workers=CTX.workers, initializer=_init_process_worker,
+                                 initargs=(CTX.worker_config(),)) as executor:
+            future_to_chunk = {executor.submit(_convert_model_chunk, chunk): chunk for chunk in chunks}
+            emit_progress("models", 0, len(pending))
+            for future in as_completed(future_to_chunk):
+                if CTX.cancel_event.is_set():
+                    for other in future_to_chunk:
+                        other.cancel()
+                    raise ConversionCancelled()
+                chunk = future_to_chunk[future]
+                try:
+                    results = future.result()
+                except Exception as e:
+                    failed.extend(chunk)
+                    LOG_MODELS.error(f"[Batch] ❌ Paquet en échec ({len(chunk)} modèles): {e}")
+                    continue
+                for job, result in results:
+                    done += 1
+                    if result is not None and not result.get('success', False):
+                        failed.append(job)
+                        LOG_MODELS.warning(f"[Batch] ❌ Échec: {result.get('error', 'Erreur inconnue')} (job: {job})")
+                        continue
+                    output_name = _job_fields(job)[1]
+                    if result.get('geometry'):
+                        CTX.geometry_ids[output_name] = result['geometry']
+                    if result.get('outputs'):
+                        # Le compteur du worker est perdu avec son processus : on compte ici
+                        with _MODEL_CONVERSIONS_LOCK:
+                            CTX.model_conversions[output_name] += 1
+                        CTX.metrics.add("models.converted")
+                        if result.get('seconds') is not None:
+                            CTX.metrics.observe("models.latency_ms", result['seconds'] * 1000)
+                        entry = cache_entries.get(output_name)
+                        if entry and entry[0]:
+                            CTX.build_cache.record(entry[0], entry[1], result['outputs'], {"geometry": result.get('geometry')})
+                progress.step(len(results))
+                emit_progress("models", done, len(pending))
+    except ConversionCancelled:
+        raise
+    except Exception as e:
+        LOG_MODELS.error(f"[Batch] ❌ Exception globale dans le pool de processus: {e}", exc_info=True)
+        failed.extend(job for job in pending if job not in failed)
+
+def benchmark_model_engines(worker_counts=(1, 2, 4, 8, 16), engines=("thread", "process")):
+    """
+    Convertit tous les modèles du pack Java avec chaque moteur et chaque nombre de workers
+    (un contexte neuf par mesure : sortie dans un dossier temporaire, cache désactivé) et affiche
+    le temps et l'accélération.
+    """
+    model_index = build_model_index()
+    jobs = [(path, key.replace(':', '_').replace('/', '_'), key) for key, path in model_index.items()]
+    print(f"[Bench] {len(jobs)} modèles, {os.cpu_count()} cœurs disponibles")
+    base = current_context()
+    saved_level = LOGGER.level
+    rows = []
+    for engine in engines:
+        for count in worker_counts:
+            out_dir = tempfile.mkdtemp(prefix="bench_bedrock_")
+            ctx = ConversionContext(base.java_dir, out_dir, **dict(base.options(), workers=count))
+            # Les logs par modèle fausseraient la mesure
+            LOGGER.setLevel(logging.WARNING)
+            start = time.perf_counter()
+            try:
+                with ctx.activate():
+                    batch_convert_java_models_to_geo(jobs, engine=engine)
+            finally:
+                LOGGER.setLevel(saved_level)
+                ctx.close()
+            rows.append((engine, count, time.perf_counter() - start))
+            shutil.rmtree(out_dir, ignore_errors=True)
+    print(f"{'moteur':<8} {'workers':>7} {'temps (s)':>10} {'accélération':>13}")
+    for engine, count, elapsed in rows:
+        base = next(e for (en, c, e) in rows if en == engine)
+        print(f"{engine:<8} {count:>7} {elapsed:>10.2f} {base / elapsed:>12.2f}x")
+    return rows
+
+def benchmark_copy_modes(file_count=30000, modes=("userspace", "copy", "reflink", "link")):
+    """
+    Génère une arborescence de textures synthétique (file_count PNG de 1 à 8 Ko) dans un dossier
+    temporaire, puis la copie avec chaque mode de copie (COPY_CHAINS) et affiche le temps et la méthode utilisée.
+    """
+    import random
+    src_root = tempfile.mkdtemp(prefix="bench_textures_")
+    rng = random.Random(0)
+    jobs = []
+    for i in range(file_count):
+        rel = os.path.join(f"ns{i % 8}", "item", f"dir{i // 256}", f"texture_{i}.png")
+        path = os.path.join(src_root, rel)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'wb') as f:
+            f.write(b'\x89PNG\r\n\x1a\n' + os.urandom(rng.randint(1024, 8192)))
+        jobs.append((rel,))
+    print(f"[Bench] {file_count} textures, {CTX.workers} workers")
+    base = current_context()
+    saved_level = LOGGER.level
+    rows = []
+    try:
+        for mode in modes:
+            out_root = tempfile.mkdtemp(prefix="bench_copy_", dir=os.path.dirname(src_root))
+            _COPY_UNSUPPORTED.clear()
+            ctx = ConversionContext(**base.options())
+            def do_copy(rel):
+                dst = os.path.join(out_root, rel)
+                os.makedirs(os.path.dirname(dst), exist_ok=True)
+                fast_copy_file(os.path.join(src_root, rel), dst, mode)
+            # Vider le cache d'écriture du mode précédent pour ne pas fausser la mesure
+            if hasattr(os, "sync"):
+                os.sync()
+            LOGGER.setLevel(logging.WARNING)
+            start = time.perf_counter()
+            try:
+                with ctx.activate():
+                    run_parallel(do_copy, jobs)
+            finally:
+                LOGGER.setLevel(saved_level)
+            elapsed = time.perf_counter() - start
+            rows.append((mode, elapsed, ", ".join(f"{m}={c}" for m, c in ctx.copy_methods.most_common())))
+            shutil.rmtree(out_root, ignore_errors=True)
+    finally:
+        shutil.rmtree(src_root, ignore_errors=True)
+        _COPY_UNSUPPORTED.clear()
+    print(f"{'mode':<10} {'temps (s)':>10} {'fichiers/s':>11}  méthodes")
+    for mode, elapsed, methods in rows:
+        print(f"{mode:<10} {elapsed:>10.2f} {file_count / elapsed:>11.0f}  {methods}")
+    return rows
+
+# Démarrage à froid visé pour un processus qui importe le convertisseur (workers embarqués)
+IMPORT_TARGET_SECONDS = 0.25
+
+
+def benchmark_import(runs=5):
+    """
+    Lance runs processus Python qui importent ce module et compare le temps médian d'import
+    (interpréteur seul déduit) à IMPORT_TARGET_SECONDS. Indique aussi les dépendances lourdes
+    chargées par l'import, qui doivent rester absentes.
+    """
+    import statistics
+    module_dir, module_file = os.path.split(os.path.abspath(__file__))
+    module_name = os.path.splitext(module_file)[0]
+    check = ("import sys; sys.path.insert(0, %r); import %s; "
+             "print(','.join(m for m in ('tkinter', 'PIL', 'yaml', 'orjson') if m in sys.modules))") % (module_dir, module_name)
+
+    def measure(code):
+        timings, output = [], ""
+        for _ in range(runs):
+            start = time.perf_counter()
+            output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout.strip()
+            timings.append(time.perf_counter() - start)
+        return statistics.median(timings), output
+    interpreter, _ = measure("pass")
+    total, loaded = measure(check)
+    elapsed = total - interpreter
+    status = "OK" if elapsed < IMPORT_TARGET_SECONDS else "DÉPASSÉ"
+    print(f"[Bench] Interpréteur seul : {interpreter * 1000:.0f} ms, avec import : {total * 1000:.0f} ms")
+    print(f"[Bench] Import du convertisseur : {elapsed * 1000:.0f} ms (cible < {IMPORT_TARGET_SECONDS * 1000:.0f} ms) : {status}")
+    print(f"[Bench] Dépendances chargées à l'import : {loaded or 'aucune'}")
+    return elapsed
+
 # --- PATCH: Utilisation dans le pipeline principal ---
 # Exemple d'utilisation dans un pipeline (à adapter selon le flux principal du script)
 #
@@ -1433,11 +3957,320 @@ def _safe_convert_java_model_to_geo(job):
 #
 # (À placer dans run_conversion ou le pipeline principal, GUI et console)
 
-import sys
-if "--lang" in sys.argv:
-    idx = sys.argv.index("--lang")
-    if idx + 1 < len(sys.argv):
-        LANG = sys.argv[idx + 1]
+
+class CliUsageError(ValueError):
+    """
+    Option de ligne de commande absente de sa valeur ou invalide : le point d'entrée affiche le
+    message suivi de USAGE et quitte avec le code 2, sans rien convertir.
+    """
+
+
+def cli_option(argv, flag, choices=None, kind=str, minimum=None, maximum=None):
+    """
+    Valeur validée de flag dans argv, ou None si l'option est absente. kind convertit la valeur
+    (int, str.lower...), puis choices et [minimum, maximum] la bornent ; une valeur manquante ou
+    invalide lève CliUsageError plutôt que d'être ignorée (une faute de frappe en CI ne doit pas
+    changer silencieusement la conversion).
+    """
+    if flag not in argv:
+        return None
+    idx = argv.index(flag)
+    raw = argv[idx + 1] if idx + 1 < len(argv) else None
+    if raw is None or raw.startswith("--"):
+        raise CliUsageError(t("cli_missing_value", flag=flag))
+    if choices is not None:
+        expected = "|".join(choices)
+    elif minimum is not None and maximum is not None:
+        expected = f"{minimum}-{maximum}"
+    elif minimum is not None:
+        expected = f"N >= {minimum}"
+    else:
+        expected = "N" if kind is int else "?"
+    try:
+        value = kind(raw)
+    except ValueError:
+        raise CliUsageError(t("cli_invalid_value", flag=flag, value=raw, expected=expected)) from None
+    if ((choices is not None and value not in choices)
+            or (minimum is not None and value < minimum)
+            or (maximum is not None and value > maximum)):
+        raise CliUsageError(t("cli_invalid_value", flag=flag, value=raw, expected=expected))
+    return value
+
+
+def apply_cli_args(argv):
+    """
+    Applique les options de ligne de commande (--lang, --workers, --engine...). Appelé par le
+    point d'entrée : importer le module ne lit pas sys.argv. Toute valeur invalide lève
+    CliUsageError avant qu'une option ne soit appliquée à moitié.
+    """
+    global LANG
+    global LOG_LEVEL
+    global CACHE_DIR
+    # --lang d'abord : les messages d'erreur des options suivantes sont dans cette langue
+    LANG = cli_option(argv, "--lang", choices=tuple(TRANSLATIONS)) or LANG
+    options = {
+        "workers": cli_option(argv, "--workers", kind=int, minimum=1),
+        "engine": cli_option(argv, "--engine", choices=("thread", "process")),
+        "json_mode": cli_option(argv, "--json-mode", choices=("pretty", "compact")),
+        "png8_min_bytes": cli_option(argv, "--png8-min-size", kind=int, minimum=0),
+        "copy_mode": cli_option(argv, "--copy-mode", choices=tuple(COPY_CHAINS)),
+        "output_mode": cli_option(argv, "--output", choices=tuple(OUTPUT_SINKS)),
+        "zip_level": cli_option(argv, "--zip-level", kind=int, minimum=0, maximum=9),
+        "geyser_mapping": cli_option(argv, "--geyser-mapping", choices=("v1", "v2")),
+        "render_controllers": cli_option(argv, "--render-controllers", choices=("model", "custom", "none")),
+    }
+    log_level = cli_option(argv, "--log-level", choices=("debug", "info", "warning", "error"), kind=str.lower)
+    cache_dir = cli_option(argv, "--cache-dir")
+    # Tout est validé : on applique
+    for name, value in options.items():
+        if value is not None:
+            setattr(CTX, name, value)
+    # --full : ignore le cache incrémental et repart d'un dossier Bedrock vide
+    CTX.full_rebuild = "--full" in argv
+    if "--json-compare" in argv:
+        CTX.json_compare = True
+    if "--copy-all-textures" in argv:
+        CTX.texture_copy_mode = "all"
+    if "--png8" in argv:
+        CTX.texture_optimize = True
+    if log_level is not None:
+        LOG_LEVEL = log_level.upper()
+    if cache_dir is not None:
+        CACHE_DIR = os.path.abspath(cache_dir)
+
+
+def cli_value(argv, flag, default=None):
+    """
+    Valeur qui suit flag dans argv, ou default si l'option est absente.
+    """
+    if flag in argv:
+        idx = argv.index(flag)
+        if idx + 1 < len(argv) and not argv[idx + 1].startswith("--"):
+            return argv[idx + 1]
+    return default
+
+
+USAGE = """Usage :
+  PackConverter_JavaToBedrock.py                       interface graphique
+  PackConverter_JavaToBedrock.py --nogui [options]     conversion console
+  PackConverter_JavaToBedrock.py --batch <pack|glob>... [--batch-out DOSSIER] [--batch-jobs N] [options]
+
+Entrée / sortie (console) :
+  --input CHEMIN             pack Java, dossier ou .zip (défaut : $JAVA_RP_DIR)
+  --bedrock DOSSIER          dossier de travail Bedrock (défaut : $BEDROCK_RP_DIR, sinon en mémoire
+                             jusqu'à l'export, ou dossier temporaire bedrock_rp sans export)
+  --export folder|zip|mcpack format d'export (défaut : zip)
+  --export-dir DOSSIER       dossier d'export (sans lui : pas d'export, aucune question posée)
+  --export-name NOM          nom du pack exporté (défaut : nom du pack Java)
+  --no-export                pas d'export même avec --export-dir
+  --summary FICHIER|-        résumé JSON du run (durée de chaque étape...), - pour stdout
+  --metrics FICHIER          registre des mesures (timers, compteurs, histogrammes) en JSON
+
+Options de conversion (équivalents GUI) :
+  --lang fr|en                     langue des messages
+  --geyser-mapping v1|v2           format du mapping Geyser (défaut : v2)
+  --render-controllers model|custom|none
+  --json-mode pretty|compact       --json-compare
+  --copy-all-textures              --png8  --png8-min-size OCTETS
+
+Performance et cache :
+  --workers N  --engine thread|process  --copy-mode link|reflink|copy|userspace
+  --output folder|memory|archive  --zip-level 0-9  --cache-dir DOSSIER  --full
+  --log-level debug|info|warning|error
+  --bench-engine  --bench-copy [N]  --bench-import
+"""
+
+
+def conversion_steps():
+    """
+    Étapes de conversion, dans l'ordre, communes à la GUI et au mode console (--nogui).
+    """
+    return [
+        # Sans cache incrémental (GUI), chaque conversion repart d'un dossier vide
+        ("Nettoyage", lambda items: clean_bedrock_directory() if CTX.full_rebuild else None),
+        ("Structure Bedrock", lambda items: create_bedrock_structure()),
+        ("Sons", lambda items: copy_sounds()),
+        ("Icône du pack", lambda items: copy_pack_icon()),
+        # Extraction = planification uniquement (aucune conversion)
+        ("Extraction des items", lambda items: extract_custom_model_data()),
+        # Conversion des modèles en parallèle, une seule fois par modèle
+        ("Conversion des modèles", convert_planned_models),
+        ("Copie des textures", copy_referenced_textures),
+        ("Optimisation PNG8", optimize_copied_textures),
+        ("custom_items.json", generate_custom_items_json),
+        ("Mapping Geyser", lambda items: generate_geyser_mapping_json(items, CTX.geyser_mapping)),
+        ("Validation des géométries", lambda items: validate_geo_json_files(os.path.join(CTX.bedrock_dir, "models", "entity"))),
+        ("Cohérence", validate_consistency),
+        ("Attachables", generate_attachables),
+        ("item_texture.json", lambda items: generate_item_texture_json(items, os.path.join(CTX.bedrock_dir, "textures"))),
+        ("Render controllers", apply_render_controller_mode),
+    ]
+
+
+def convert_pack(context=None):
+    """
+    Conversion console complète dans context (contexte actif par défaut) : sink de sortie, cache
+    incrémental, pipeline, fichiers de langue et résumés. Renvoie les items convertis. Plusieurs
+    conversions peuvent tourner en même temps (un thread et un ConversionContext chacune).
+    """
+    if context is not None:
+        with context.activate():
+            return convert_pack()
+    CTX.sink = open_output_sink(CTX.output_mode, CTX.bedrock_dir)
+    # Le cache incrémental n'a de sens que pour un dossier de sortie persistant
+    if CTX.sink.persistent:
+        CTX.build_cache = BuildCache(cache_manifest_path(), full=CTX.full_rebuild)
+    items = run_pipeline(conversion_steps())
+    print_model_conversion_summary()
+    # --- Génération des fichiers de langue Bedrock ---
+    lang_dict = {hash7(item['name']): item['name'] for item in items}
+    write_lang_files(lang_dict, os.path.join(CTX.bedrock_dir, "texts"))
+    print_json_write_summary()
+    CTX.build_cache.finalize()
+    print_metrics_summary()
+    return items
+
+
+def run_summary(status, seconds, error=None, export_path=None):
+    """
+    Résumé machine du run sur le contexte actif (--summary) : statut, chemins, options, durée
+    de chaque étape du pipeline, compteurs principaux et registre complet des mesures.
+    """
+    metrics = CTX.metrics_snapshot()
+    return {
+        "status": status,
+        "error": error,
+        "input": CTX.java_dir,
+        "output": CTX.bedrock_dir,
+        "export": export_path,
+        "seconds": round(seconds, 3),
+        "options": CTX.options(),
+        "stages": metrics["stages"],
+        "models": {"conversions": sum(CTX.model_conversions.values()), "failed": len(CTX.failed_models),
+                   "geometries": len(set(CTX.geometry_ids.values())),
+                   "cache_hits": CTX.resolved_models.hits, "cache_misses": CTX.resolved_models.misses},
+        "json": dict(CTX.json_write_stats),
+        "metrics": metrics,
+    }
+
+
+def write_run_summary(path, summary):
+    # Résumé ou mesures en JSON ; "-" : sur la sortie standard (les logs passent alors sur stderr)
+    text = json.dumps(summary, indent=2, ensure_ascii=False)
+    if path == "-":
+        sys.stdout.write(text + "\n")
+        sys.stdout.flush()
+        return
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(text + "\n")
+
+
+# --- Mode batch : plusieurs packs Java dans une seule exécution ---
+# Un contexte par pack, jusqu'à `jobs` packs convertis en même temps. Tous partagent le même pool
+# de threads (CTX.workers) et le cache des modèles vanilla ; l'import, la vérification des
+# dépendances et le démarrage de l'interpréteur ne sont payés qu'une fois.
+BATCH_REPORT_FILE = "batch_report.json"
+
+
+def expand_pack_paths(patterns):
+    """
+    Dossiers et .zip désignés par patterns (chemins ou motifs glob), sans doublons, dans l'ordre.
+    """
+    packs = []
+    for pattern in patterns:
+        matches = sorted(glob.glob(pattern)) if any(c in pattern for c in '*?[') else [pattern]
+        matches = [os.path.abspath(path) for path in matches
+                   if os.path.isdir(path) or (os.path.isfile(path) and path.lower().endswith('.zip'))]
+        if not matches:
+            LOG_PIPELINE.warning(f"[Batch] ⚠️ Aucun pack (dossier ou .zip) pour : {pattern}")
+        packs.extend(path for path in matches if path not in packs)
+    return packs
+
+
+def _batch_targets(packs, output_dir):
+    # Nom de sortie de chaque pack : nom du dossier ou du .zip, suffixé en cas de collision
+    targets, used = [], set()
+    for java_dir in packs:
+        name = os.path.basename(java_dir.rstrip("/\\"))
+        if name.lower().endswith('.zip'):
+            name = name[:-4]
+        unique, n = name, 2
+        while unique in used:
+            unique, n = f"{name}_{n}", n + 1
+        used.add(unique)
+        targets.append((java_dir, unique, os.path.join(output_dir, unique)))
+    return targets
+
+
+def convert_packs(packs, output_dir, jobs=None, base=None):
+    """
+    Convertit chaque pack de packs (dossiers ou .zip) dans output_dir/<nom>/, ou dans
+    output_dir/<nom>.zip pour une sortie mémoire/archive, avec les options du contexte base
+    (contexte actif par défaut). Écrit output_dir/batch_report.json (statut, items, modèles en
+    échec et temps par pack) et renvoie la liste des entrées du rapport.
+    """
+    base = base or current_context()
+    os.makedirs(output_dir, exist_ok=True)
+    targets = _batch_targets(packs, output_dir)
+    jobs = max(1, min(jobs or 4, len(targets) or 1))
+    shared_models = LRUCache(int(os.environ.get("PACKCONVERTER_MODEL_CACHE_SIZE", "4096")))
+    LOG_PIPELINE.info(f"[Batch] {len(targets)} packs, {jobs} en parallèle, {base.workers} workers partagés")
+    start = time.time()
+
+    def convert_one(java_dir, name, bedrock_dir):
+        pack_start = time.time()
+        entry = {"pack": java_dir, "name": name, "output": bedrock_dir, "status": "ok",
+                 "items": 0, "models_failed": 0, "seconds": 0.0, "error": None}
+        ctx = None
+        try:
+            ctx = ConversionContext(java_dir, bedrock_dir, **base.options())
+            ctx.executor, ctx.shared_models, ctx.cancel_event = executor, shared_models, base.cancel_event
+            LOG_PIPELINE.info(f"[Batch] Début : {name}")
+            items = convert_pack(ctx)
+            if not ctx.sink.persistent:
+                entry["output"] = ctx.sink.export_archive(bedrock_dir.rstrip("/\\") + ".zip")
+            entry.update(items=len(items), models_failed=len(ctx.failed_models), metrics=ctx.metrics_snapshot())
+            if ctx.failed_models:
+                entry["status"] = "partial"
+        except ConversionCancelled:
+            entry["status"] = "cancelled"
+        except Exception as e:
+            entry.update(status="failed", error=str(e))
+            LOG_PIPELINE.error(f"[Batch] ❌ {name} : {e}", exc_info=LOGGER.isEnabledFor(logging.DEBUG))
+        finally:
+            if ctx is not None:
+                ctx.close()
+        entry["seconds"] = round(time.time() - pack_start, 2)
+        LOG_PIPELINE.info(f"[Batch] Fin : {name} ({entry['status']}, {entry['seconds']}s)")
+        return entry
+
+    # Les threads par pack restent hors du pool partagé : ils attendent des tâches qu'il exécute
+    with ThreadPoolExecutor(max_workers=base.workers) as executor:
+        with ThreadPoolExecutor(max_workers=jobs) as pack_pool:
+            report = list(pack_pool.map(lambda target: convert_one(*target), targets))
+    elapsed = round(time.time() - start, 2)
+    with open(os.path.join(output_dir, BATCH_REPORT_FILE), 'w', encoding='utf-8') as f:
+        json.dump({"seconds": elapsed, "jobs": jobs, "workers": base.workers,
+                   "shared_models": {"hits": shared_models.hits, "misses": shared_models.misses},
+                   "packs": report}, f, indent=2, ensure_ascii=False)
+    print_batch_report(report, elapsed, shared_models)
+    return report
+
+
+def print_batch_report(report, elapsed, shared_models=None):
+    width = max([len(entry["name"]) for entry in report] + [4])
+    LOG_PIPELINE.info(f"[Batch] {'pack':<{width}} {'statut':<9} {'items':>6} {'échecs':>6} {'temps (s)':>9}")
+    for entry in report:
+        LOG_PIPELINE.info(f"[Batch] {entry['name']:<{width}} {entry['status']:<9} {entry['items']:>6} "
+                          f"{entry['models_failed']:>6} {entry['seconds']:>9.2f}")
+        if entry["error"]:
+            LOG_PIPELINE.info(f"[Batch]   {entry['error']}")
+    failed = sum(1 for entry in report if entry["status"] != "ok")
+    LOG_PIPELINE.info(f"[Batch] {len(report)} packs en {elapsed}s, {failed} en échec ou incomplets")
+    if shared_models is not None:
+        LOG_PIPELINE.info(f"[Batch] Modèles partagés entre packs : {shared_models.hits} réutilisés, {shared_models.misses} parsés")
+
 
 CONFIG_FILE = os.path.join(os.path.dirname(__file__), 'packconverter_config.json')
 
@@ -1456,82 +4289,37 @@ def save_last_java_dir(path):
     except Exception:
         pass
 
-class PackConverterGUI:
+def _import_tk():
+    """
+    Tkinter n'est importé qu'à l'ouverture de la GUI (absent des workers et de l'usage en bibliothèque).
+    """
+    global tk, ttk, filedialog, messagebox, scrolledtext
+    import tkinter as tk
+    from tkinter import ttk, filedialog, messagebox, scrolledtext
 
-    def generate_item_texture_json(self, items, textures_dir):
-        """
-        Génère item_texture.json au format attendu :
-        "texture_data": {
-            "gmdl_xxx": { "textures": "textures/minecraft/item/cactus/bow_1" }, ...
-        }
-        "gmdl_xxx" = nom du modèle (item['name'] ou item['model'] ou item['id'] selon structure)
-        "textures" = chemin complet sans extension .png
-        """
-        texture_data = {}
-        for item in items:
-            # La clé doit être le nom du modèle Bedrock (ex: copper_ingot_cmd10001), sans namespace ni custom:
-            # On extrait à partir de item['name'] ou item['id'] (ex: "custom:copper_ingot_cmd10001" -> "copper_ingot_cmd10001")
-            raw_name = item.get('name') or item.get('id') or item.get('model')
-            if not raw_name:
-                continue
-            # Retire le namespace ou le préfixe custom:
-            if ':' in raw_name:
-                model_name = raw_name.split(':', 1)[1]
-            else:
-                model_name = raw_name
-            model_name = os.path.splitext(os.path.basename(str(model_name)))[0]
-
-            # Recherche le chemin de la texture (ex: textures/minecraft/item/cactus/bow_1)
-            tex_path = None
-            if 'texture' in item:
-                tex = item['texture']
-                # Nettoyage du chemin :
-                # 1. Si "textures/" déjà présent, on retire "minecraft/item/" et remplace les : par /
-                if tex.startswith('textures/'):
-                    tex_path = tex.replace('minecraft/item/', '').replace(':', '/').replace('.png','')
-                # 2. Si "minecraft:" présent, on retire le préfixe et remplace : par /
-                elif tex.startswith('minecraft:'):
-                    tex_path = 'textures/' + tex.split(':',1)[1].replace(':', '/').replace('.png','')
-                # 3. Si "namespace:..." (autre que minecraft), on remplace : par /
-                elif ':' in tex:
-                    tex_path = 'textures/' + tex.replace(':', '/').replace('.png','')
-                else:
-                    tex_path = f'textures/{tex}'.replace('.png','')
-            else:
-                tex_path = f'textures/{model_name}'
 
-            abs_tex_path = os.path.join(BEDROCK_RP_DIR, *tex_path.split('/')) + '.png'
-            texture_data[model_name] = {"textures": tex_path}
+class GuiLogHandler(logging.Handler):
+    """
+    Handler logging qui transmet les messages à la zone de logs (bufferisée) de la GUI.
+    """
+    def __init__(self, gui):
+        super().__init__()
+        self.gui = gui
+
+    def emit(self, record):
+        try:
+            self.gui.log(self.format(record))
+        except Exception:
+            self.handleError(record)
 
-        item_texture = {
-            "resource_pack_name": "custom_items",
-            "texture_name": "atlas.items",
-            "texture_data": texture_data
-        }
-        os.makedirs(textures_dir, exist_ok=True)
-        out_path = os.path.join(textures_dir, "item_texture.json")
-        with open(out_path, 'w', encoding='utf-8') as f:
-            json.dump(item_texture, f, indent=2)
-        if hasattr(self, 'log'):
-            self.log(t("item_texture_generated") if 'item_texture_generated' in globals() else f"item_texture.json generated: {out_path}")
-        else:
-            print(f"item_texture.json generated: {out_path}")
 
-        # Ajout : Génération d'un fichier terrain_texture.json vide (structure Geyser)
-        terrain_texture = {
-            "resource_pack_name": "geyser_custom",
-            "texture_name": "atlas.terrain",
-            "texture_data": {}
-        }
-        terrain_path = os.path.join(textures_dir, "terrain_texture.json")
-        with open(terrain_path, 'w', encoding='utf-8') as f:
-            json.dump(terrain_texture, f, indent=2)
-        if hasattr(self, 'log'):
-            self.log(f"terrain_texture.json generated: {terrain_path}")
-        else:
-            print(f"terrain_texture.json generated: {terrain_path}")
+class PackConverterGUI:
+    LOG_FLUSH_MS = 50  # cadence de rafraîchissement de la zone de logs
+    LOG_MAX_LINES = 2000  # lignes conservées dans le widget
+
 
     def __init__(self, root):
+        _import_tk()
         self.root = root
         self.root.title("PackConverter Java ➔ Bedrock")
         self.root.geometry("850x600")
@@ -1548,7 +4336,7 @@ class PackConverterGUI:
 
         # Variables
         last_java_dir = load_last_java_dir()
-        self.java_dir = tk.StringVar(value=last_java_dir if last_java_dir else JAVA_RP_DIR)
+        self.java_dir = tk.StringVar(value=last_java_dir if last_java_dir else CTX.java_dir)
         self.bedrock_dir = tk.StringVar(value="")  # Ajouté pour éviter l'erreur d'attribut
 
         # --- Export format option ---
@@ -1577,6 +4365,18 @@ class PackConverterGUI:
         self.geyser_v2_radio.pack(side="left")
         # --- End Geyser mapping format option ---
 
+        # --- JSON output format option ---
+        self.json_mode_var = tk.StringVar(value=CTX.json_mode)
+        json_frame = tk.Frame(root)
+        json_frame.pack(anchor="ne", padx=10, pady=(0, 0))
+        self.json_label = tk.Label(json_frame, text=t("json_output_format"), font=("Segoe UI", 10))
+        self.json_label.pack(side="left")
+        self.json_pretty_radio = tk.Radiobutton(json_frame, text=t("json_pretty"), variable=self.json_mode_var, value="pretty")
+        self.json_pretty_radio.pack(side="left")
+        self.json_compact_radio = tk.Radiobutton(json_frame, text=t("json_compact"), variable=self.json_mode_var, value="compact")
+        self.json_compact_radio.pack(side="left")
+        # --- End JSON output format option ---
+
         # --- Render Controller option ---
         self.use_custom_render_controller = tk.BooleanVar(value=False)
         rc_frame = tk.Frame(root)
@@ -1585,6 +4385,15 @@ class PackConverterGUI:
         self.rc_checkbox.pack(side="left")
         # --- End Render Controller option ---
 
+        # --- Texture copy option ---
+        self.copy_all_textures_var = tk.BooleanVar(value=CTX.texture_copy_mode == "all")
+        self.copy_all_textures_checkbox = tk.Checkbutton(rc_frame, text=t("copy_all_textures"), variable=self.copy_all_textures_var)
+        self.copy_all_textures_checkbox.pack(side="left")
+        self.png8_var = tk.BooleanVar(value=CTX.texture_optimize)
+        self.png8_checkbox = tk.Checkbutton(rc_frame, text=t("optimize_png8"), variable=self.png8_var)
+        self.png8_checkbox.pack(side="left")
+        # --- End texture copy option ---
+
         # Modern Card-like Frame
         self.main_card = tk.Frame(root, bg="#f4f4f4", bd=2, relief="groove")
         self.main_card.pack(fill="x", padx=20, pady=(20, 5))
@@ -1604,6 +4413,9 @@ class PackConverterGUI:
         self.convert_btn = tk.Button(self.main_card, text=t("start_conversion"), command=self.run_conversion,
                                      bg="#4CAF50", fg="white", font=("Segoe UI", 12, "bold"), height=2)
         self.convert_btn.pack(fill="x", padx=10, pady=(10, 2))
+        self.cancel_btn = tk.Button(self.main_card, text=t("cancel"), command=self.cancel_conversion,
+                                    state="disabled", font=("Segoe UI", 10), bg="#e0e0e0")
+        self.cancel_btn.pack(fill="x", padx=10, pady=(0, 2))
 
         # Info label for disabled state
         self.info_label = tk.Label(self.main_card, text="", font=("Segoe UI", 9), fg="#b22222", bg="#f4f4f4")
@@ -1622,6 +4434,8 @@ class PackConverterGUI:
         self.progress.pack(fill="x", padx=10, pady=(5, 5))
         self.progress["value"] = 0
         self.progress["maximum"] = 100  
+        self.status_label = tk.Label(self.logs_card, text="", font=("Segoe UI", 9), bg="#f4f4f4", anchor="w")
+        self.status_label.pack(fill="x", padx=10)
         self.logbox = scrolledtext.ScrolledText(self.logs_card, height=10, state="disabled", font=("Consolas", 10), bg="#fafafa")
         self.logbox.pack(fill="both", expand=True, padx=10, pady=(0, 10))
 
@@ -1629,7 +4443,17 @@ class PackConverterGUI:
         self.java_dir.trace_add("write", lambda *args: self.validate_paths())
         self.validate_paths()
 
-        self.last_logs = ""  # Ajout pour stocker les dernières logs
+        # Logs bufferisés : file d'attente vidée par after() à cadence fixe, fenêtre limitée
+        # à LOG_MAX_LINES lignes, historique complet écrit au fil de l'eau sur disque
+        self.log_queue = queue.Queue()
+        self._log_lock = threading.Lock()
+        self._log_file = tempfile.TemporaryFile("w+", encoding="utf-8")
+        self._last_log_flush = 0.0
+        self.root.after(self.LOG_FLUSH_MS, self._poll_logs)
+        # Événements du thread de conversion (progression, fin, annulation, erreur)
+        self.event_queue = queue.Queue()
+        self._pipeline_step = 0
+        self.root.after(self.LOG_FLUSH_MS, self._poll_events)
 
     def validate_paths(self):
         path = self.java_dir.get()
@@ -1683,21 +4507,61 @@ class PackConverterGUI:
             self.bedrock_dir.set(path)
 
     def clear_logs(self):
-        self.last_logs = ""
+        with self._log_lock:
+            while not self.log_queue.empty():
+                self.log_queue.get_nowait()
+            self._log_file.seek(0)
+            self._log_file.truncate()
         self.logbox.config(state="normal")
         self.logbox.delete("1.0", "end")
         self.logbox.config(state="disabled")
 
     def log(self, msg):
         now = datetime.datetime.now().strftime("[%H:%M:%S] ")
+        lines = [now + line + "\n" for line in msg.splitlines()]
+        if not lines:
+            return
+        with self._log_lock:
+            self._log_file.writelines(lines)
+        self.log_queue.put("".join(lines))
+        # Depuis le thread Tk, rafraîchit l'affichage au plus LOG_FLUSH_MS ms
+        # pour garder la fenêtre réactive sans repeindre à chaque ligne
+        if threading.current_thread() is threading.main_thread():
+            now_ts = time.perf_counter()
+            if (now_ts - self._last_log_flush) * 1000 >= self.LOG_FLUSH_MS:
+                self._flush_logs()
+                self.root.update()
+                self._last_log_flush = time.perf_counter()
+
+    def _flush_logs(self):
+        chunks = []
+        try:
+            while True:
+                chunks.append(self.log_queue.get_nowait())
+        except queue.Empty:
+            pass
+        if not chunks:
+            return
         self.logbox.config(state="normal")
-        for line in msg.splitlines():
-            log_line = now + line + "\n"
-            self.logbox.insert("end", log_line)
-            self.last_logs += log_line
+        self.logbox.insert("end", "".join(chunks))
+        # Ne garde que les dernières lignes dans le widget (le fichier de logs a tout)
+        line_count = int(self.logbox.index("end-1c").split(".")[0])
+        if line_count > self.LOG_MAX_LINES:
+            self.logbox.delete("1.0", f"{line_count - self.LOG_MAX_LINES + 1}.0")
         self.logbox.see("end")
         self.logbox.config(state="disabled")
-        self.root.update()
+
+    def _poll_logs(self):
+        self._flush_logs()
+        self.root.after(self.LOG_FLUSH_MS, self._poll_logs)
+
+    def save_logs(self, path):
+        self._flush_logs()
+        with self._log_lock:
+            self._log_file.seek(0)
+            with open(path, "w", encoding="utf-8") as f:
+                shutil.copyfileobj(self._log_file, f)
+            self._log_file.seek(0, os.SEEK_END)
 
     def set_progress(self, value, maximum=None):
         if maximum is not None:
@@ -1706,250 +4570,139 @@ class PackConverterGUI:
         self.root.update_idletasks()
 
     def run_conversion(self):
-        import sys
-        import io
         import tempfile
-        import zipfile
 
-        # Redirige stdout/stderr vers la logbox
-        class TextRedirector(io.StringIO):
-            def __init__(self, gui):
-                super().__init__()
-                self.gui = gui
+        # Les logs de toutes les étapes arrivent dans la logbox
+        setup_logging(handler=GuiLogHandler(self))
 
-            def write(self, s: str) -> int:
-                self.gui.log(s.rstrip())
-                return len(s.encode('utf-8'))
+        self.convert_btn.config(state="disabled")
+        try:
+            # Un contexte neuf par conversion : caches et statistiques repartent de zéro,
+            # les options CLI/environnement sont reprises du contexte précédent
+            previous = current_context()
+            java_dir_value = self.java_dir.get()
+            bedrock_dir_value = self.bedrock_dir.get()
+            sink_kind = "folder"
+            if not bedrock_dir_value:
+                # Sans dossier Bedrock choisi, rien n'est écrit sur disque avant l'export :
+                # zip/mcpack sont compressés au fil de la conversion, l'export dossier part de la mémoire
+                bedrock_dir_value = os.path.join(tempfile.gettempdir(), "bedrock_rp")
+                sink_kind = "archive" if self.export_format_var.get() in ("zip", "mcpack") else "memory"
+            if not bedrock_dir_value.endswith(os.sep):
+                bedrock_dir_value += os.sep
+            # Les options Tk sont lues ici : le thread de conversion ne touche pas aux widgets.
+            # Sans cache incrémental, la GUI reconstruit tout (full_rebuild) à chaque conversion.
+            ctx = ConversionContext(**dict(previous.options(),
+                                           json_mode=self.json_mode_var.get(),
+                                           texture_copy_mode="all" if self.copy_all_textures_var.get() else "referenced",
+                                           texture_optimize=self.png8_var.get(),
+                                           geyser_mapping=self.geyser_mapping_var.get(),
+                                           render_controllers="custom" if self.use_custom_render_controller.get() else "none",
+                                           full_rebuild=True))
+            ctx.java_dir, ctx.bedrock_dir = java_dir_value, bedrock_dir_value
+            ctx.sink = open_output_sink(sink_kind, ctx.bedrock_dir)
+            # Lecture directe du pack (dossier ou ZIP, sans extraction)
+            ctx.pack = open_java_pack(ctx.java_dir)
+            previous.close()
+            set_default_context(ctx)
+        except Exception as e:
+            self.log(t("error", e=str(e)))
+            messagebox.showerror(t("error_title"), t("conversion_error", e=str(e)))
+            self.convert_btn.config(state="normal")
+            return
 
-            def flush(self) -> None:
-                pass
+        CTX.cancel_event.clear()
+        self.set_progress(0, 1)
+        self.cancel_btn.config(state="normal")
+        self._progress_listener = subscribe_progress(lambda event: self.event_queue.put(("progress", event)))
+        self.worker = threading.Thread(target=self._conversion_worker, daemon=True)
+        self.worker.start()
 
-        sys.stdout = TextRedirector(self)
-        sys.stderr = TextRedirector(self)
+    def cancel_conversion(self):
+        CTX.cancel_event.set()
+        self.cancel_btn.config(state="disabled")
+        self.log(t("cancel_requested"))
 
-        self.convert_btn.config(state="disabled")
+    def _conversion_worker(self):
+        """
+        Exécute la conversion hors du thread Tk ; la fin est signalée par un événement
+        ("done", "cancelled" ou "error") dans event_queue.
+        """
         start_time = time.time()
         try:
-            # Met à jour les variables globales
-            global JAVA_RP_DIR, BEDROCK_RP_DIR
-            JAVA_RP_DIR = self.java_dir.get()
-            bedrock_dir_value = self.bedrock_dir.get()
-            if not bedrock_dir_value:
-                bedrock_dir_value = tempfile.mkdtemp(prefix="bedrock_rp_")
-            BEDROCK_RP_DIR = bedrock_dir_value
-            if not BEDROCK_RP_DIR.endswith(os.sep):
-                BEDROCK_RP_DIR += os.sep
-
-            # Ajout : décompression du zip si besoin
-            temp_unzip_dir = None
-            if JAVA_RP_DIR.lower().endswith('.zip') and os.path.isfile(JAVA_RP_DIR):
-                temp_unzip_dir = tempfile.mkdtemp(prefix="javarp_unzip_")
-                with zipfile.ZipFile(JAVA_RP_DIR, 'r') as zip_ref:
-                    zip_ref.extractall(temp_unzip_dir)
-                JAVA_RP_DIR = temp_unzip_dir + os.sep
-
-            geyser_mapping_format = self.geyser_mapping_var.get()
-            # Barre de progression et étapes
-            steps = [
-                lambda items=None: clean_bedrock_directory(),
-                lambda items=None: create_bedrock_structure(),
-                lambda items=None: copy_all_item_textures(),
-                lambda items=None: copy_sounds(),
-                lambda items=None: copy_pack_icon(),
-                lambda items=None: extract_custom_model_data(),
-                lambda items=None: copy_all_item_textures(),
-                lambda items: generate_custom_items_json(items),
-                lambda items: generate_geyser_mapping_json(items, geyser_mapping_format),
-                lambda items=None: validate_geo_json_files(os.path.join(BEDROCK_RP_DIR, "models", "entity")),
-                lambda items: validate_consistency(items)
-            ]
-            self.set_progress(0, len(steps))
-            items = []
-            for i, step in enumerate(steps):
-                self.log("-" * 40 + f"  {t('step') if 'step' in TRANSLATIONS[LANG] else 'step'} {i+1}/{len(steps)}  " + "-" * 40)
-                # Always call step with items, and update items if step returns a non-None value
-                result = step(items)
-                if result is not None:
-                    items = result
-                self.set_progress(i + 1)
-                self.progress.update_idletasks()
-
-            # Extraction des items custom
-            items = extract_custom_model_data()
-            # Indexation des modèles pour accélérer la recherche
-            model_index = build_model_index()
-            # Conversion avancée pour chaque item (geometry, animation, attachable, PNG8, lang) EN PARALLÈLE
-            model_jobs = []
-            lang_dict = {}
-            for item in items:
-                texture_key = item['texture']
-                output_name = item['name'].split(":")[-1]
-                # Recherche directe dans l'index (avec ou sans namespace explicite)
-                model_path = model_index.get(texture_key) or model_index.get(f"minecraft:{texture_key}")
-                if model_path:
-                    model_jobs.append((model_path, output_name, texture_key))
-                lang_dict[hash7(item['name'])] = item['name']
-            # --- PATCH: Conversion des modèles en parallèle ---
-            batch_convert_java_models_to_geo(model_jobs)
+            # Mêmes étapes que le mode console (render controllers selon la case à cocher)
+            items = run_pipeline(conversion_steps())
+            check_cancelled()
+
+            # Les modèles ont été convertis une seule fois à l'étape dédiée
+            print_model_conversion_summary()
+            lang_dict = {hash7(item['name']): item['name'] for item in items}
             # Génération des fichiers de langue Bedrock
-            write_lang_files(lang_dict, os.path.join(BEDROCK_RP_DIR, "texts"))
-
-            # --- Création des render controllers uniquement si activé ---
-            if self.use_custom_render_controller.get():
-                rc_dir = os.path.join(BEDROCK_RP_DIR, "render_controllers")
-                os.makedirs(rc_dir, exist_ok=True)
-                # Génération des fichiers render_controller.json pour chaque item
-                for item in items:
-                    output_name = item['name'].split(":")[-1]
-                    rc_path = os.path.join(rc_dir, f"{output_name}.render_controller.json")
-                    rc_data = {
-                        "format_version": "1.10.0",
-                        "render_controllers": {
-                            f"controller.render.{output_name}": {
-                                "geometry": f"geometry.{output_name}",
-                                "materials": ["material.default"],
-                                "textures": [output_name]
-                            }
-                        }
-                    }
-                    with open(rc_path, 'w', encoding='utf-8') as f:
-                        json.dump(rc_data, f, indent=4)
-
-            # --- Génération des fichiers attachable pour chaque item custom ---
-            attachable_dir = os.path.join(BEDROCK_RP_DIR, "attachables")
-            os.makedirs(attachable_dir, exist_ok=True)
-            def _generate_attachable_json_full(
-                output_name, texture_key, geometry, out_dir, identifier, 
-                generated=False, atlas_index=None, attachable_material="material.default", 
-                path_hash=None, namespace=None, model_path=None, model_name=None
-            ):
-                # Détermination du namespace et du vrai nom (sans prefix)
-                if ':' in output_name:
-                    ns, base_name = output_name.split(':', 1)
-                else:
-                    ns = namespace or "custom"
-                    base_name = output_name
-
-                # La geometry et les animations utilisent toujours le nom SANS namespace
-                geometry_name = base_name
-                anim_prefix = f"animation.{geometry_name}"
-
-                # Chemin texture
-                def compute_tex_path(item_name, texture_key):
-                    if not texture_key:
-                        return f"textures/{item_name}"
-                    tex = texture_key
-                    if tex.startswith('textures/'):
-                        tex = tex[len('textures/'):]
-                        return f"textures/{tex.replace('minecraft/item/', '').replace(':', '/').replace('.png','')}"
-                    elif tex.startswith('minecraft:'):
-                        return 'textures/' + tex.split(':',1)[1].replace(':', '/').replace('.png','')
-                    elif ':' in tex:
-                        return 'textures/' + tex.replace(':', '/').replace('.png','')
-                    else:
-                        return f'textures/{tex}'.replace('.png','')
-
-                tex_path = compute_tex_path(base_name, texture_key)
-
-                # Scripts logic
-                v_main = "v.main_hand = c.item_slot == 'main_hand';"
-                v_off = "v.off_hand = c.item_slot == 'off_hand';"
-                v_head = "v.head = c.item_slot == 'head';"
-
-                # Déduire le matériel à partir du nom de la geometry (avant _cmd ou .)
-                mat_base = geometry_name.split('_cmd')[0].split('.')[0]
-                attachable = {
-                    "format_version": "1.16.100",
-                    "minecraft:attachable": {
-                        "description": {
-                            "identifier": f"{ns}:{base_name}",
-                            "materials": {
-                                "default": mat_base,
-                                "enchanted": "entity_alphatest_glint"
-                            },
-                            "textures": {
-                                "default": f"{tex_path.lstrip('/')}",
-                                "enchanted": "textures/misc/enchanted_item_glint"
-                            },
-                            "geometry": {
-                                "default": f"geometry.{geometry_name}"
-                            },
-                            "scripts": {
-                                "pre_animation": [v_main, v_off, v_head],
-                                "animate": [
-                                    {"third_person_main_hand": "v.main_hand && !c.is_first_person"},
-                                    {"third_person_off_hand": "v.off_hand && !c.is_first_person"},
-                                    {"third_person_head": "v.head && !c.is_first_person"},
-                                    {"first_person_main_hand": "v.main_hand && c.is_first_person"},
-                                    {"first_person_off_hand": "v.off_hand && c.is_first_person"},
-                                    {"first_person_head": "c.is_first_person && v.head"}
-                                ]
-                            },
-                            "animations": {
-                                "third_person_main_hand": f"{anim_prefix}.third_person_main_hand",
-                                "third_person_off_hand": f"{anim_prefix}.third_person_off_hand",
-                                "third_person_head": f"{anim_prefix}.head",
-                                "first_person_main_hand": f"{anim_prefix}.first_person_main_hand",
-                                "first_person_off_hand": f"{anim_prefix}.first_person_off_hand",
-                                "first_person_head": "animation.disable"
-                            },
-                            "render_controllers": ["controller.render.item_default"]
-                        }
-                    }
-                }
+            write_lang_files(lang_dict, os.path.join(CTX.bedrock_dir, "texts"))
 
-                out_path = os.path.join(out_dir, f"{base_name}.attachable.json")
-                with open(out_path, 'w', encoding='utf-8') as f:
-                    json.dump(attachable, f, indent=4)
-                print(t("attachable_generated", out_path=out_path))
-            for item in items:
-                output_name = item['name'].split(":")[-1]
-                texture_key = item['texture']
-                geometry = output_name
-                # Utilise le namespace correct pour l'identifier
-                if ':' in item['name']:
-                    ns, _ = item['name'].split(':', 1)
-                    identifier = f"{ns}:{output_name}"
-                    namespace = ns
-                else:
-                    identifier = f"custom:{output_name}"
-                    namespace = 'custom'
-                # Gather extra info for attachable
-                generated = item.get('generated', False)
-                atlas_index = item.get('atlas_index')
-                attachable_material = item.get('attachable_material', 'material.default')
-                path_hash = hash7(output_name)
-                model_path = os.path.dirname(texture_key.split(':', 1)[1]) if ':' in texture_key else ''
-                model_name = os.path.basename(texture_key.split(':', 1)[1]) if ':' in texture_key else texture_key
-                _generate_attachable_json_full(
-                    output_name, texture_key, geometry, attachable_dir, identifier,
-                    generated=generated, atlas_index=atlas_index, attachable_material=attachable_material,
-                    path_hash=path_hash, namespace=namespace, model_path=model_path, model_name=model_name
-                )
-
-            # Génération du fichier item_texture.json dans textures/
-            self.generate_item_texture_json(items, os.path.join(BEDROCK_RP_DIR, "textures"))
+            print_json_write_summary()
+            print_metrics_summary()
 
             # Affiche le temps de conversion AVANT l'étape d'export utilisateur
             elapsed = time.time() - start_time
             self.log(f"Conversion terminée en {elapsed:.2f} secondes (hors export).")
+            self.event_queue.put(("done", None))
+        except ConversionCancelled:
+            self.event_queue.put(("cancelled", None))
+        except Exception as e:
+            self.event_queue.put(("error", e))
 
-            # --- SUPPRESSION DU DOSSIER render_controllers SI NON UTILISÉ ---
-            if not self.use_custom_render_controller.get():
-                rc_dir = os.path.join(BEDROCK_RP_DIR, "render_controllers")
-                if os.path.isdir(rc_dir):
-                    try:
-                        shutil.rmtree(rc_dir)
-                        self.log("Dossier render_controllers supprimé (option décochée).")
-                    except Exception as e:
-                        self.log(f"Erreur lors de la suppression de render_controllers: {e}")
+    def _poll_events(self):
+        """
+        Applique dans le thread Tk les événements publiés par le thread de conversion.
+        """
+        try:
+            while True:
+                kind, payload = self.event_queue.get_nowait()
+                if kind == "progress":
+                    self._show_progress(payload)
+                else:
+                    self._conversion_finished(kind, payload)
+        except queue.Empty:
+            pass
+        self.root.after(self.LOG_FLUSH_MS, self._poll_events)
+
+    def _show_progress(self, event):
+        if event["stage"] == "pipeline":
+            self._pipeline_step = event["done"]
+            self.set_progress(event["done"], event["total"])
+            return
+        # Avancement fin à l'intérieur de l'étape en cours
+        if event["total"]:
+            self.progress["value"] = self._pipeline_step + event["done"] / event["total"]
+        status = f"{event['stage']} {event['done']}/{event['total']}"
+        if event["eta"] is not None and event["done"] < event["total"]:
+            status += f" — ETA {event['eta']:.0f}s"
+        if event["current"]:
+            status += f" — {event['current']}"
+        self.status_label.config(text=status)
+
+    def _conversion_finished(self, kind, payload):
+        unsubscribe_progress(self._progress_listener)
+        self._flush_logs()
+        self.cancel_btn.config(state="disabled")
+        self.status_label.config(text="")
+        if kind == "done":
+            self.export_pack()
+        elif kind == "cancelled":
+            self.log(t("conversion_cancelled"))
+        else:
+            self.log(t("error", e=str(payload)))
+            messagebox.showerror(t("error_title"), t("conversion_error", e=str(payload)))
+        self.set_progress(0)
+        self.convert_btn.config(state="normal")
 
+    def export_pack(self):
+        try:
             # Sélection du dossier de sortie par l'utilisateur
             output_dir = filedialog.askdirectory(title="Sélectionnez le dossier de sortie")
             if not output_dir:
                 self.log(t("export_cancelled"))
-                self.set_progress(0)
-                self.convert_btn.config(state="normal")
                 return
 
             # --- Détermination du nom du fichier exporté ---
@@ -1957,37 +4710,32 @@ class PackConverterGUI:
             if java_input_path.lower().endswith('.zip'):
                 base_name = os.path.splitext(os.path.basename(java_input_path))[0]
             else:
-                base_name = os.path.basename(JAVA_RP_DIR.strip().rstrip("/\\"))
+                base_name = os.path.basename(CTX.java_dir.strip().rstrip("/\\"))
             export_name = f"{base_name}[BConverted]"
             # --- Fin nom fichier ---
 
             # --- Ajout : écrire les logs dans un fichier temporaire ---
             logs_path = os.path.join(output_dir, "conversion_logs.txt")
-            with open(logs_path, "w", encoding="utf-8") as f:
-                f.write(self.last_logs)
+            self.save_logs(logs_path)
             # --- Fin ajout logs ---
             # --- Ajout : déplacer le geyser-mapping.json à côté du pack exporté ---
-            geyser_mapping_src = os.path.join(BEDROCK_RP_DIR, "geyser-mapping.json")
+            geyser_mapping_src = os.path.join(CTX.bedrock_dir, "geyser-mapping.json")
             geyser_mapping_dst = os.path.join(output_dir, f"{export_name}_geyser-mapping.json")
-            if os.path.exists(geyser_mapping_src):
-                shutil.copy2(geyser_mapping_src, geyser_mapping_dst)
+            if CTX.sink.isfile(geyser_mapping_src):
+                with open(geyser_mapping_dst, 'wb') as f:
+                    f.write(CTX.sink.read_bytes(geyser_mapping_src))
             # --- Fin ajout déplacement geyser-mapping.json ---
 
             export_format = self.export_format_var.get()
             if export_format == "zip":
                 zip_path = os.path.join(output_dir, f"{export_name}.zip")
-                with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
-                    for rootdir, dirs, files in os.walk(BEDROCK_RP_DIR):
-                        for file in files:
-                            file_path = os.path.join(rootdir, file)
-                            arcname = os.path.relpath(file_path, BEDROCK_RP_DIR)
-                            zipf.write(file_path, arcname)
+                CTX.sink.export_archive(zip_path)
                 self.log(t("pack_exported_zip", zip_path=zip_path))
                 messagebox.showinfo(t("success"), f"Pack exporté dans :\n{zip_path}")
             elif export_format == "mcpack":
                 mcpack_path = os.path.join(output_dir, f"{export_name}.mcpack")
                 # Utilise la fonction create_mcpack déjà définie
-                create_mcpack(BEDROCK_RP_DIR, output_dir, export_name)
+                create_mcpack(CTX.bedrock_dir, output_dir, export_name, sink=CTX.sink)
                 self.log(f"✅ Pack exporté dans : {mcpack_path}")
                 messagebox.showinfo(t("success"), f"Pack exporté dans :\n{mcpack_path}")
             elif export_format == "folder":
@@ -1995,20 +4743,15 @@ class PackConverterGUI:
                 if os.path.exists(dest_folder):
                     shutil.rmtree(dest_folder)
 
-                shutil.copytree(BEDROCK_RP_DIR, dest_folder)
+                CTX.sink.export_directory(dest_folder)
                 self.log(t("pack_exported_folder", out_dir=dest_folder))
                 messagebox.showinfo(t("success"), t("pack_exported_folder_msg", out_dir=dest_folder))
             else:
                 self.log(t("unknown_export_format"))
                 messagebox.showerror(t("error_title"), t("unknown_export_format"))
-
-            self.set_progress(0)
-            self.convert_btn.config(state="normal")
         except Exception as e:
             self.log(t("error", e=str(e)))
             messagebox.showerror(t("error_title"), t("conversion_error", e=str(e)))
-            self.set_progress(0)
-            self.convert_btn.config(state="normal")
 
     def update_labels(self):
         # Met à jour tous les labels/boutons selon la langue
@@ -2016,6 +4759,7 @@ class PackConverterGUI:
         self.java_label.config(text=t("select_java_dir"))
         self.java_browse_btn.config(text=t("browse"))
         self.convert_btn.config(text=t("start_conversion"))
+        self.cancel_btn.config(text=t("cancel"))
         self.logs_label.config(text=t("logs"))
         self.clear_logs_btn.config(text=t("clear_logs"))
         self.export_label.config(text=t("export_format"))
@@ -2024,6 +4768,11 @@ class PackConverterGUI:
         self.geyser_label.config(text=t("geyser_mapping_format"))
         self.geyser_v1_radio.config(text=t("geyser_mapping_v1"))
         self.geyser_v2_radio.config(text=t("geyser_mapping_v2"))
+        self.json_label.config(text=t("json_output_format"))
+        self.json_pretty_radio.config(text=t("json_pretty"))
+        self.json_compact_radio.config(text=t("json_compact"))
+        self.copy_all_textures_checkbox.config(text=t("copy_all_textures"))
+        self.png8_checkbox.config(text=t("optimize_png8"))
         # Reconstruction du menu
         menu = self.lang_menu["menu"]
         menu.delete(0, "end")
@@ -2041,76 +4790,100 @@ class PackConverterGUI:
 if __name__ == "__main__":
     try:
         import sys
-        if len(sys.argv) > 1 and sys.argv[1] == "--nogui":
-            # Mode console classique
-            print(t("start_console"))
-            clean_bedrock_directory()
-            create_bedrock_structure()
-            copy_all_item_textures()
-            copy_pack_icon()
-            t0 = time.time()
-            items = extract_custom_model_data()
-            t1 = time.time()
-            print(f"[Profiling] Extraction des items : {round(t1-t0,2)}s")
-            copy_all_item_textures()
-            generate_custom_items_json(items)
-            generate_geyser_mapping_json(items)
-            validate_geo_json_files(os.path.join(BEDROCK_RP_DIR, "models", "entity"))
-            validate_consistency(items)
-
-            # --- Conversion avancée des modèles en parallèle ---
-            # 1. Collecte des références de modèles
-            t2 = time.time()
-            model_refs = set()
-            for item in items:
-                tex = item['texture']
-                if ':' in tex:
-                    model_refs.add(tex)
+        if "-h" in sys.argv or "--help" in sys.argv:
+            print(USAGE)
+            sys.exit(0)
+        if "--bench-import" in sys.argv:
+            # Démarrage à froid d'un processus qui importe le convertisseur (rien d'autre n'est lancé)
+            sys.exit(0 if benchmark_import() < IMPORT_TARGET_SECONDS else 1)
+        install_missing_packages()
+        if optional_import("yaml") is None:
+            LOGGER.critical(t("missing_yaml_module"))
+            sys.exit(1)
+        apply_cli_args(sys.argv)
+        configure_paths()
+        if "--bench-engine" in sys.argv:
+            # Mesure de la mise à l'échelle du moteur de conversion (1/2/4/8/16 workers)
+            setup_logging()
+            benchmark_model_engines()
+        elif "--bench-copy" in sys.argv:
+            # Comparaison des modes de copie sur une arborescence de textures synthétique
+            setup_logging()
+            # Le nombre de fichiers est facultatif
+            count = 30000
+            if cli_value(sys.argv, "--bench-copy") is not None:
+                count = cli_option(sys.argv, "--bench-copy", kind=int, minimum=1)
+            benchmark_copy_modes(count)
+        elif "--batch" in sys.argv:
+            # Mode batch : --batch <pack|glob> [...] [--batch-out DOSSIER] [--batch-jobs N]
+            setup_logging()
+            idx = sys.argv.index("--batch")
+            patterns = []
+            for arg in sys.argv[idx + 1:]:
+                if arg.startswith("--"):
+                    break
+                patterns.append(arg)
+            packs = expand_pack_paths(patterns)
+            if not packs:
+                LOG_PIPELINE.error(f"[Batch] ❌ Aucun pack (dossier ou .zip) trouvé pour : {' '.join(patterns)}")
+                sys.exit(1)
+            output_dir = cli_option(sys.argv, "--batch-out") or os.environ.get("BEDROCK_RP_DIR", "bedrock_batch")
+            jobs = cli_option(sys.argv, "--batch-jobs", kind=int, minimum=1)
+            report = convert_packs(packs, output_dir, jobs)
+            sys.exit(1 if any(entry["status"] == "failed" for entry in report) else 0)
+        elif "--nogui" in sys.argv or "--input" in sys.argv:
+            # Mode console : entièrement paramétrable, aucune question ; sans --export-dir, pas d'export
+            summary_path = cli_value(sys.argv, "--summary")
+            metrics_path = cli_value(sys.argv, "--metrics")
+            # Avec --summary -, la sortie standard est réservée au JSON
+            setup_logging(handler=logging.StreamHandler(sys.stderr) if "-" in (summary_path, metrics_path) else None)
+            export_format = cli_option(sys.argv, "--export", choices=EXPORT_FORMATS) or "zip"
+            input_path = cli_value(sys.argv, "--input") or os.environ.get("JAVA_RP_DIR")
+            if not input_path:
+                LOG_PIPELINE.error(t("no_java_dir"))
+                sys.exit(1)
+            if not os.path.exists(input_path):
+                raise FileNotFoundError(f"Pack Java introuvable : {input_path}")
+            bedrock_dir = cli_value(sys.argv, "--bedrock") or os.environ.get("BEDROCK_RP_DIR")
+            export_dir = None if "--no-export" in sys.argv else cli_value(sys.argv, "--export-dir")
+            if not bedrock_dir:
+                # Comme la GUI sans dossier Bedrock : rien n'est écrit sur disque avant l'export
+                # (sans export, le pack reste dans ce dossier temporaire)
+                bedrock_dir = os.path.join(tempfile.gettempdir(), "bedrock_rp")
+                if "--output" not in sys.argv and export_dir:
+                    CTX.output_mode = "archive" if export_format in ("zip", "mcpack") else "memory"
+            configure_paths(input_path, bedrock_dir)
+            LOG_PIPELINE.info(t("start_console"))
+            subscribe_progress(print_progress_bar)
+            start = time.time()
+            status, error, export_path = "ok", None, None
+            try:
+                convert_pack()
+                if CTX.failed_models:
+                    status = "partial"
+                if export_dir:
+                    export_path = export_converted_pack(export_format, export_dir, cli_value(sys.argv, "--export-name"))
                 else:
-                    model_refs.add(f"minecraft:{tex}")
-            print(f"[Profiling] Références de modèles collectées : {len(model_refs)}")
-            # 2. Indexation ciblée
-            model_index = build_targeted_model_index(model_refs)
-            t3 = time.time()
-            # 3. Préparation des jobs
-            model_jobs = []
-            for item in items:
-                texture_key = item['texture']
-                output_name = item['name'].split(":")[-1]
-                model_path = model_index.get(texture_key) or model_index.get(f"minecraft:{texture_key}")
-                if model_path:
-                    model_jobs.append((model_path, output_name, texture_key))
-            t4 = time.time()
-            print(f"[Profiling] Préparation des jobs : {round(t4-t3,2)}s")
-            # 4. Conversion
-            batch_convert_java_models_to_geo(model_jobs)
-            t5 = time.time()
-            print(f"[Profiling] Conversion des modèles : {round(t5-t4,2)}s")
-            # --- Génération des fichiers de langue Bedrock ---
-            lang_dict = {hash7(item['name']): item['name'] for item in items}
-            write_lang_files(lang_dict, os.path.join(BEDROCK_RP_DIR, "texts"))
-
-
-            # Ajout : demande du dossier de sortie et création du zip
-            output_dir = input("Dossier de sortie pour le ZIP : ").strip()
-            if output_dir:
-                converted_name = os.path.basename(JAVA_RP_DIR.strip().rstrip("/\\"))
-                zip_path = os.path.join(output_dir, f"{converted_name}.zip")
-                with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
-                    for rootdir, dirs, files in os.walk(BEDROCK_RP_DIR):
-                        for file in files:
-                            file_path = os.path.join(rootdir, file)
-                            arcname = os.path.relpath(file_path, BEDROCK_RP_DIR)
-                            zipf.write(file_path, arcname)
-                print(t("pack_exported_zip", zip_path=zip_path))
-            else:
-                print(t("export_cancelled"))
-            print(t("console_done"))
+                    LOG_PACK.info(t("export_skipped", bedrock_dir=CTX.bedrock_dir))
+            except Exception as e:
+                status, error = "failed", str(e)
+                raise
+            finally:
+                if summary_path:
+                    write_run_summary(summary_path, run_summary(status, time.time() - start, error, export_path))
+                if metrics_path:
+                    write_run_summary(metrics_path, CTX.metrics_snapshot())
+            LOG_PIPELINE.info(t("console_done"))
         else:
             # Mode GUI
+            _import_tk()
             root = tk.Tk()
             app = PackConverterGUI(root)
             root.mainloop()
             sys.exit(0)
+    except CliUsageError as e:
+        print(f"{e}\n\n{USAGE}", file=sys.stderr)
+        sys.exit(2)
     except Exception as e:
-        print(t("error", e=str(e)))
+        LOG_PIPELINE.error(t("error", e=str(e)), exc_info=LOGGER.isEnabledFor(logging.DEBUG))
+        sys.exit(1)